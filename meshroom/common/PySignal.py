@@ -11,10 +11,43 @@ __status__ = "Beta"
 
 import inspect
 import sys
+import threading
 import weakref
 from functools import partial
 from weakref import WeakMethod
 
+# Kinds of connected slots, resolved when connecting to avoid type checks on each emission
+_SLOT_CALLABLE = 0  # Lambdas and Signals, called with the emitted arguments
+_SLOT_PARTIAL = 1  # Partials, called without arguments
+_SLOT_METHOD = 2  # Bound methods, stored as a weak reference to their instance and their function
+_SLOT_FUNCTION = 3  # Functions, stored as a weak reference
+
+# Emissions being dispatched by the current thread, as [signal, caller frame, resolved sender] entries
+_emissions = threading.local()
+
+
+def _emissionStack():
+    """ Return the stack of emissions being dispatched by the current thread. """
+    try:
+        return _emissions.stack
+    except AttributeError:
+        stack = _emissions.stack = []
+        return stack
+
+
+def _resolveSlot(slot):
+    """ Return the (kind, callable or weak reference, function) entry of a slot. """
+    if isinstance(slot, partial):
+        return (_SLOT_PARTIAL, slot, None)
+    if isinstance(slot, Signal) or '<' in slot.__name__:
+        # If it's a Signal or a lambda. The '<' check is the only py2 and py3 compatible way I could find
+        return (_SLOT_CALLABLE, slot, None)
+    if inspect.ismethod(slot):
+        # Store instance methods with a weak reference to the instance
+        return (_SLOT_METHOD, weakref.ref(slot.__self__), slot.__func__)
+    # If it's just a function then just store it as a weakref.
+    return (_SLOT_FUNCTION, weakref.ref(slot), None)
+
 
 class Signal:
     """
@@ -24,11 +57,9 @@ class Signal:
     def __init__(self):
         super().__init__()
         self._block = False
+        # Sender of the last emission, if it has been resolved during that emission
         self._sender = None
-        self._slots = []
-
-    def __call__(self, *args, **kwargs):
-        self.emit(*args, **kwargs)
+        self._slots = ()
 
     def emit(self, *args, **kwargs):
         """
@@ -36,50 +67,31 @@ class Signal:
         """
         if self._block:
             return
-
-        def _get_sender():
-            """Try to get the bound, class or module method calling the emit."""
-            prev_frame = sys._getframe(2)
-            func_name = prev_frame.f_code.co_name
-
-            # Faster to try/catch than checking for 'self'
-            try:
-                return getattr(prev_frame.f_locals['self'], func_name)
-
-            except KeyError:
-                return getattr(inspect.getmodule(prev_frame), func_name)
-
-        # Get the sender
+        # The sender is only resolved from the caller frame if sender() is called during the emission
+        emission = [self, sys._getframe(1), None]
+        stack = _emissionStack()
+        stack.append(emission)
         try:
-            self._sender = WeakMethod(_get_sender())
-
-        # Account for when func_name is at '<module>'
-        except AttributeError:
-            self._sender = None
-
-        # Handle unsupported module level methods for WeakMethod.
-        # TODO: Support module level methods.
-        except TypeError:
-            self._sender = None
-
-        for slot in self._slots:
-            if not slot:
-                continue
-            elif isinstance(slot, partial):
-                slot()
-            elif isinstance(slot, weakref.WeakKeyDictionary):
-                # For class methods, get the class object and call the method accordingly.
-                for obj, method in slot.items():
-                    method(obj, *args, **kwargs)
-            elif isinstance(slot, weakref.ref):
-                # If it's a weakref, call the ref to get the instance and then call the func
-                # Don't wrap in try/except so we don't risk masking exceptions from the actual func call
-                tested_slot = slot()
-                if tested_slot is not None:
-                    tested_slot(*args, **kwargs)
-            else:
-                # Else call it in a standard way. Should be just lambdas at this point
-                slot(*args, **kwargs)
+            for kind, slot, func in self._slots:
+                if kind == _SLOT_METHOD:
+                    obj = slot()
+                    if obj is not None:
+                        func(obj, *args, **kwargs)
+                elif kind == _SLOT_FUNCTION:
+                    # Don't wrap in try/except so we don't risk masking exceptions from the actual func call
+                    func = slot()
+                    if func is not None:
+                        func(*args, **kwargs)
+                elif kind == _SLOT_PARTIAL:
+                    slot()
+                else:
+                    slot(*args, **kwargs)
+        finally:
+            stack.pop()
+            emission[1] = None
+            self._sender = emission[2]
+
+    __call__ = emit
 
     def connect(self, slot):
         """
@@ -88,22 +100,10 @@ class Signal:
         if not callable(slot):
             raise ValueError(f"Connection to non-callable '{slot.__class__.__name__}' object failed")
 
-        if isinstance(slot, (partial, Signal)) or '<' in slot.__name__:
-            # If it's a partial, a Signal or a lambda. The '<' check is the only py2 and py3 compatible way I could find
-            if slot not in self._slots:
-                self._slots.append(slot)
-        elif inspect.ismethod(slot):
-            # Check if it's an instance method and store it with the instance as the key
-            slotSelf = slot.__self__
-            slotDict = weakref.WeakKeyDictionary()
-            slotDict[slotSelf] = slot.__func__
-            if slotDict not in self._slots:
-                self._slots.append(slotDict)
-        else:
-            # If it's just a function then just store it as a weakref.
-            newSlotRef = weakref.ref(slot)
-            if newSlotRef not in self._slots:
-                self._slots.append(newSlotRef)
+        entry = _resolveSlot(slot)
+        if entry not in self._slots:
+            # Slots are stored in a tuple, so that connections made by a slot do not affect the current emission
+            self._slots += (entry,)
 
     def disconnect(self, slot):
         """
@@ -112,43 +112,55 @@ class Signal:
         if not callable(slot):
             return
 
-        if inspect.ismethod(slot):
-            # If it's a method, then find it by its instance
-            slotSelf = slot.__self__
-            for s in self._slots:
-                if (isinstance(s, weakref.WeakKeyDictionary) and
-                        (slotSelf in s) and
-                        (s[slotSelf] is slot.__func__)):
-                    self._slots.remove(s)
-                    break
-        elif isinstance(slot, (partial, Signal)) or '<' in slot.__name__:
-            # If it's a partial, a Signal or lambda, try to remove directly
-            try:
-                self._slots.remove(slot)
-            except ValueError:
-                pass
-        else:
-            # It's probably a function, so try to remove by weakref
-            try:
-                self._slots.remove(weakref.ref(slot))
-            except ValueError:
-                pass
+        entry = _resolveSlot(slot)
+        slots = list(self._slots)
+        try:
+            slots.remove(entry)
+        except ValueError:
+            return
+        self._slots = tuple(slots)
 
     def clear(self):
         """Clears the signal of all connected slots"""
-        self._slots = []
+        self._slots = ()
 
     def block(self, isBlocked):
         """Sets blocking of the signal"""
         self._block = bool(isBlocked)
 
-    def sender(self):
-        """Return the callable responsible for emitting the signal, if found."""
+    @staticmethod
+    def _resolveSender(frame):
+        """Try to get the bound, class or module method calling the emit."""
+        funcName = frame.f_code.co_name
+        # Faster to try/catch than checking for 'self'
         try:
-            return self._sender()
+            return getattr(frame.f_locals['self'], funcName)
+        except KeyError:
+            return getattr(inspect.getmodule(frame), funcName)
 
-        except TypeError:
-            return None
+    def sender(self):
+        """
+        Return the callable responsible for emitting the signal, if found.
+
+        Outside of an emission of this signal, return the sender of its last emission
+        if it has been requested during that emission, None otherwise.
+        """
+        for emission in reversed(_emissionStack()):
+            if emission[0] is self:
+                break
+        else:
+            return self._sender() if self._sender is not None else None
+        if emission[2] is None:
+            try:
+                emission[2] = WeakMethod(self._resolveSender(emission[1]))
+            # Account for when func_name is at '<module>'
+            except AttributeError:
+                return None
+            # Handle unsupported module level methods for WeakMethod.
+            # TODO: Support module level methods.
+            except TypeError:
+                return None
+        return emission[2]()
 
 
 class ClassSignal:
@@ -156,15 +168,20 @@ class ClassSignal:
     The class signal allows a signal to be set on a class rather than an instance.
     This emulates the behavior of a PyQt signal
     """
-    _map = {}
+
+    def __init__(self):
+        self._signals = weakref.WeakKeyDictionary()
 
     def __get__(self, instance, owner):
         if instance is None:
             # When we access ClassSignal element on the class object without any instance,
             # we return the ClassSignal itself
             return self
-        tmp = self._map.setdefault(self, weakref.WeakKeyDictionary())
-        return tmp.setdefault(instance, Signal())
+        # Only create the Signal of an instance on first access
+        signal = self._signals.get(instance)
+        if signal is None:
+            signal = self._signals[instance] = Signal()
+        return signal
 
     def __set__(self, instance, value):
         raise RuntimeError("Cannot assign to a Signal object")
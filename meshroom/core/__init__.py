@@ -9,6 +9,7 @@ import pkgutil
 import sys
 import traceback
 import uuid
+from typing import Optional
 
 try:
     # for cx_freeze
@@ -18,6 +19,7 @@ try:
 except Exception:
     pass
 
+from meshroom.core import pluginManifest
 from meshroom.core.plugins import NodePlugin, NodePluginManager, Plugin, processEnvFactory
 from meshroom.core.submitter import BaseSubmitter
 from meshroom.env import EnvVar, meshroomFolder
@@ -54,7 +56,7 @@ def add_to_path(p):
         sys.path = old_path
 
 
-def loadClasses(folder: str, packageName: str, classType: type) -> list[type]:
+def loadClasses(folder: str, packageName: str, classType: type, importErrors: Optional[list] = None) -> list[type]:
     """
     Go over the Python module named "packageName" located in "folder" to find files
     that contain classes of type "classType" and return these classes in a list.
@@ -63,9 +65,12 @@ def loadClasses(folder: str, packageName: str, classType: type) -> list[type]:
         folder: the folder to load the module from.
         packageName: the name of the module to look for nodes in.
         classType: the class to look for in the files that are inspected.
+        importErrors: (optional) list filled with the errors raised while importing the modules.
     """
     classes = []
     errors = []
+    if importErrors is None:
+        importErrors = []
 
     resolvedFolder = str(Path(folder).resolve())
     # temporarily add folder to python path
@@ -79,6 +84,7 @@ def loadClasses(folder: str, packageName: str, classType: type) -> list[type]:
             packageVersion = getattr(package, "__version__", None)
             packagePath = os.path.dirname(package.__file__)
         except Exception as e:
+            importErrors.append(e)
             tb = traceback.extract_tb(e.__traceback__)
             last_call = tb[-1]
             logging.warning(f'  * Failed to load package "{packageName}" from folder "{resolvedFolder}" ({type(e).__name__}): {str(e)}\n'
@@ -120,6 +126,7 @@ def loadClasses(folder: str, packageName: str, classType: type) -> list[type]:
                     else:
                         classes.append(p)
             except Exception as e:
+                importErrors.append(e)
                 tb = traceback.extract_tb(e.__traceback__)
                 last_call = tb[-1]
                 errors.append(f'  * {pluginName} ({type(e).__name__}): {e}\n'
@@ -150,11 +157,25 @@ def loadClassesNodes(folder: str, packageName: str) -> list[NodePlugin]:
         folder: the folder to load the module from.
         packageName: the name of the module to look for nodes in.
 
+    If lazy loading is enabled (see meshroom.core.pluginManifest), the NodePlugins are created from the manifest
+    of the package when it is up-to-date, without importing its modules.
+
     Returns:
         list[NodePlugin]: a list of all the NodePlugins that were created based on the
                           module's search. If none has been created, an empty list is returned.
     """
-    return loadClasses(folder, packageName, desc.BaseNode)
+    if not pluginManifest.isLazyLoadingEnabled():
+        return loadClasses(folder, packageName, desc.BaseNode)
+
+    nodePlugins = pluginManifest.readManifest(folder, packageName)
+    if nodePlugins is not None:
+        return nodePlugins
+    files = pluginManifest.packageFiles(os.path.join(str(Path(folder).resolve()), packageName))
+    importErrors = []
+    nodePlugins = loadClasses(folder, packageName, desc.BaseNode, importErrors)
+    if not importErrors:
+        pluginManifest.writeManifest(folder, packageName, nodePlugins, files)
+    return nodePlugins
 
 
 def loadClassesSubmitters(folder: str, packageName: str) -> list[BaseSubmitter]:
@@ -338,7 +359,7 @@ def loadAllNodes(folder) -> list[Plugin]:
             if nodePlugins:
                 for node in nodePlugins:
                     plugin.addNodePlugin(node)
-                nodesStr = ', '.join([node.nodeDescriptor.__name__ for node in nodePlugins])
+                nodesStr = ', '.join([node.name for node in nodePlugins])
                 logging.debug(f'Nodes loaded [{package}]: {nodesStr}')
                 plugins.append(plugin)
     return plugins
@@ -6,12 +6,15 @@ import weakref
 import types
 import logging
 
+from array import array
 from collections.abc import Iterable, Sequence
+from contextlib import nullcontext
 from string import Template
 from meshroom.common import BaseObject, Property, Variant, Signal, ListModel, DictModel, Slot
 from meshroom.core import desc, hashValue
+from meshroom.env import EnvVar
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from meshroom.core.graph import Edge
@@ -46,6 +49,30 @@ def attributeFactory(description: str, value, isOutput: bool, node, root=None, p
     return attr
 
 
+def isDescEnabled(attributeDesc: desc.Attribute, node) -> bool:
+    """ Whether the attributes described by `attributeDesc` are enabled on `node`. """
+    if isinstance(attributeDesc.enabled, types.FunctionType):
+        try:
+            return attributeDesc.enabled(node)
+        except Exception:
+            # Node implementation may fail due to version mismatch
+            return True
+    return attributeDesc.enabled
+
+
+def uidEnabledKey(attributeDesc: desc.Attribute, node) -> tuple:
+    """
+    Get the enabled state of all the descendants of a List or Group attribute, which determines
+    the children contributing to its UID. The UIDs cached by List and Group attributes are only valid for this key.
+    """
+    if isinstance(attributeDesc, desc.ListAttribute):
+        return uidEnabledKey(attributeDesc.elementDesc, node)
+    if isinstance(attributeDesc, desc.GroupAttribute):
+        return tuple((isDescEnabled(childDesc, node), uidEnabledKey(childDesc, node))
+                     for childDesc in attributeDesc.groupDesc)
+    return ()
+
+
 class Attribute(BaseObject):
     """
     """
@@ -79,6 +106,17 @@ class Attribute(BaseObject):
 
         # invalidation value for output attributes
         self._invalidationValue = ""
+        # UID of leaf attributes (see _memoizedUid), as a tuple (key, uid) where key identifies the value
+        # the UID has been computed from: it is never invalidated
+        self._uidCache = None
+        # UID of List and Group attributes, computed from the UIDs of their children, as a tuple
+        # (uidEnabledKey, uid): it is invalidated when the attribute or one of its descendants changes
+        # (see _invalidateChildrenUidCache)
+        self._childrenUidCache = None
+        # index in the ListAttribute containing this attribute, updated by the ListAttribute (see ListAttribute.index)
+        self._listIndex = None
+        # memoized full name, as a tuple (key, name) where key identifies the root name and the index in the root
+        self._fullNameCache = None
 
         self._value = None
         self.initValue()
@@ -97,11 +135,18 @@ class Attribute(BaseObject):
 
     def getFullName(self) -> str:
         """ Name inside the Graph: groupName.name """
-        if isinstance(self.root, ListAttribute):
-            return f'{self.root.getFullName()}[{self.root.index(self)}]'
-        elif isinstance(self.root, GroupAttribute):
-            return f'{self.root.getFullName()}.{self.getName()}'
-        return self.getName()
+        root = self.root
+        if isinstance(root, ListAttribute):
+            key = (root.getFullName(), root.index(self))
+        elif isinstance(root, GroupAttribute):
+            key = (root.getFullName(), None)
+        else:
+            return self.getName()
+        if self._fullNameCache is None or self._fullNameCache[0] != key:
+            rootName, index = key
+            name = f'{rootName}[{index}]' if index is not None else f'{rootName}.{self.getName()}'
+            self._fullNameCache = (key, name)
+        return self._fullNameCache[1]
 
     def getFullNameToNode(self) -> str:
         """ Name inside the Graph: nodeName.groupName.name """
@@ -152,13 +197,7 @@ class Attribute(BaseObject):
         return f'{graphName} {self.getFullLabelToNode()}'
 
     def getEnabled(self) -> bool:
-        if isinstance(self.desc.enabled, types.FunctionType):
-            try:
-                return self.desc.enabled(self.node)
-            except Exception:
-                # Node implementation may fail due to version mismatch
-                return True
-        return self.attributeDesc.enabled
+        return isDescEnabled(self.attributeDesc, self.node)
 
     def setEnabled(self, v):
         if self._enabled == v:
@@ -170,6 +209,10 @@ class Attribute(BaseObject):
         """ Value for which the attribute should be ignored during the UID computation. """
         return self.attributeDesc.uidIgnoreValue
 
+    def isUidIgnored(self) -> bool:
+        """ Whether the attribute has the value for which it is ignored during the UID computation. """
+        return self.value == self.getUidIgnoreValue()
+
     def getValidValue(self):
         """
         Get the status of _validValue:
@@ -211,12 +254,14 @@ class Attribute(BaseObject):
             # validity of the value and apply some conversion if needed
             convertedValue = self.validateValue(value)
             self._value = convertedValue
+        self._invalidateChildrenUidCache()
 
         # Request graph update when input parameter value is set
         # and parent node belongs to a graph
         # Output attributes value are set internally during the update process,
         # which is why we don't trigger any update in this case
-        # TODO: update only the nodes impacted by this change
+        # Only the nodes impacted by this change (this node and the following ones) are marked as dirty
+        # and updated.
         # TODO: only update the graph if this attribute participates to a UID
         if self.isInput:
             self.requestGraphUpdate()
@@ -289,16 +334,41 @@ class Attribute(BaseObject):
                 # Only dependent on the hash of its value without the cache folder.
                 # "/" at the end of the link is stripped to prevent having different UIDs depending
                 # on whether the invalidation value finishes with it or not
-                strippedInvalidationValue = self._invalidationValue.rstrip("/")
-                return hashValue(strippedInvalidationValue)
+                return self._memoizedUid(self._invalidationValue,
+                                         lambda: hashValue(self._invalidationValue.rstrip("/")))
         if self.isLink:
             linkParam = self.getLinkParam(recursive=True)
             return linkParam.uid()
         if isinstance(self._value, (list, tuple, set,)):
             # non-exclusive choice param
             # hash of sorted values hashed
-            return hashValue([hashValue(v) for v in sorted(self._value)])
-        return hashValue(self._value)
+            return self._memoizedUid(tuple((type(v), v) for v in self._value),
+                                     lambda: hashValue([hashValue(v) for v in sorted(self._value)]))
+        return self._memoizedUid((type(self._value), self._value), lambda: hashValue(self._value))
+
+    def _invalidateChildrenUidCache(self):
+        """ Invalidate the UIDs cached by the List and Group attributes containing this attribute (and its own). """
+        attr = self
+        while attr is not None:
+            attr._childrenUidCache = None
+            attr = attr.root
+
+    def _hasLocalUid(self) -> bool:
+        """
+        Whether the UID only depends on the value of the attribute, and can be cached by the attributes containing it.
+        The UID of links depends on their source, and the UID of outputs on the node.
+        """
+        return self.isInput and not self.isLink
+
+    def _memoizedUid(self, key, computeUid) -> str:
+        """
+        Return the UID memoized for `key` or compute it with `computeUid`.
+        As the key is compared to the one of the memoized UID, the memoized UID does not need to be
+        invalidated when the value changes.
+        """
+        if self._uidCache is None or self._uidCache[0] != key:
+            self._uidCache = (key, computeUid())
+        return self._uidCache[1]
 
     @property
     def isLink(self) -> bool:
@@ -332,23 +402,22 @@ class Attribute(BaseObject):
         Whether the attribute has output connections, i.e is the source of at least one edge.
         """
         # safety check to avoid evaluation errors
-        if not self.node.graph or not self.node.graph.edges:
+        if not self.node.graph:
             return False
-        return next((edge for edge in self.node.graph.edges.values() if edge.src == self), None) is not None
+        return self.node.graph.hasOutEdges(self)
 
     def getInputConnections(self) -> list["Edge"]:
         """ Retrieve the upstreams connected edges """
-        if not self.node.graph or not self.node.graph.edges:
+        if not self.node.graph:
             return []
-
-        return [edge for edge in self.node.graph.edges.values() if edge.dst == self]
+        edge = self.node.graph.edge(self)
+        return [edge] if edge else []
 
     def getOutputConnections(self) -> list["Edge"]:
         """ Retrieve all the edges connected to this attribute """
-        if not self.node.graph or not self.node.graph.edges:
+        if not self.node.graph:
             return []
-
-        return [edge for edge in self.node.graph.edges.values() if edge.src == self]
+        return self.node.graph.outEdges(self)
 
     def getLinkedInAttributes(self) -> list["Attribute"]:
         """ Return the upstreams connected attributes  """
@@ -396,18 +465,22 @@ class Attribute(BaseObject):
         """
         Return the value. If it is a string, expressions will be evaluated.
         """
-        if isinstance(self.value, str):
+        return self._evalValue(self.value)
+
+    def _evalValue(self, value):
+        """ Evaluate the expressions of `value` if it is a string, in the context of the node. """
+        if isinstance(value, str):
             env = self.node.nodePlugin.configFullEnv if self.node.nodePlugin else os.environ
-            substituted = Template(self.value).safe_substitute(env)
+            substituted = Template(value).safe_substitute(env)
             try:
-                varResolved = substituted.format(**self.node._cmdVars)
+                varResolved = substituted.format_map(self.node._cmdVars)
                 return varResolved
             except (KeyError, IndexError):
                 # Catch KeyErrors and IndexErros to be able to open files created prior to the
                 # support of relative variables (when self.node._cmdVars was not used to evaluate
                 # expressions in the attribute)
                 return substituted
-        return self.value
+        return value
 
     def getValueStr(self, withQuotes=True) -> str:
         """
@@ -417,20 +490,24 @@ class Attribute(BaseObject):
         If it is an empty list, it will returns a really empty string.
         If it is a list with one empty string element, it will returns 2 quotes.
         """
+        return self._valueStr(self.attributeDesc, self.value, withQuotes)
+
+    def _valueStr(self, attributeDesc: desc.Attribute, value, withQuotes: bool) -> str:
+        """ Format `value` as the value of an attribute described by `attributeDesc` (see getValueStr). """
         # ChoiceParam with multiple values should be combined
-        if isinstance(self.attributeDesc, desc.ChoiceParam) and not self.attributeDesc.exclusive:
+        if isinstance(attributeDesc, desc.ChoiceParam) and not attributeDesc.exclusive:
             # Ensure value is a list as expected
-            assert (isinstance(self.value, Sequence) and not isinstance(self.value, str))
-            v = self.attributeDesc.joinChar.join(self.getEvalValue())
+            assert (isinstance(value, Sequence) and not isinstance(value, str))
+            v = attributeDesc.joinChar.join(self._evalValue(value))
             if withQuotes and v:
                 return f'"{v}"'
             return v
         # String, File, single value Choice are based on strings and should includes quotes
         # to deal with spaces
-        if withQuotes and isinstance(self.attributeDesc,
+        if withQuotes and isinstance(attributeDesc,
                                      (desc.StringParam, desc.File, desc.ChoiceParam)):
-            return f'"{self.getEvalValue()}"'
-        return str(self.getEvalValue())
+            return f'"{self._evalValue(value)}"'
+        return str(self._evalValue(value))
 
     def defaultValue(self):
         if isinstance(self.desc.value, types.FunctionType):
@@ -610,18 +687,138 @@ class ChoiceParam(Attribute):
     values = Property(Variant, getValues, setValues, notify=valuesChanged)
 
 
+class ListColumns:
+    """
+    Compact storage of the elements of a ListAttribute of GroupAttributes.
+
+    The values of the children of the elements are stored per child, in typed arrays for numbers,
+    and the element GroupAttributes are only created when they are accessed.
+    Once created, an element holds the values of its children: the columns are not updated anymore for it.
+    """
+
+    def __init__(self, elementDesc: desc.GroupAttribute):
+        self.elementDesc = elementDesc
+        self._childDescs = {childDesc.name: childDesc for childDesc in elementDesc.groupDesc}
+        self._defaults = {name: childDesc.validateValue(copy.copy(childDesc.value))
+                          for name, childDesc in self._childDescs.items()}
+        self._columns = {name: self._newColumn(childDesc) for name, childDesc in self._childDescs.items()}
+        # Created element per index, or None
+        self.elements = []
+        # UID per index of the elements which have not been created, or None if not computed yet,
+        # for the uidEnabledKey `uidsKey`
+        self.uids = []
+        self.uidsKey = None
+
+    @staticmethod
+    def supports(elementDesc: desc.Attribute) -> bool:
+        """
+        Whether the elements described by `elementDesc` can be stored in columns: groups of plain parameters,
+        without expressions as default values.
+        """
+        if not isinstance(elementDesc, desc.GroupAttribute):
+            return False
+        for childDesc in elementDesc.groupDesc:
+            if childDesc.instanceType is not Attribute or isinstance(childDesc.value, types.FunctionType) \
+                    or Attribute.isLinkExpression(childDesc.value):
+                return False
+            try:
+                childDesc.validateValue(copy.copy(childDesc.value))
+            except (ValueError, TypeError):
+                return False
+        return True
+
+    @staticmethod
+    def _newColumn(childDesc: desc.Attribute):
+        if isinstance(childDesc, desc.IntParam):
+            return array("q")
+        if isinstance(childDesc, desc.FloatParam):
+            return array("d")
+        return []
+
+    def __len__(self):
+        return len(self.elements)
+
+    def value(self, index: int, name: str):
+        return self._columns[name][index]
+
+    def row(self, index: int) -> dict:
+        return {name: column[index] for name, column in self._columns.items()}
+
+    def toRow(self, value, upgrade=False) -> Optional[dict]:
+        """
+        Convert the value of an element to a row of the columns.
+
+        Args:
+            value: the value of the element, as set on a GroupAttribute.
+            upgrade: whether the value is upgraded (unknown children are ignored) rather than set.
+
+        Returns:
+            The values of the children, or None if the value can not be stored in the columns
+            (links, expressions or invalid values): the element has to be created.
+        """
+        try:
+            value = self.elementDesc.validateValue(value)
+        except (ValueError, TypeError, SyntaxError):
+            return None
+        if isinstance(value, dict):
+            items = value.items()
+        elif isinstance(value, (list, tuple)):
+            items = zip(self._childDescs.keys(), value)
+        else:
+            return None
+        row = self._defaults.copy()
+        for name, v in items:
+            childDesc = self._childDescs.get(name)
+            if childDesc is None:
+                if upgrade:
+                    continue
+                return None
+            if isinstance(v, (Attribute, types.FunctionType)) or Attribute.isLinkExpression(v):
+                return None
+            try:
+                row[name] = childDesc.validateValue(v)
+            except (ValueError, TypeError):
+                return None
+        return row
+
+    def insert(self, index: int, rows: list[dict]):
+        for name, column in self._columns.items():
+            values = [row[name] for row in rows]
+            try:
+                column[index:index] = array(column.typecode, values) if isinstance(column, array) else values
+            except (TypeError, OverflowError):
+                # Values that do not fit in a typed array (e.g. None)
+                column = self._columns[name] = list(column)
+                column[index:index] = values
+        self.elements[index:index] = [None] * len(rows)
+        self.uids[index:index] = [None] * len(rows)
+
+    def remove(self, index: int, count: int):
+        for column in self._columns.values():
+            del column[index:index + count]
+        del self.elements[index:index + count]
+        del self.uids[index:index + count]
+
+
 class ListAttribute(Attribute):
 
+    # Compact storage of the elements (see ListColumns), used instead of the ListModel until the value is accessed
+    _columns = None
+
     def __init__(self, node, attributeDesc: desc.ListAttribute, isOutput: bool,
                  root=None, parent=None):
         super().__init__(node, attributeDesc, isOutput, root, parent)
 
     def __len__(self):
+        if (columns := self._localColumns()) is not None:
+            return len(columns)
         if self.value is None:
             return 0
         return len(self.value)
 
     def __iter__(self):
+        if (columns := self._localColumns()) is not None:
+            return (self._element(i) for i in range(len(columns)))
         return iter(self.value)
 
     def getBaseType(self):
@@ -631,32 +828,108 @@ class ListAttribute(Attribute):
         """ Returns child attribute at index 'idx'. """
         # Implement 'at' rather than '__getitem__'
         # since the later is called spuriously when object is used in QML
+        if self._localColumns() is not None:
+            return self._element(idx)
         return self.value.at(idx)
 
     def index(self, item):
-        return self.value.indexOf(item)
+        if (columns := self._localColumns()) is not None:
+            elements, elementAt = columns.elements, columns.elements.__getitem__
+        else:
+            elements = self.value
+            elementAt = elements.at
+        index = getattr(item, "_listIndex", None)
+        if index is None or index >= len(elements) or elementAt(index) is not item:
+            # Elements have been inserted or removed since the indexes have been updated
+            for i, element in enumerate(elements):
+                if element is not None:
+                    element._listIndex = i
+            index = getattr(item, "_listIndex", None)
+            if index is None or index >= len(elements) or elementAt(index) is not item:
+                raise ValueError(f"{item} is not in list")
+        return index
+
+    def _localColumns(self) -> Optional[ListColumns]:
+        """ The compact storage of the elements, if used and if the attribute is not a link. """
+        if self._columns is None or self.isLink:
+            return None
+        return self._columns
+
+    def _element(self, index):
+        """ Get the element at `index` from the compact storage, and create it if needed. """
+        element = self._columns.elements[index]
+        if element is None:
+            element = self._columns.elements[index] = self._createElement(self._columns.row(index))
+        return element
+
+    def _createElement(self, value):
+        """
+        Create an element from the values stored in the columns.
+        The node is detached from its graph meanwhile: the values are already accounted for,
+        creating the element must not request graph updates.
+        """
+        node = self.node
+        graph, node.graph = node.graph, None
+        try:
+            return attributeFactory(self.attributeDesc.elementDesc, value, self.isOutput, node, self)
+        finally:
+            node.graph = graph
+
+    def _materialize(self):
+        """ Replace the compact storage of the elements by a ListModel of all the elements. """
+        if self._columns is None:
+            return
+        elements = [self._element(i) for i in range(len(self._columns))]
+        self._columns = None
+        self._value = ListModel(parent=self)
+        self._value.insert(0, elements)
+
+    def _elements(self):
+        """ Get the existing elements, without creating the ones stored in the compact storage. """
+        if self._columns is not None:
+            return [element for element in self._columns.elements if element is not None]
+        return self._value
+
+    def _get_value(self):
+        if self.isLink:
+            return self.getLinkParam().value
+        self._materialize()
+        return self._value
 
     def initValue(self):
         self.resetToDefaultValue()
 
     def resetToDefaultValue(self):
-        self._value = ListModel(parent=self)
+        if self.isInput and EnvVar.get(EnvVar.MESHROOM_COLUMNAR_LISTS) and \
+                ListColumns.supports(self.attributeDesc.elementDesc):
+            self._columns = ListColumns(self.attributeDesc.elementDesc)
+            self._value = None
+        else:
+            self._columns = None
+            self._value = ListModel(parent=self)
+        self._invalidateChildrenUidCache()
         self.valueChanged.emit()
 
     def _set_value(self, value):
-        if self.node.graph:
-            self.remove(0, len(self))
         # Link to another attribute
         if isinstance(value, ListAttribute) or Attribute.isLinkExpression(value):
+            if self.node.graph:
+                self.remove(0, len(self))
+            self._columns = None
             self._value = value
-        # New value
-        else:
-            # During initialization self._value may not be set
-            if self._value is None:
-                self._value = ListModel(parent=self)
-            newValue = self.desc.validateValue(value)
-            self.extend(newValue)
-        self.requestGraphUpdate()
+            self._invalidateChildrenUidCache()
+            self.requestGraphUpdate()
+            return
+        newValue = self.desc.validateValue(value)
+        if self.node.graph:
+            # Keep the elements which already have their new value
+            if (diff := self.diff(newValue)) is not None:
+                self.replace(*diff)
+            return
+        # During initialization self._value may not be set
+        if self._value is None and self._columns is None:
+            self._value = ListModel(parent=self)
+        self.extend(newValue)
 
     def upgradeValue(self, exportedValues):
         if not isinstance(exportedValues, list):
@@ -666,18 +939,9 @@ class ListAttribute(Attribute):
                 return
             raise RuntimeError("ListAttribute.upgradeValue: the given value is of type " +
                                str(type(exportedValues)) + " but a 'list' is expected.")
-
-        attrs = []
-        for v in exportedValues:
-            a = attributeFactory(self.attributeDesc.elementDesc, None, self.isOutput,
-                                 self.node, self)
-            a.upgradeValue(v)
-            attrs.append(a)
-        index = len(self._value)
-        self._value.insert(index, attrs)
-        self.valueChanged.emit()
-        self._applyExpr()
-        self.requestGraphUpdate()
+        with self._graphModification():
+            inserted = self._insertElements(len(self), exportedValues, upgrade=True)
+            self._notifyChanged(inserted)
 
     @raiseIfLink
     def append(self, value):
@@ -685,15 +949,10 @@ class ListAttribute(Attribute):
 
     @raiseIfLink
     def insert(self, index, value):
-        if self._value is None:
-            self._value = ListModel(parent=self)
         values = value if isinstance(value, list) else [value]
-        attrs = [attributeFactory(self.attributeDesc.elementDesc, v, self.isOutput, self.node, self)
-                 for v in values]
-        self._value.insert(index, attrs)
-        self.valueChanged.emit()
-        self._applyExpr()
-        self.requestGraphUpdate()
+        with self._graphModification():
+            inserted = self._insertElements(index, values)
+            self._notifyChanged(inserted)
 
     @raiseIfLink
     def extend(self, values):
@@ -701,29 +960,188 @@ class ListAttribute(Attribute):
 
     @raiseIfLink
     def remove(self, index, count=1):
+        if self._value is None and self._columns is None:
+            return
+        with self._graphModification():
+            self._removeElements(index, count)
+            self._notifyChanged()
+
+    @raiseIfLink
+    def replace(self, index, count, values):
+        """
+        Replace `count` elements from `index` by elements created from `values`.
+        The other elements are kept, and the change is notified once.
+        """
+        with self._graphModification():
+            self._removeElements(index, count)
+            inserted = self._insertElements(index, values)
+            self._notifyChanged(inserted)
+
+    def diff(self, values) -> Optional[tuple[int, int, list]]:
+        """
+        Compute the range of elements to replace for the list to have the given values,
+        keeping the first and last elements which already have their value.
+
+        Args:
+            values: the new exported values of the elements.
+
+        Returns:
+            The index and the number of elements to replace and the values to replace them with
+            (see 'replace'), or None if the elements already have these values.
+        """
+        size = len(self)
+        start = 0
+        end = min(size, len(values))
+        while start < end and self._hasElementValue(start, values[start]):
+            start += 1
+        common = 0
+        while start + common < end and self._hasElementValue(size - common - 1, values[-common - 1]):
+            common += 1
+        if start + common == size == len(values):
+            return None
+        return start, size - start - common, list(values[start:len(values) - common])
+
+    def getElementExportValue(self, index):
+        """ Get the exported value of the element at `index`, without creating it if stored in columns. """
+        if (columns := self._localColumns()) is not None and columns.elements[index] is None:
+            return columns.row(index)
+        return self.at(index).getExportValue()
+
+    def _hasElementValue(self, index, value) -> bool:
+        """ Whether the element at `index` has the given exported value. """
+        if (columns := self._localColumns()) is not None:
+            # Compare with the complete row, as the value may omit default values
+            row = columns.toRow(value)
+            value = value if row is None else row
+        return self.getElementExportValue(index) == value
+
+    def _insertElements(self, index, values, upgrade=False) -> list[Attribute]:
+        """
+        Insert elements created from `values` at `index`, without notifying the change.
+
+        Args:
+            index: the index of the first inserted element.
+            values: the values of the elements.
+            upgrade: whether the values are upgraded (see 'upgradeValue') rather than set.
+
+        Returns:
+            The created elements, or an empty list if they are stored in columns.
+        """
+        if self._columns is not None:
+            rows = [self._columns.toRow(v, upgrade) for v in values]
+            if all(row is not None for row in rows):
+                self._columns.insert(index, rows)
+                return []
+            # Links or expressions: use the ListModel
+            self._materialize()
         if self._value is None:
+            self._value = ListModel(parent=self)
+        elementDesc = self.attributeDesc.elementDesc
+        if upgrade:
+            attrs = []
+            for v in values:
+                attr = attributeFactory(elementDesc, None, self.isOutput, self.node, self)
+                attr.upgradeValue(v)
+                attrs.append(attr)
+        else:
+            attrs = [attributeFactory(elementDesc, v, self.isOutput, self.node, self) for v in values]
+        self._value.insert(index, attrs)
+        return attrs
+
+    def _removeElements(self, index, count):
+        """ Remove `count` elements from `index` and their links, without notifying the change. """
+        if count <= 0:
             return
         if self.node.graph:
-            from meshroom.core.graph import GraphModification
-            with GraphModification(self.node.graph):
-                # remove potential links
-                for i in range(index, index + count):
-                    attr = self._value.at(i)
-                    if attr.isLink:
-                        # delete edge if the attribute is linked
-                        self.node.graph.removeEdge(attr)
-        self._value.removeAt(index, count)
-        self.requestGraphUpdate()
+            # remove potential links
+            for i in range(index, index + count):
+                attr = self._columns.elements[i] if self._columns is not None else self._value.at(i)
+                if attr is not None and attr.isLink:
+                    # delete edge if the attribute is linked
+                    self.node.graph.removeEdge(attr)
+        if self._columns is not None:
+            self._columns.remove(index, count)
+        else:
+            self._value.removeAt(index, count)
+
+    def _graphModification(self):
+        """ Trigger a single graph update for the modifications of the elements (see GraphModification). """
+        if not self.node.graph:
+            return nullcontext()
+        from meshroom.core.graph import GraphModification
+        return GraphModification(self.node.graph)
+
+    def _notifyChanged(self, inserted=()):
+        """ Notify a change of the elements, and link the `inserted` elements set with expressions. """
+        self._invalidateChildrenUidCache()
         self.valueChanged.emit()
+        for attr in inserted:
+            attr._applyExpr()
+        self.requestGraphUpdate()
 
     def uid(self):
-        if isinstance(self.value, ListModel):
+        local = self.isInput and not self.isLink
+        key = uidEnabledKey(self.attributeDesc, self.node) if local else None
+        if local and self._childrenUidCache is not None and self._childrenUidCache[0] == key:
+            return self._childrenUidCache[1]
+        if (columns := self._localColumns()) is not None:
+            uids, local = self._columnsUids(columns, key)
+        elif isinstance(self.value, ListModel):
             uids = []
             for value in self.value:
                 if value.invalidate:
                     uids.append(value.uid())
-            return hashValue(uids)
-        return super().uid()
+                    local = local and value._hasLocalUid()
+        else:
+            return super().uid()
+        uid = hashValue(uids)
+        self._childrenUidCache = (key, uid) if local else None
+        return uid
+
+    def _columnsUids(self, columns: ListColumns, key: tuple) -> tuple[list[str], bool]:
+        """
+        Get the UIDs of the elements stored in columns, and whether they only depend on their values.
+        The UIDs of the elements which have not been created are cached in the columns.
+        """
+        elementDesc = self.attributeDesc.elementDesc
+        if not elementDesc.invalidate:
+            return [], True
+        if columns.uidsKey != key:
+            columns.uids = [None] * len(columns)
+            columns.uidsKey = key
+        # Children contributing to the UID of the elements (see GroupAttribute.uid)
+        names = [childDesc.name for childDesc, (enabled, _) in zip(elementDesc.groupDesc, key)
+                 if enabled and childDesc.invalidate]
+        uids = []
+        local = True
+        for i, element in enumerate(columns.elements):
+            if element is not None:
+                uids.append(element.uid())
+                local = local and element._hasLocalUid()
+                continue
+            uid = columns.uids[i]
+            if uid is None:
+                uid = columns.uids[i] = hashValue([self._valueUid(columns.value(i, name)) for name in names])
+            uids.append(uid)
+        return uids, local
+
+    def _hasLocalUid(self) -> bool:
+        # Set by the last computation of the UID
+        return self._childrenUidCache is not None
+
+    def isUidIgnored(self) -> bool:
+        # Elements stored in columns are not created to be compared with the ignored value,
+        # which can not be a ListModel
+        if self._localColumns() is not None:
+            return False
+        return super().isUidIgnored()
+
+    @staticmethod
+    def _valueUid(value) -> str:
+        """ UID of an input attribute with the given value (see Attribute.uid). """
+        if isinstance(value, (list, tuple, set,)):
+            return hashValue([hashValue(v) for v in sorted(value)])
+        return hashValue(value)
 
     def _applyExpr(self):
         if not self.node.graph:
@@ -731,40 +1149,78 @@ class ListAttribute(Attribute):
         if isinstance(self._value, ListAttribute) or Attribute.isLinkExpression(self._value):
             super()._applyExpr()
         else:
-            for value in self._value:
+            for value in self._elements():
                 value._applyExpr()
 
     def getExportValue(self):
         if self.isLink:
             return self.getLinkParam().asLinkExpr()
+        if self._columns is not None:
+            return [element.getExportValue() if element is not None else self._columns.row(i)
+                    for i, element in enumerate(self._columns.elements)]
         return [attr.getExportValue() for attr in self._value]
 
     def defaultValue(self) -> list:
         return []
 
     def _isDefault(self) -> bool:
-        return len(self._value) == 0
+        return len(self._columns if self._columns is not None else self._value) == 0
 
     def getPrimitiveValue(self, exportDefault=True):
+        if self._columns is not None:
+            return [self._rowPrimitiveValue(i, exportDefault) for i in range(len(self._columns))
+                    if exportDefault or not self._isRowDefault(i)]
         if exportDefault:
             return [attr.getPrimitiveValue(exportDefault=exportDefault) for attr in self._value]
         return [attr.getPrimitiveValue(exportDefault=exportDefault) for attr in self._value
                 if not attr.isDefault]
 
+    def _rowPrimitiveValue(self, index, exportDefault):
+        element = self._columns.elements[index]
+        if element is not None:
+            return element.getPrimitiveValue(exportDefault=exportDefault)
+        row = self._columns.row(index)
+        if exportDefault:
+            return row
+        childDescs = self.attributeDesc.elementDesc.groupDesc
+        return {childDesc.name: row[childDesc.name] for childDesc in childDescs
+                if row[childDesc.name] != childDesc.value}
+
+    def _isRowDefault(self, index):
+        element = self._columns.elements[index]
+        if element is not None:
+            return element.isDefault
+        return all(self._columns.value(index, childDesc.name) == childDesc.value
+                   for childDesc in self.attributeDesc.elementDesc.groupDesc)
+
     def getValueStr(self, withQuotes=True) -> str:
-        assert isinstance(self.value, ListModel)
+        if (columns := self._localColumns()) is not None:
+            valueStrs = [self._rowValueStr(i, withQuotes) for i in range(len(columns))]
+        else:
+            assert isinstance(self.value, ListModel)
+            valueStrs = [v.getValueStr(withQuotes=withQuotes and self.attributeDesc.joinChar == ' ')
+                         for v in self.value]
         if self.attributeDesc.joinChar == ' ':
-            return self.attributeDesc.joinChar.join([v.getValueStr(withQuotes=withQuotes)
-                                                     for v in self.value])
-        v = self.attributeDesc.joinChar.join([v.getValueStr(withQuotes=False)
-                                              for v in self.value])
+            return self.attributeDesc.joinChar.join(valueStrs)
+        v = self.attributeDesc.joinChar.join(valueStrs)
         if withQuotes and v:
             return f'"{v}"'
         return v
 
+    def _rowValueStr(self, index, withQuotes):
+        """ Get the value string of the element at `index` (see GroupAttribute.getValueStr). """
+        withQuotes = withQuotes and self.attributeDesc.joinChar == ' '
+        element = self._columns.elements[index]
+        if element is not None:
+            return element.getValueStr(withQuotes=withQuotes)
+        return GroupAttribute.formatValueStr(
+            self.attributeDesc.elementDesc,
+            lambda childDesc, quotes: self._valueStr(childDesc, self._columns.value(index, childDesc.name), quotes),
+            withQuotes)
+
     def updateInternals(self):
         super().updateInternals()
-        for attr in self._value:
+        for attr in self._elements():
             attr.updateInternals()
 
     @property
@@ -774,7 +1230,7 @@ class ListAttribute(Attribute):
         # invalid at some point
         return self.isLink \
             or self.node.graph and self.isInput and self.node.graph._edges \
-            and any(v in self.node.graph._edges.keys() for v in self._value)
+            and any(v in self.node.graph._edges.keys() for v in self._elements())
 
     # override
     @property
@@ -782,28 +1238,29 @@ class ListAttribute(Attribute):
         """ Whether the attribute has output connections, i.e is the source of at least one edge. """
 
         # safety check to avoid evaluation errors
-        if not self.node.graph or not self.node.graph.edges:
+        if not self.node.graph:
             return False
 
-        return next((edge for edge in self.node.graph.edges.values() if edge.src == self), None) is not None or \
-            any(attr.hasOutputConnections for attr in self._value if hasattr(attr, 'hasOutputConnections'))
+        return self.node.graph.hasOutEdges(self) or \
+            any(attr.hasOutputConnections for attr in self._elements() if hasattr(attr, 'hasOutputConnections'))
 
     # override
     def getInputConnections(self) -> list["Edge"]:
-        if not self.node.graph or not self.node.graph.edges:
+        if not self.node.graph:
             return []
-
-        return [edge for edge in self.node.graph.edges.values() if edge.dst == self or edge.dst in self._value]
+        graph = self.node.graph
+        edges = (graph.edge(attr) for attr in [self, *self._elements()])
+        return [edge for edge in edges if edge]
 
     # override
     def getOutputConnections(self) -> list["Edge"]:
-        if not self.node.graph or not self.node.graph.edges:
+        if not self.node.graph:
             return []
-
-        return [edge for edge in self.node.graph.edges.values() if edge.src == self or edge.src in self._value]
+        graph = self.node.graph
+        return [edge for attr in [self, *self._elements()] for edge in graph.outEdges(attr)]
 
     # Override value property setter
-    value = Property(Variant, Attribute._get_value, _set_value, notify=Attribute.valueChanged)
+    value = Property(Variant, _get_value, _set_value, notify=Attribute.valueChanged)
     isDefault = Property(bool, _isDefault, notify=Attribute.valueChanged)
     baseType = Property(str, getBaseType, constant=True)
     isLinkNested = Property(bool, isLinkNested.fget)
@@ -884,11 +1341,24 @@ class GroupAttribute(Attribute):
             return None
 
     def uid(self):
+        key = uidEnabledKey(self.attributeDesc, self.node)
+        if self._childrenUidCache is not None and self._childrenUidCache[0] == key:
+            return self._childrenUidCache[1]
         uids = []
-        for k, v in self._value.items():
-            if v.enabled and v.invalidate:
+        local = self.isInput
+        # The key holds the enabled state of the children
+        for childDesc, (enabled, _) in zip(self.attributeDesc.groupDesc, key):
+            v = self._value.get(childDesc.name)
+            if enabled and v.invalidate:
                 uids.append(v.uid())
-        return hashValue(uids)
+                local = local and v._hasLocalUid()
+        uid = hashValue(uids)
+        self._childrenUidCache = (key, uid) if local else None
+        return uid
+
+    def _hasLocalUid(self) -> bool:
+        # Set by the last computation of the UID
+        return self._childrenUidCache is not None
 
     def _applyExpr(self):
         for value in self._value:
@@ -910,23 +1380,37 @@ class GroupAttribute(Attribute):
                 if not attr.isDefault}
 
     def getValueStr(self, withQuotes=True):
+        return self.formatValueStr(self.attributeDesc,
+                                   lambda attr, quotes: self._value.get(attr.name).getValueStr(withQuotes=quotes),
+                                   withQuotes)
+
+    @staticmethod
+    def formatValueStr(attributeDesc: desc.GroupAttribute, childValueStr, withQuotes: bool) -> str:
+        """
+        Format the value of a group from the values of its children.
+
+        Args:
+            attributeDesc: the description of the group.
+            childValueStr: function returning the value string of a child, from its description
+                and whether it should be quoted.
+            withQuotes: whether the value should be quoted.
+        """
         # add brackets if requested
         strBegin = ''
         strEnd = ''
-        if self.attributeDesc.brackets is not None:
-            if len(self.attributeDesc.brackets) == 2:
-                strBegin = self.attributeDesc.brackets[0]
-                strEnd = self.attributeDesc.brackets[1]
+        if attributeDesc.brackets is not None:
+            if len(attributeDesc.brackets) == 2:
+                strBegin = attributeDesc.brackets[0]
+                strEnd = attributeDesc.brackets[1]
             else:
-                raise AttributeError(f"Incorrect brackets on GroupAttribute: {self.attributeDesc.brackets}")
+                raise AttributeError(f"Incorrect brackets on GroupAttribute: {attributeDesc.brackets}")
 
         # particular case when using space separator
-        spaceSep = self.attributeDesc.joinChar == ' '
+        spaceSep = attributeDesc.joinChar == ' '
 
         # sort values based on child attributes group description order
-        sortedSubValues = [self._value.get(attr.name).getValueStr(withQuotes=spaceSep)
-                           for attr in self.attributeDesc.groupDesc]
-        s = self.attributeDesc.joinChar.join(sortedSubValues)
+        sortedSubValues = [childValueStr(attr, spaceSep) for attr in attributeDesc.groupDesc]
+        s = attributeDesc.joinChar.join(sortedSubValues)
 
         if withQuotes and not spaceSep:
             return f'"{strBegin}{s}{strEnd}"'
@@ -0,0 +1,283 @@
+"""
+Garbage collection of the cache folders.
+
+Node internal folders are created at '{cache}/{nodeType}/{uid}' and are never removed when the node parameters change.
+The garbage collector computes the set of live folders from one or more projects, scans the cache folders
+and selects the orphaned folders to remove, by age and/or to fit a size budget.
+
+Scanning a large cache is dominated by the file system latency, especially on network file systems:
+folders are scanned in parallel, and their sizes are recorded in a SQLite index at the root of the cache folder.
+A folder is only scanned again if one of its directories has been modified (files added, removed or renamed).
+Sizes are apparent file sizes, and files modified in place are accounted for on the next change of their folder.
+"""
+
+import logging
+import os
+import shutil
+import sqlite3
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Optional
+
+from meshroom.core.graph import loadGraph
+from meshroom.core.statusLoader import readStatusFile
+
+
+@dataclass
+class CacheFolder:
+    """ Internal folder of a node in a cache folder. """
+    path: str
+    nodeType: str
+    uid: str
+    # Apparent size of the files, in bytes
+    size: int
+    # Last modification of the folder or one of its sub-folders (seconds since epoch)
+    lastModified: float
+    # Whether the folder is used by one of the projects
+    live: bool = False
+
+
+def normPath(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+class CacheSizeIndex:
+    """ SQLite index of the sizes of the node folders of a cache folder. """
+
+    FILENAME = "cacheSizeIndex.db"
+    # Time (in seconds) to wait for concurrent writers to release the database
+    TIMEOUT = 5.0
+
+    def __init__(self, cacheDir: str):
+        self._cacheDir = cacheDir
+        self._filepath = os.path.join(cacheDir, self.FILENAME)
+
+    @property
+    def filepath(self) -> str:
+        return self._filepath
+
+    def key(self, folder: str) -> str:
+        return os.path.relpath(folder, self._cacheDir).replace(os.sep, "/")
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._filepath, timeout=self.TIMEOUT)
+        connection.execute("CREATE TABLE IF NOT EXISTS folders ("
+                           "path TEXT PRIMARY KEY, nbDirs INTEGER, mtime_ns INTEGER, size INTEGER)")
+        return connection
+
+    def read(self) -> dict[str, tuple[tuple, int]]:
+        """ Get the recorded (signature, size) per folder key. """
+        if not os.path.exists(self._filepath):
+            return {}
+        try:
+            with closing(self._connect()) as connection:
+                rows = connection.execute("SELECT path, nbDirs, mtime_ns, size FROM folders").fetchall()
+        except sqlite3.Error as e:
+            logging.debug(f"Failed to read cache size index '{self._filepath}': {e}")
+            return {}
+        return {key: ((nbDirs, mtimeNs), size) for key, nbDirs, mtimeNs, size in rows}
+
+    def update(self, folders: dict[str, tuple[tuple, int]], removed: Iterable[str] = ()):
+        """
+        Record the sizes of folders and remove the records of deleted folders, in a single transaction.
+
+        Args:
+            folders: the (signature, size) per folder to record.
+            removed: the folders to remove from the index.
+        """
+        rows = [(self.key(folder), *signature, size) for folder, (signature, size) in folders.items()]
+        removed = [(self.key(folder),) for folder in removed]
+        if not rows and not removed:
+            return
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.executemany("INSERT OR REPLACE INTO folders VALUES (?, ?, ?, ?)", rows)
+                connection.executemany("DELETE FROM folders WHERE path = ?", removed)
+        except sqlite3.Error as e:
+            logging.debug(f"Failed to update cache size index '{self._filepath}': {e}")
+
+
+def _scanFolder(folder: str, knownSignature: Optional[tuple], knownSize: int) -> tuple[tuple, int, float]:
+    """
+    Compute the size of a folder, unless its signature matches `knownSignature`.
+    Directories are listed without querying the files, which are only queried when the size has to be computed.
+
+    Returns:
+        The signature of the folder, its size and its last modification time.
+    """
+    nbDirs = 0
+    mtimeNs = 0
+    fileEntries = []
+    folders = [folder]
+    while folders:
+        current = folders.pop()
+        try:
+            mtimeNs = max(mtimeNs, os.stat(current).st_mtime_ns)
+            nbDirs += 1
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        folders.append(entry.path)
+                    else:
+                        fileEntries.append(entry)
+        except OSError:
+            # Removed while being scanned
+            continue
+    signature = (nbDirs, mtimeNs)
+    if signature == knownSignature:
+        return signature, knownSize, mtimeNs / 1e9
+    size = 0
+    for entry in fileEntries:
+        try:
+            size += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            pass
+    return signature, size, mtimeNs / 1e9
+
+
+def _listNodeFolders(cacheDir: str) -> list[tuple[str, str, str]]:
+    """ Return the (path, node type, uid) of the node folders of a cache folder. """
+    folders = []
+    try:
+        with os.scandir(cacheDir) as nodeTypes:
+            for nodeType in nodeTypes:
+                if nodeType.name.startswith(".") or not nodeType.is_dir(follow_symlinks=False):
+                    continue
+                try:
+                    with os.scandir(nodeType.path) as uids:
+                        folders.extend((uid.path, nodeType.name, uid.name) for uid in uids
+                                       if not uid.name.startswith(".") and uid.is_dir(follow_symlinks=False))
+                except OSError:
+                    pass
+    except OSError as e:
+        logging.warning(f"Failed to list cache folder '{cacheDir}': {e}")
+    return folders
+
+
+def liveFolders(projectFiles: Iterable[str]) -> dict[str, set[str]]:
+    """
+    Compute the node folders used by projects.
+
+    Args:
+        projectFiles: the paths to the projects (.mg files).
+
+    Returns:
+        The set of normalized node folders per normalized cache folder.
+    """
+    folders = defaultdict(set)
+    for projectFile in projectFiles:
+        graph = loadGraph(projectFile)
+        cacheDir = normPath(graph.cacheDir)
+        for node in graph.nodes:
+            folders[cacheDir].add(normPath(node.internalFolder))
+    return dict(folders)
+
+
+def scanCache(cacheDir: str, live: Iterable[str] = (), maxWorkers: int = 8, useIndex: bool = True) -> list[CacheFolder]:
+    """
+    Scan the node folders of a cache folder.
+
+    Args:
+        cacheDir: the cache folder.
+        live: the normalized node folders used by projects.
+        maxWorkers: the number of folders scanned in parallel.
+        useIndex: whether to use and update the size index of the cache folder.
+
+    Returns:
+        The node folders, with their size.
+    """
+    live = set(live)
+    index = CacheSizeIndex(cacheDir) if useIndex else None
+    known = index.read() if index else {}
+    nodeFolders = _listNodeFolders(cacheDir)
+
+    def scan(item):
+        path, _, _ = item
+        signature, size = known.get(index.key(path), (None, 0)) if index else (None, 0)
+        return _scanFolder(path, signature, size)
+
+    with ThreadPoolExecutor(max_workers=max(1, maxWorkers)) as executor:
+        results = list(executor.map(scan, nodeFolders))
+
+    folders = []
+    updated = {}
+    for (path, nodeType, uid), (signature, size, lastModified) in zip(nodeFolders, results):
+        folders.append(CacheFolder(path, nodeType, uid, size, lastModified, live=normPath(path) in live))
+        if index and known.get(index.key(path)) != (signature, size):
+            updated[path] = (signature, size)
+    if index:
+        scannedKeys = {index.key(path) for path, _, _ in nodeFolders}
+        removed = [os.path.join(cacheDir, key) for key in known if key not in scannedKeys]
+        index.update(updated, removed)
+    return folders
+
+
+def isFolderActive(folder: str) -> bool:
+    """ Whether a node folder contains chunks being submitted or computed. """
+    try:
+        with os.scandir(folder) as it:
+            statusFiles = [entry.path for entry in it if entry.name == "status" or entry.name.endswith(".status")]
+    except OSError:
+        return False
+    for statusFile in statusFiles:
+        content, _ = readStatusFile(statusFile)
+        if content is not None and content.data.get("status") in ("SUBMITTED", "RUNNING"):
+            return True
+    return False
+
+
+def selectGarbage(folders: list[CacheFolder], minAge: Optional[float] = None, maxSize: Optional[int] = None,
+                  now: Optional[float] = None) -> list[CacheFolder]:
+    """
+    Select the orphaned node folders to remove.
+    Folders used by a project and folders of chunks being submitted or computed are never selected.
+
+    Args:
+        folders: the scanned node folders.
+        minAge: (optional) only select folders not modified for this duration (in seconds).
+        maxSize: (optional) only select the oldest folders needed to bring the total size within this budget
+            (in bytes). All the orphaned folders are selected otherwise.
+        now: (optional) the reference time for the age of the folders.
+
+    Returns:
+        The folders to remove, oldest first.
+    """
+    now = time.time() if now is None else now
+    candidates = sorted((f for f in folders if not f.live), key=lambda f: f.lastModified)
+    if minAge is not None:
+        candidates = [f for f in candidates if now - f.lastModified >= minAge]
+    excess = sum(f.size for f in folders) - maxSize if maxSize is not None else None
+    garbage = []
+    for folder in candidates:
+        if excess is not None and excess <= 0:
+            break
+        if isFolderActive(folder.path):
+            continue
+        garbage.append(folder)
+        if excess is not None:
+            excess -= folder.size
+    return garbage
+
+
+def deleteFolders(cacheDir: str, folders: list[CacheFolder]) -> int:
+    """
+    Delete node folders of a cache folder and remove them from its size index.
+
+    Returns:
+        The size of the deleted folders, in bytes.
+    """
+    deleted = []
+    for folder in folders:
+        try:
+            shutil.rmtree(folder.path)
+            deleted.append(folder)
+        except OSError as e:
+            logging.warning(f"Failed to remove cache folder '{folder.path}': {e}")
+    index = CacheSizeIndex(cacheDir)
+    if os.path.exists(index.filepath):
+        index.update({}, [folder.path for folder in deleted])
+    return sum(folder.size for folder in deleted)
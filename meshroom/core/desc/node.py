@@ -1,4 +1,6 @@
 import enum
+from collections import ChainMap
+from collections.abc import Mapping
 from inspect import getfile
 from pathlib import Path
 import logging
@@ -9,10 +11,11 @@ import shutil
 import sys
 
 from .computation import Level, StaticNodeSize
-from .attribute import StringParam, ColorParam
+from .attribute import StringParam, ColorParam, ListAttribute
 
 import meshroom
 from meshroom.core import cgroup
+from meshroom.env import EnvVar
 
 _MESHROOM_ROOT = Path(meshroom.__file__).parent.parent.as_posix()
 if getattr(sys, "frozen", False):  # When in release package mode, the path to meshroom_compute differs
@@ -23,6 +26,14 @@ else:
     _MESHROOM_COMPUTE_EXE = f"python {_MESHROOM_COMPUTE}"
 
 
+def truncateCommandLine(cmd: str) -> str:
+    """ Truncate a command line to be saved in a status file (see MESHROOM_ARGUMENTS_FILE_SIZE). """
+    maxSize = EnvVar.get(EnvVar.MESHROOM_ARGUMENTS_FILE_SIZE)
+    if maxSize <= 0 or len(cmd) <= maxSize:
+        return cmd
+    return f"{cmd[:maxSize]}... ({len(cmd)} characters)"
+
+
 class MrNodeType(enum.Enum):
     NONE = enum.auto()
     BASENODE = enum.auto()
@@ -149,7 +160,7 @@ class BaseNode(object):
     def executeChunkCommandLine(self, chunk, cmd, env=None):
         try:
             with open(chunk.logFile, 'w') as logF:
-                chunk.status.commandLine = cmd
+                chunk.status.commandLine = truncateCommandLine(cmd)
                 chunk.saveStatusFile()
                 cmdList = shlex.split(cmd)
                 # Resolve executable to full path
@@ -277,6 +288,8 @@ class CommandLineNode(BaseNode):
     commandLine = ""  # need to be defined on the node
     parallelization = None
     commandLineRange = ""
+    # Whether the program reads arguments from files given as '@<file>' (see MESHROOM_ARGUMENTS_FILE_SIZE)
+    supportsArgumentsFile = False
 
     def __init__(self):
         super(CommandLineNode, self).__init__()
@@ -290,7 +303,44 @@ class CommandLineNode(BaseNode):
         if chunk.node.isParallelized and chunk.node.size > 1:
             cmdSuffix = " " + self.commandLineRange.format(**chunk.range.toDict()) + " " + cmdSuffix
 
-        return cmdPrefix + chunk.node.nodeDesc.commandLine.format(**chunk.node._cmdVars) + cmdSuffix
+        cmdVars = self.writeArgumentsFile(chunk)
+        return cmdPrefix + chunk.node.nodeDesc.commandLine.format_map(cmdVars) + cmdSuffix
+
+    def writeArgumentsFile(self, chunk) -> Mapping:
+        """
+        Write the large list arguments of a chunk to its arguments file, one token per line,
+        if the program supports it and their size exceeds MESHROOM_ARGUMENTS_FILE_SIZE.
+
+        Returns:
+            The command variables of the node, where the first written argument is replaced by
+            a reference to the arguments file and the others are removed.
+        """
+        cmdVars = chunk.node._cmdVars
+        maxSize = EnvVar.get(EnvVar.MESHROOM_ARGUMENTS_FILE_SIZE)
+        if not self.supportsArgumentsFile or maxSize <= 0:
+            return cmdVars
+        attrs = [attr for name, attr in chunk.node._attributes.objects.items()
+                 if attr.isInput and isinstance(attr.attributeDesc, ListAttribute)
+                 and len(cmdVars.get(name, "")) > maxSize]
+        if not attrs:
+            return cmdVars
+
+        cmdVars = ChainMap({}, cmdVars)
+        reference = shlex.quote(f"@{chunk.argumentsFile}")
+        tokens = []
+        for attr in attrs:
+            argument = cmdVars[attr.name]
+            tokens.extend(shlex.split(argument))
+            group = attr.attributeDesc.group
+            group = group(chunk.node) if callable(group) else group
+            cmdVars[attr.name] = reference
+            if (groupArguments := cmdVars.get(group)) is not None:
+                cmdVars[group] = groupArguments.replace(" " + argument, (" " + reference) if reference else "", 1)
+            # Only reference the file once
+            reference = ""
+        with open(chunk.argumentsFile, "w") as f:
+            f.write("\n".join(tokens) + "\n")
+        return cmdVars
 
     def processChunk(self, chunk):
         cmd = self.buildCommandLine(chunk)
@@ -0,0 +1,385 @@
+"""
+Monitoring of the last modification times of a list of files.
+
+On Linux, the folders containing the files are watched with inotify, so changes are notified as soon as they happen
+and nothing is done while no file is modified.
+inotify does not report the changes made by other machines on network file systems (NFS, CIFS...): folders located on
+such file systems, or that do not exist yet, are polled instead. Polling is adaptive: the polling interval is reset
+to its minimum after a change and increased up to its maximum while nothing changes, and only the files of the
+folders whose modification time has changed are checked.
+Status files are written in a temporary file and renamed into place, which always updates their folder's
+modification time.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import platform
+import re
+import select
+import socket
+import struct
+import time
+from threading import Event, Lock
+from typing import Optional
+
+
+def getFileLastModTime(f: str) -> float:
+    """ Return 'mtime' of the file if it exists, -1 otherwise. """
+    try:
+        return os.path.getmtime(f)
+    except OSError:
+        return -1
+
+
+# File system types for which inotify does not report changes made by other machines
+NETWORK_FILE_SYSTEMS = {
+    "nfs", "nfs4", "cifs", "smbfs", "smb3", "ncpfs", "afs", "9p", "lustre", "gpfs", "ceph", "glusterfs",
+    "beegfs", "panfs", "gfs2", "ocfs2",
+}
+
+
+def _readMountPoints() -> list[tuple[str, str]]:
+    """ Return the list of (mount point, file system type), sorted from the longest mount point. """
+    mountPoints = []
+    try:
+        with open("/proc/self/mounts") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                # Spaces and special characters are octal-escaped in mount points
+                mountPoint = re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), fields[1])
+                mountPoints.append((mountPoint, fields[2]))
+    except OSError:
+        pass
+    return sorted(mountPoints, key=lambda m: len(m[0]), reverse=True)
+
+
+def isNetworkFileSystem(path: str, mountPoints: Optional[list[tuple[str, str]]] = None) -> bool:
+    """ Whether `path` is located on a network file system (only detected on Linux). """
+    if mountPoints is None:
+        mountPoints = _readMountPoints()
+    path = os.path.realpath(path)
+    for mountPoint, fsType in mountPoints:
+        if path == mountPoint or path.startswith(mountPoint.rstrip("/") + "/"):
+            return fsType in NETWORK_FILE_SYSTEMS or fsType.startswith("fuse")
+    return False
+
+
+class Inotify:
+    """ Minimal ctypes binding to the Linux inotify API. """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    # Events for which the watched folder is not valid anymore
+    FOLDER_EVENTS = IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | \
+        IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+    _EVENT_HEADER = struct.Struct("iIII")
+    _libc = None
+
+    @classmethod
+    def _getLibc(cls):
+        if cls._libc is None:
+            cls._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        return cls._libc
+
+    @classmethod
+    def isAvailable(cls) -> bool:
+        if platform.system() != "Linux":
+            return False
+        try:
+            return hasattr(cls._getLibc(), "inotify_init1")
+        except OSError:
+            return False
+
+    def __init__(self):
+        self._libc = self._getLibc()
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def addWatch(self, folder: str) -> int:
+        """ Watch the content of `folder`, and return the watch descriptor (-1 on failure). """
+        return self._libc.inotify_add_watch(self._fd, os.fsencode(folder), self.WATCH_MASK)
+
+    def removeWatch(self, wd: int):
+        self._libc.inotify_rm_watch(self._fd, wd)
+
+    def readEvents(self) -> list[tuple[int, int, str]]:
+        """ Read the pending events, as a list of (watch descriptor, mask, filename). """
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            if not data:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._EVENT_HEADER.unpack_from(data, offset)
+                offset += self._EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                events.append((wd, mask, name))
+        return events
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class FilesWatcher:
+    """
+    Monitor the last modification times of a list of files.
+
+    Folders are watched with inotify when possible, and polled otherwise (see module documentation).
+    `waitForChanges` is meant to be called in a loop from a dedicated thread, while the list of files
+    can be changed from any thread with `setFiles`.
+    """
+
+    # Time (in seconds) during which a polled folder is checked again after a modification
+    RECENT_MODIFICATION_DELAY = 2.0
+
+    def __init__(self, minInterval: float = 1.0, maxInterval: float = 10.0, backoff: float = 2.0,
+                 useInotify: bool = True):
+        """
+        Args:
+            minInterval: the polling interval after a change, in seconds.
+            maxInterval: the maximum polling interval, in seconds.
+            backoff: the factor applied to the polling interval while nothing changes.
+            useInotify: whether to use inotify when available.
+        """
+        self.minInterval = minInterval
+        self.maxInterval = maxInterval
+        self.backoff = backoff
+        self._interval = minInterval
+        self._mutex = Lock()
+        self._files = []
+        self._filesSet = set()
+        self._filesChanged = True
+        self._nextPollTime = 0.0
+        self._times = {}
+        self._filesPerFolder = {}
+        # Folders watched with inotify, per watch descriptor
+        self._watchedFolders = {}
+        self._watchDescriptors = {}
+        # Last modification times of the polled folders
+        self._polledFolders = {}
+        self._mountPoints = []
+        self._inotify = None
+        if useInotify and Inotify.isAvailable():
+            try:
+                self._inotify = Inotify()
+            except OSError as e:
+                logging.debug(f"FilesWatcher: inotify is not available ({e}), using polling.")
+        # A socket pair rather than a pipe, as select only accepts sockets on Windows
+        self._wakeupRead, self._wakeupWrite = socket.socketpair()
+        self._wakeupRead.setblocking(False)
+        self._wakeupWrite.setblocking(False)
+
+    @property
+    def usesInotify(self) -> bool:
+        return self._inotify is not None
+
+    @property
+    def watchedFolders(self) -> set[str]:
+        """ Folders currently watched with inotify. """
+        return set(self._watchDescriptors)
+
+    @property
+    def polledFolders(self) -> set[str]:
+        """ Folders currently polled. """
+        return set(self._polledFolders)
+
+    def setFiles(self, files: list[str]):
+        """ Set the list of files to monitor. """
+        with self._mutex:
+            self._files = list(files)
+            self._filesChanged = True
+        self.wakeup()
+
+    def wakeup(self):
+        """ Interrupt the current `waitForChanges`. """
+        try:
+            self._wakeupWrite.send(b"\0")
+        except OSError:
+            pass
+
+    def close(self):
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+        self._wakeupRead.close()
+        self._wakeupWrite.close()
+
+    def _watchFolder(self, folder: str) -> bool:
+        """ Try to watch `folder` with inotify. """
+        if not self._inotify or not os.path.isdir(folder) or isNetworkFileSystem(folder, self._mountPoints):
+            return False
+        wd = self._inotify.addWatch(folder)
+        if wd < 0:
+            return False
+        # Several paths can lead to the same folder and watch descriptor
+        self._watchedFolders.setdefault(wd, set()).add(folder)
+        self._watchDescriptors[folder] = wd
+        self._polledFolders.pop(folder, None)
+        return True
+
+    def _unwatchFolder(self, folder: str, removeWatch: bool = True):
+        wd = self._watchDescriptors.pop(folder)
+        folders = self._watchedFolders[wd]
+        folders.discard(folder)
+        if not folders:
+            del self._watchedFolders[wd]
+            if removeWatch:
+                self._inotify.removeWatch(wd)
+
+    def _pollFolder(self, folder: str):
+        self._polledFolders[folder] = getFileLastModTime(folder)
+
+    def _updateFolders(self, files: list[str]):
+        """ Update the watched and polled folders for a new list of files, and return the new files. """
+        filesPerFolder = {}
+        for f in files:
+            filesPerFolder.setdefault(os.path.dirname(f), []).append(f)
+        self._mountPoints = _readMountPoints() if self._inotify else []
+
+        for folder in list(self._watchDescriptors):
+            if folder not in filesPerFolder:
+                self._unwatchFolder(folder)
+        for folder in list(self._polledFolders):
+            if folder not in filesPerFolder:
+                del self._polledFolders[folder]
+        for folder in filesPerFolder:
+            if folder not in self._watchDescriptors and folder not in self._polledFolders:
+                if not self._watchFolder(folder):
+                    self._pollFolder(folder)
+
+        self._filesPerFolder = filesPerFolder
+        filesSet = set(files)
+        self._times = {f: t for f, t in self._times.items() if f in filesSet}
+        return [f for f in files if f not in self._times]
+
+    def _readInotifyEvents(self) -> set[str]:
+        """ Return the files modified according to the pending inotify events. """
+        modifiedFiles = set()
+        for wd, mask, name in self._inotify.readEvents():
+            if mask & Inotify.IN_Q_OVERFLOW:
+                # Events have been lost: check all the files
+                modifiedFiles.update(self._times)
+                continue
+            folders = self._watchedFolders.get(wd, ())
+            for folder in list(folders):
+                if mask & Inotify.FOLDER_EVENTS:
+                    # The folder has been removed or moved: poll it until it is created again
+                    self._unwatchFolder(folder, removeWatch=not mask & Inotify.IN_IGNORED)
+                    self._pollFolder(folder)
+                    modifiedFiles.update(self._filesPerFolder.get(folder, ()))
+                elif name:
+                    modifiedFiles.add(os.path.join(folder, name))
+        return modifiedFiles
+
+    def _checkPolledFolders(self) -> set[str]:
+        """ Return the files of the polled folders whose modification time has changed. """
+        modifiedFiles = set()
+        now = time.time()
+        for folder, modTime in list(self._polledFolders.items()):
+            newModTime = getFileLastModTime(folder)
+            # Folders modified recently are checked again, as several modifications can happen within
+            # the modification time resolution of the file system
+            if newModTime == modTime and now - newModTime > self.RECENT_MODIFICATION_DELAY:
+                continue
+            modifiedFiles.update(self._filesPerFolder.get(folder, ()))
+            if not self._watchFolder(folder):
+                self._polledFolders[folder] = newModTime
+        return modifiedFiles
+
+    def _updateTimes(self, files) -> bool:
+        """ Update the modification times of `files`, and return whether any of them has changed. """
+        changed = False
+        for f in files:
+            if f not in self._filesSet:
+                continue
+            modTime = getFileLastModTime(f)
+            if self._times.get(f) != modTime:
+                self._times[f] = modTime
+                changed = True
+        return changed
+
+    def _drainWakeup(self):
+        try:
+            while self._wakeupRead.recv(4096):
+                pass
+        except OSError:
+            pass
+
+    def waitForChanges(self, stopFlag: Event) -> Optional[tuple[list[str], list[float]]]:
+        """
+        Block until the modification time of a monitored file changes or the list of files is changed.
+
+        Args:
+            stopFlag: event interrupting the wait when set (call `wakeup` after setting it).
+
+        Returns:
+            The monitored files and their last modification times (-1 for files that do not exist),
+            or None if `stopFlag` has been set.
+        """
+        while not stopFlag.is_set():
+            with self._mutex:
+                files = self._files
+                filesChanged = self._filesChanged
+                self._filesChanged = False
+            if filesChanged:
+                self._filesSet = set(files)
+                newFiles = self._updateFolders(files)
+                self._updateTimes(newFiles)
+                self._interval = self.minInterval
+                self._nextPollTime = time.monotonic() + self._interval
+                return files, [self._times[f] for f in files]
+
+            readers = [self._wakeupRead]
+            if self._inotify:
+                readers.append(self._inotify)
+            timeout = max(0.0, self._nextPollTime - time.monotonic()) if self._polledFolders else None
+            ready, _, _ = select.select(readers, [], [], timeout)
+            if self._wakeupRead in ready:
+                self._drainWakeup()
+                continue
+
+            modifiedFiles = set()
+            if self._inotify in ready:
+                modifiedFiles.update(self._readInotifyEvents())
+            polled = self._polledFolders and time.monotonic() >= self._nextPollTime
+            if polled:
+                modifiedFiles.update(self._checkPolledFolders())
+
+            changed = self._updateTimes(modifiedFiles)
+            if polled:
+                self._interval = self.minInterval if changed else min(self._interval * self.backoff, self.maxInterval)
+                self._nextPollTime = time.monotonic() + self._interval
+            if changed:
+                return files, [self._times[f] for f in files]
+        return None
@@ -18,8 +18,12 @@ from meshroom.core import Version
 from meshroom.core.attribute import Attribute, ListAttribute, GroupAttribute
 from meshroom.core.exception import GraphCompatibilityError, StopGraphVisit, StopBranchVisit
 from meshroom.core.graphIO import GraphIO, GraphSerializer, TemplateGraphSerializer, PartialGraphSerializer
+from meshroom.core.graphSnapshot import isGraphSnapshotEnabled, readGraphSnapshot, writeGraphSnapshot
+from meshroom.core.graphTopology import GraphTopology
 from meshroom.core.node import BaseNode, Status, Node, CompatibilityNode
 from meshroom.core.nodeFactory import nodeFactory
+from meshroom.core.scheduler import ChunkScheduler, ResourceBudget
+from meshroom.core.statusLoader import updateChunksStatusFromCache
 from meshroom.core.mtyping import PathLike
 
 # Replace default encoder to support Enums
@@ -80,6 +84,23 @@ class Edge(BaseObject):
     dst = Property(Attribute, dst.fget, constant=True)
 
 
+class _EdgesView:
+    """
+    Per-node lookup tables on a set of edges.
+    Built on demand by the Graph and cached until its edges change.
+    """
+
+    def __init__(self, edges):
+        self.edges = edges
+        self.inEdges = defaultdict(set)
+        self.inputNodes = defaultdict(set)
+        self.outputNodes = defaultdict(set)
+        for edge in edges:
+            self.inEdges[edge.dst.node].add(edge)
+            self.inputNodes[edge.dst.node].add(edge.src.node)
+            self.outputNodes[edge.src.node].add(edge.dst.node)
+
+
 WHITE = 0
 GRAY = 1
 BLACK = 2
@@ -201,15 +222,29 @@ class Graph(BaseObject):
         self.name: str = name
         self._loading: bool = False
         self._saving: bool = False
+        # Whether only a part of the graph file has been loaded
+        self._partial: bool = False
         self._updateEnabled: bool = True
         self._updateRequested: bool = False
         self.dirtyTopology: bool = False
-        self._nodesMinMaxDepths = {}
-        self._computationBlocked = {}
+        self._topology = GraphTopology()
+        # Nodes to update on next graph update
+        self._dirtyNodes: set[BaseNode] = set()
+        # Nodes grouped by UID, with the UID each node has been registered with
+        self._nodesPerUid: dict[str, list[BaseNode]] = {}
+        self._nodeUids: dict[BaseNode, str] = {}
+        # UIDs whose group of nodes has changed since last update
+        self._dirtyUids: set[str] = set()
         self._canComputeLeaves: bool = True
         self._nodes = DictModel(keyAttrName='name', parent=self)
         # Edges: use dst attribute as unique key since it can only have one input connection
         self._edges = DictModel(keyAttrName='dst', parent=self)
+        # Edges index, per node and per source attribute (dicts are used as insertion-ordered sets)
+        self._nodeInEdges: dict[BaseNode, dict[Edge, None]] = defaultdict(dict)
+        self._nodeOutEdges: dict[BaseNode, dict[Edge, None]] = defaultdict(dict)
+        self._attributeOutEdges: dict[Attribute, dict[Edge, None]] = defaultdict(dict)
+        # Views on all edges and on dependencies-only edges, indexed by 'dependenciesOnly'
+        self._edgesViews: dict[bool, _EdgesView] = {}
         self._compatibilityNodes = DictModel(keyAttrName='name', parent=self)
         self._cacheDir: str = ''
         self._filepath: str = ''
@@ -223,11 +258,21 @@ class Graph(BaseObject):
 
     def _clearGraphContent(self):
         self._edges.clear()
+        self._nodeInEdges.clear()
+        self._nodeOutEdges.clear()
+        self._attributeOutEdges.clear()
+        self._edgesViews.clear()
+        self._topology.clear()
+        self._dirtyNodes.clear()
+        self._nodesPerUid.clear()
+        self._nodeUids.clear()
+        self._dirtyUids.clear()
         # Tell QML nodes are going to be deleted
         for node in self._nodes:
             node.alive = False
         self._nodes.clear()
         self._compatibilityNodes.clear()
+        self._partial = False
 
     @property
     def fileFeatures(self):
@@ -245,15 +290,26 @@ class Graph(BaseObject):
         return self._saving
 
     @Slot(str)
-    def load(self, filepath: PathLike):
+    def load(self, filepath: PathLike, upstreamOf: Optional[Iterable[str]] = None):
         """
         Load a Meshroom Graph ".mg" file in place.
 
         Args:
             filepath: The path to the Meshroom Graph file to load.
-        """
+            upstreamOf: (optional) Only load the nodes matching these node expressions (see `findNode`)
+                        and the nodes they depend on. Such a partial graph cannot be saved in place.
+        """
+        graphData = Graph._loadNormalizedGraphData(filepath)
+        if upstreamOf is not None:
+            graphContent = graphData[GraphIO.Keys.Graph]
+            nodeNames = Graph._upstreamNodeNames(graphContent, upstreamOf)
+            graphData = {
+                GraphIO.Keys.Header: graphData[GraphIO.Keys.Header],
+                GraphIO.Keys.Graph: {name: graphContent[name] for name in nodeNames},
+            }
         self._setFilepath(filepath)
-        self._deserialize(Graph._loadGraphData(filepath))
+        self._deserialize(graphData, normalized=True)
+        self._partial = upstreamOf is not None
         self._fileDateVersion = os.path.getmtime(filepath)
 
     def initFromTemplate(self, filepath: PathLike, publishOutputs: bool = False):
@@ -267,7 +323,7 @@ class Graph(BaseObject):
             filepath: The path to the Meshroom Graph file to load.
             publishOutputs: (optional) Whether to keep 'Publish' nodes.
         """
-        self._deserialize(Graph._loadGraphData(filepath))
+        self._deserialize(Graph._loadNormalizedGraphData(filepath), normalized=True)
 
         # Creating nodes from a template is conceptually similar to explicit node creation,
         # therefore the nodes descriptors' "onNodeCreated" callback is triggered for each
@@ -286,19 +342,84 @@ class Graph(BaseObject):
             graphData = json.load(file)
         return graphData
 
+    @staticmethod
+    def _loadNormalizedGraphData(filepath: PathLike) -> dict:
+        """
+        Deserialize the content of the Meshroom Graph file at `filepath` to a dictionnary,
+        with the graph content normalized to the current file version.
+        Use the snapshot of the file if enabled (see meshroom.core.graphSnapshot).
+        """
+        useSnapshot = isGraphSnapshotEnabled()
+        if useSnapshot:
+            fileStat = os.stat(filepath)
+            graphData = readGraphSnapshot(filepath, fileStat)
+            if graphData is not None:
+                return graphData
+
+        graphData = Graph._loadGraphData(filepath)
+        header = graphData.get(GraphIO.Keys.Header, {})
+        fileVersion = Version(header.get(GraphIO.Keys.FileVersion, "0.0"))
+        graphData = {
+            GraphIO.Keys.Header: header,
+            GraphIO.Keys.Graph: Graph._normalizeGraphContent(graphData, fileVersion),
+        }
+
+        # Do not record a snapshot of a file modified while being read
+        if useSnapshot and fileStat == os.stat(filepath):
+            writeGraphSnapshot(filepath, fileStat, graphData)
+        return graphData
+
+    @staticmethod
+    def _upstreamNodeNames(graphContent: dict, nodeExprs: Iterable[str]) -> set[str]:
+        """
+        Return the names of the nodes of a serialized graph content matching `nodeExprs` and of all the nodes they
+        depend on, following the link expressions of their inputs.
+        """
+        def linkedNodeNames(value):
+            if isinstance(value, dict):
+                for v in value.values():
+                    yield from linkedNodeNames(v)
+            elif isinstance(value, list):
+                for v in value:
+                    yield from linkedNodeNames(v)
+            elif Attribute.isLinkExpression(value):
+                yield value[1:-1].split(".", 1)[0]
+
+        toVisit = []
+        for nodeExpr in nodeExprs:
+            if nodeExpr in graphContent:
+                toVisit.append(nodeExpr)
+            else:
+                # Keep all the candidates, for `findNode` to behave as on the whole graph
+                pattern = re.compile("^" + nodeExpr)
+                toVisit.extend(name for name in graphContent if pattern.match(name))
+        nodeNames = set()
+        while toVisit:
+            name = toVisit.pop()
+            if name in nodeNames or name not in graphContent:
+                continue
+            nodeNames.add(name)
+            nodeData = graphContent[name]
+            toVisit.extend(linkedNodeNames(nodeData.get("inputs", {})))
+        return nodeNames
+
     @blockNodeCallbacks
-    def _deserialize(self, graphData: dict):
+    def _deserialize(self, graphData: dict, normalized: bool = False):
         """Deserialize `graphData` in the current Graph instance.
 
         Args:
             graphData: The serialized Graph.
+            normalized: Whether the graph content has already been normalized to the current file version.
         """
         self._clearGraphContent()
         self.header.clear()
 
         self.header = graphData.get(GraphIO.Keys.Header, {})
         fileVersion = Version(self.header.get(GraphIO.Keys.FileVersion, "0.0"))
-        graphContent = self._normalizeGraphContent(graphData, fileVersion)
+        if normalized:
+            graphContent = graphData[GraphIO.Keys.Graph]
+        else:
+            graphContent = self._normalizeGraphContent(graphData, fileVersion)
         isTemplate = self.header.get(GraphIO.Keys.Template, False)
 
         with GraphModification(self):
@@ -324,7 +445,8 @@ class Graph(BaseObject):
         # that were computed.
         self._evaluateUidConflicts(graphContent)
 
-    def _normalizeGraphContent(self, graphData: dict, fileVersion: Version) -> dict:
+    @staticmethod
+    def _normalizeGraphContent(graphData: dict, fileVersion: Version) -> dict:
         graphContent = graphData.get(GraphIO.Keys.Graph, graphData)
 
         if fileVersion < Version("2.0"):
@@ -487,6 +609,9 @@ class Graph(BaseObject):
         node._name = uniqueName
         node.graph = self
         self._nodes.add(node)
+        self._topology.addNode(node)
+        if node.dirty:
+            self._dirtyNodes.add(node)
 
     def addNode(self, node, uniqueName=None):
         """
@@ -576,17 +701,24 @@ class Graph(BaseObject):
     def outEdges(self, attribute):
         """ Return the list of edges starting from the given attribute """
         # type: (Attribute,) -> [Edge]
-        return [edge for edge in self.edges if edge.src == attribute]
+        edges = self._attributeOutEdges.get(attribute)
+        return list(edges) if edges else []
+
+    def hasOutEdges(self, attribute) -> bool:
+        """ Whether the given attribute is the source of at least one edge. """
+        return bool(self._attributeOutEdges.get(attribute))
 
     def nodeInEdges(self, node):
         # type: (Node) -> [Edge]
         """ Return the list of edges arriving to this node """
-        return [edge for edge in self.edges if edge.dst.node == node]
+        edges = self._nodeInEdges.get(node)
+        return list(edges) if edges else []
 
     def nodeOutEdges(self, node):
         # type: (Node) -> [Edge]
         """ Return the list of edges starting from this node """
-        return [edge for edge in self.edges if edge.src.node == node]
+        edges = self._nodeOutEdges.get(node)
+        return list(edges) if edges else []
 
     @changeTopology
     def removeNode(self, nodeName):
@@ -636,6 +768,11 @@ class Graph(BaseObject):
 
             node.alive = False
             self._nodes.remove(node)
+            self._topology.removeNode(node)
+            self._nodeInEdges.pop(node, None)
+            self._nodeOutEdges.pop(node, None)
+            self._dirtyNodes.discard(node)
+            self._unregisterNodeUid(node)
             self.update()
 
         return inEdges, outEdges, outListAttributes
@@ -885,12 +1022,12 @@ class Graph(BaseObject):
         return self._edges.get(dstAttributeName)
 
     def getLeafNodes(self, dependenciesOnly):
-        nodesWithOutputLink = {edge.src.node for edge in self.getEdges(dependenciesOnly)}
-        return set(self._nodes) - nodesWithOutputLink
+        outputNodes = self._getEdgesView(dependenciesOnly).outputNodes
+        return {node for node in self._nodes if not outputNodes.get(node)}
 
     def getRootNodes(self, dependenciesOnly):
-        nodesWithInputLink = {edge.dst.node for edge in self.getEdges(dependenciesOnly)}
-        return set(self._nodes) - nodesWithInputLink
+        inputNodes = self._getEdgesView(dependenciesOnly).inputNodes
+        return {node for node in self._nodes if not inputNodes.get(node)}
 
     @changeTopology
     def addEdge(self, srcAttr, dstAttr):
@@ -902,7 +1039,13 @@ class Graph(BaseObject):
             raise RuntimeError(f'Destination attribute "{dstAttr.getFullNameToNode()}" is already connected.')
         edge = Edge(srcAttr, dstAttr)
         self.edges.add(edge)
+        self._nodeInEdges[dstAttr.node][edge] = None
+        self._nodeOutEdges[srcAttr.node][edge] = None
+        self._attributeOutEdges[srcAttr][edge] = None
+        self._edgesViews.clear()
+        self._topology.addEdge(srcAttr.node, dstAttr.node)
         self.markNodesDirty(dstAttr.node)
+        dstAttr._invalidateChildrenUidCache()
         dstAttr.valueChanged.emit()
         dstAttr.isLinkChanged.emit()
         srcAttr.hasOutputConnectionsChanged.emit()
@@ -918,7 +1061,13 @@ class Graph(BaseObject):
         if dstAttr not in self.edges.keys():
             raise RuntimeError(f'Attribute "{dstAttr.getFullNameToNode()}" is not connected')
         edge = self.edges.pop(dstAttr)
+        self._removeEdgeFromIndex(self._nodeInEdges, dstAttr.node, edge)
+        self._removeEdgeFromIndex(self._nodeOutEdges, edge.src.node, edge)
+        self._removeEdgeFromIndex(self._attributeOutEdges, edge.src, edge)
+        self._edgesViews.clear()
+        self._topology.removeEdge(edge.src.node, dstAttr.node)
         self.markNodesDirty(dstAttr.node)
+        dstAttr._invalidateChildrenUidCache()
         dstAttr.valueChanged.emit()
         dstAttr.isLinkChanged.emit()
         edge.src.hasOutputConnectionsChanged.emit()
@@ -934,52 +1083,66 @@ class Graph(BaseObject):
             int: the node's depth in this Graph.
         """
         assert node.graph == self
-        assert not self.dirtyTopology
-        minDepth, maxDepth = self._nodesMinMaxDepths[node]
+        minDepth, maxDepth = self._topology.depths(node)
         return minDepth if minimal else maxDepth
 
+    @staticmethod
+    def _removeEdgeFromIndex(index, key, edge):
+        edges = index.get(key)
+        if edges is None:
+            return
+        edges.pop(edge, None)
+        if not edges:
+            del index[key]
+
+    def _getEdgesView(self, dependenciesOnly) -> _EdgesView:
+        """ Get the cached view on all edges or on dependencies-only edges. """
+        view = self._edgesViews.get(dependenciesOnly)
+        if view is None:
+            view = _EdgesView(self._buildEdges(dependenciesOnly))
+            self._edgesViews[dependenciesOnly] = view
+        return view
+
     def getInputEdges(self, node, dependenciesOnly):
-        return {edge for edge in self.getEdges(dependenciesOnly=dependenciesOnly) if edge.dst.node is node}
+        if not dependenciesOnly:
+            return set(self.nodeInEdges(node))
+        return set(self._getEdgesView(dependenciesOnly).inEdges.get(node, ()))
 
     def _getInputEdgesPerNode(self, dependenciesOnly):
-        nodeEdges = defaultdict(set)
+        return self._getEdgesView(dependenciesOnly).inputNodes
 
-        for edge in self.getEdges(dependenciesOnly=dependenciesOnly):
-            nodeEdges[edge.dst.node].add(edge.src.node)
+    def _getOutputEdgesPerNode(self, dependenciesOnly):
+        return self._getEdgesView(dependenciesOnly).outputNodes
 
-        return nodeEdges
+    def _dfsStartNodes(self, startNodes, reverse, dependenciesOnly, longestPathFirst):
+        if longestPathFirst and reverse:
+            # Because we have no knowledge of the node's count between a node and its leaves,
+            # it is not possible to handle this case at the moment
+            raise NotImplementedError("Graph.dfs(): longestPathFirst=True and visitor.reverse=True are not "
+                                      "compatible yet.")
 
-    def _getOutputEdgesPerNode(self, dependenciesOnly):
-        nodeEdges = defaultdict(set)
+        nodes = startNodes or (self.getRootNodes(dependenciesOnly)
+                               if reverse else self.getLeafNodes(dependenciesOnly))
 
-        for edge in self.getEdges(dependenciesOnly=dependenciesOnly):
-            nodeEdges[edge.src.node].add(edge.dst.node)
+        if longestPathFirst:
+            nodes = self._topology.sortedNodes(nodes)
+        return nodes
 
-        return nodeEdges
+    def _dfsChildren(self, u, nodeChildren, longestPathFirst):
+        children = nodeChildren.get(u, ())
+        if longestPathFirst:
+            children = sorted(children, reverse=True, key=lambda item: self._topology.depths(item)[1])
+        return children
 
     def dfs(self, visitor, startNodes=None, longestPathFirst=False):
         # Default direction (visitor.reverse=False): from node to root
         # Reverse direction (visitor.reverse=True): from node to leaves
         nodeChildren = self._getOutputEdgesPerNode(visitor.dependenciesOnly) \
                        if visitor.reverse else self._getInputEdgesPerNode(visitor.dependenciesOnly)
-        # Initialize color map
+        # Color map: nodes not in the map are WHITE
         colors = {}
-        for u in self._nodes:
-            colors[u] = WHITE
-
-        if longestPathFirst and visitor.reverse:
-            # Because we have no knowledge of the node's count between a node and its leaves,
-            # it is not possible to handle this case at the moment
-            raise NotImplementedError("Graph.dfs(): longestPathFirst=True and visitor.reverse=True are not "
-                                      "compatible yet.")
-
-        nodes = startNodes or (self.getRootNodes(visitor.dependenciesOnly)
-                               if visitor.reverse else self.getLeafNodes(visitor.dependenciesOnly))
 
-        if longestPathFirst:
-            # Graph topology must be known and node depths up-to-date
-            assert not self.dirtyTopology
-            nodes = sorted(nodes, key=lambda item: item.depth)
+        nodes = self._dfsStartNodes(startNodes, visitor.reverse, visitor.dependenciesOnly, longestPathFirst)
 
         try:
             for node in nodes:
@@ -994,28 +1157,102 @@ class Graph(BaseObject):
             pass
 
     def _dfsVisit(self, u, visitor, colors, nodeChildren, longestPathFirst):
+        """
+        Visit the nodes reachable from `u`, using an explicit stack instead of recursion.
+
+        Each frame of the stack holds a vertex, the iterator over its remaining children and the tree edge
+        to the child being visited, to be finished once the child's visit is over.
+        A StopBranchVisit raised by a visitor event aborts the visit of the current vertex, which stays GRAY,
+        and the visit resumes in its parent.
+        """
         colors[u] = GRAY
-        visitor.discoverVertex(u, self)
-        # d_time[u] = time = time + 1
-        children = nodeChildren[u]
-        if longestPathFirst:
-            assert not self.dirtyTopology
-            children = sorted(children, reverse=True, key=lambda item: self._nodesMinMaxDepths[item][1])
-        for v in children:
-            visitor.examineEdge((u, v), self)
-            if colors[v] == WHITE:
-                visitor.treeEdge((u, v), self)
-                # (u,v) is a tree edge
-                self.dfsVisit(v, visitor, colors, nodeChildren, longestPathFirst)  # TODO: avoid recursion
-            elif colors[v] == GRAY:
-                # (u,v) is a back edge
-                visitor.backEdge((u, v), self)
-            elif colors[v] == BLACK:
-                # (u,v) is a cross or forward edge
-                visitor.forwardOrCrossEdge((u, v), self)
-            visitor.finishEdge((u, v), self)
-        colors[u] = BLACK
-        visitor.finishVertex(u, self)
+        try:
+            visitor.discoverVertex(u, self)
+        except StopBranchVisit:
+            return
+        stack = [[u, iter(self._dfsChildren(u, nodeChildren, longestPathFirst)), None]]
+
+        while stack:
+            frame = stack[-1]
+            u = frame[0]
+            child = None
+            try:
+                if frame[2] is not None:
+                    # the visit of the tree edge's target is over
+                    edge, frame[2] = frame[2], None
+                    visitor.finishEdge(edge, self)
+                for v in frame[1]:
+                    edge = (u, v)
+                    visitor.examineEdge(edge, self)
+                    color = colors.get(v, WHITE)
+                    if color == WHITE:
+                        # (u,v) is a tree edge
+                        visitor.treeEdge(edge, self)
+                        frame[2] = edge
+                        child = v
+                        break
+                    elif color == GRAY:
+                        # (u,v) is a back edge
+                        visitor.backEdge(edge, self)
+                    else:
+                        # (u,v) is a cross or forward edge
+                        visitor.forwardOrCrossEdge(edge, self)
+                    visitor.finishEdge(edge, self)
+                if child is None:
+                    colors[u] = BLACK
+                    visitor.finishVertex(u, self)
+                    stack.pop()
+                    continue
+            except StopBranchVisit:
+                stack.pop()
+                continue
+
+            colors[child] = GRAY
+            try:
+                visitor.discoverVertex(child, self)
+            except StopBranchVisit:
+                continue
+            stack.append([child, iter(self._dfsChildren(child, nodeChildren, longestPathFirst)), None])
+
+    def _dfsCollect(self, startNodes, longestPathFirst, reverse, dependenciesOnly, onDiscover, filterTypes=None):
+        """
+        Visit the graph like 'dfs' without visitor events, collecting nodes and edges:
+            - onDiscover=False: nodes on finishVertex and edges on finishEdge events (see dfsOnFinish).
+            - onDiscover=True: nodes on discoverVertex and edges on examineEdge events (see dfsOnDiscover).
+        """
+        nodeChildren = self._getOutputEdgesPerNode(dependenciesOnly) \
+                       if reverse else self._getInputEdgesPerNode(dependenciesOnly)
+        colors = {}
+        nodes = []
+        edges = []
+
+        for start in self._dfsStartNodes(startNodes, reverse, dependenciesOnly, longestPathFirst):
+            colors[start] = GRAY
+            if onDiscover and (not filterTypes or start.nodeType in filterTypes):
+                nodes.append(start)
+            stack = [(start, iter(self._dfsChildren(start, nodeChildren, longestPathFirst)))]
+            while stack:
+                u, children = stack[-1]
+                for v in children:
+                    if onDiscover:
+                        edges.append((u, v))
+                    if colors.get(v, WHITE) == WHITE:
+                        colors[v] = GRAY
+                        if onDiscover and (not filterTypes or v.nodeType in filterTypes):
+                            nodes.append(v)
+                        stack.append((v, iter(self._dfsChildren(v, nodeChildren, longestPathFirst))))
+                        break
+                    if not onDiscover:
+                        edges.append((u, v))
+                else:
+                    stack.pop()
+                    colors[u] = BLACK
+                    if not onDiscover:
+                        nodes.append(u)
+                        if stack:
+                            # finish the tree edge from the parent
+                            edges.append((stack[-1][0], u))
+        return nodes, edges
 
     def dfsOnFinish(self, startNodes=None, longestPathFirst=False, reverse=False, dependenciesOnly=False):
         """
@@ -1032,13 +1269,7 @@ class Graph(BaseObject):
         Returns:
             The list of nodes and edges, from startNodes to the graph roots/leaves following edges.
         """
-        nodes = []
-        edges = []
-        visitor = Visitor(reverse=reverse, dependenciesOnly=dependenciesOnly)
-        visitor.finishVertex = lambda vertex, graph: nodes.append(vertex)
-        visitor.finishEdge = lambda edge, graph: edges.append(edge)
-        self.dfs(visitor=visitor, startNodes=startNodes, longestPathFirst=longestPathFirst)
-        return nodes, edges
+        return self._dfsCollect(startNodes, longestPathFirst, reverse, dependenciesOnly, onDiscover=False)
 
     def dfsOnDiscover(self, startNodes=None, filterTypes=None, longestPathFirst=False, reverse=False, dependenciesOnly=False):
         """
@@ -1057,18 +1288,8 @@ class Graph(BaseObject):
         Returns:
             The list of nodes and edges, from startNodes to the graph roots/leaves following edges.
         """
-        nodes = []
-        edges = []
-        visitor = Visitor(reverse=reverse, dependenciesOnly=dependenciesOnly)
-
-        def discoverVertex(vertex, graph):
-            if not filterTypes or vertex.nodeType in filterTypes:
-                nodes.append(vertex)
-
-        visitor.discoverVertex = discoverVertex
-        visitor.examineEdge = lambda edge, graph: edges.append(edge)
-        self.dfs(visitor=visitor, startNodes=startNodes, longestPathFirst=longestPathFirst)
-        return nodes, edges
+        return self._dfsCollect(startNodes, longestPathFirst, reverse, dependenciesOnly, onDiscover=True,
+                                filterTypes=filterTypes)
 
     def dfsToProcess(self, startNodes=None):
         """
@@ -1126,67 +1347,27 @@ class Graph(BaseObject):
         """
         if isinstance(node, CompatibilityNode):
             return False
-        return not self._computationBlocked[node]
+        return not self._topology.isBlocked(node)
 
     def updateNodesTopologicalData(self):
         """
-        Compute and cache nodes topological data:
-            - min and max depth
+        Update nodes topological data which are not maintained along with the topology:
             - computability
+            - graph computability status and compatibility nodes model
         """
-
-        self._nodesMinMaxDepths.clear()
-        self._computationBlocked.clear()
-
-        compatNodes = []
-        visitor = Visitor(reverse=False, dependenciesOnly=False)
-
-        def discoverVertex(vertex, graph):
-            # initialize depths
-            self._nodesMinMaxDepths[vertex] = (0, 0)
-            # initialize computability
-            self._computationBlocked[vertex] = False
-            if isinstance(vertex, CompatibilityNode):
-                compatNodes.append(vertex)
-                # a not computed CompatibilityNode blocks computation
-                if not vertex.hasStatus(Status.SUCCESS):
-                    self._computationBlocked[vertex] = True
-
-        def finishEdge(edge, graph):
-            currentVertex, inputVertex = edge
-
-            # update depths
-            currentDepths = self._nodesMinMaxDepths[currentVertex]
-            inputDepths = self._nodesMinMaxDepths[inputVertex]
-            if currentDepths[0] == 0:
-                # if not initialized, set the depth of the first child
-                depthMin = inputDepths[0] + 1
-            else:
-                depthMin = min(currentDepths[0], inputDepths[0] + 1)
-            self._nodesMinMaxDepths[currentVertex] = (depthMin, max(currentDepths[1], inputDepths[1] + 1))
-
-            # update computability
-            if currentVertex.hasStatus(Status.SUCCESS):
-                # output is already computed and available,
-                # does not depend on input connections computability
-                return
-            # propagate inputVertex computability
-            self._computationBlocked[currentVertex] |= self._computationBlocked[inputVertex]
-
-        leaves = self.getLeafNodes(visitor.dependenciesOnly)
-        visitor.finishEdge = finishEdge
-        visitor.discoverVertex = discoverVertex
-        self.dfs(visitor=visitor, startNodes=leaves)
+        self._topology.updateComputability()
+        compatNodes = self._topology.compatibilityNodes
 
         # update graph computability status
-        canComputeLeaves = all([self.canComputeTopologically(node) for node in leaves])
+        canComputeLeaves = not compatNodes or all(
+            [self.canComputeTopologically(node) for node in self._topology.leafNodes()])
         if self._canComputeLeaves != canComputeLeaves:
             self._canComputeLeaves = canComputeLeaves
             self.canComputeLeavesChanged.emit()
 
         # update compatibilityNodes model
         if len(self._compatibilityNodes) != len(compatNodes):
-            self._compatibilityNodes.reset(compatNodes)
+            self._compatibilityNodes.reset([node for node in self._nodes if node in compatNodes])
 
     compatibilityNodes = Property(BaseObject, lambda self: self._compatibilityNodes, constant=True)
 
@@ -1236,6 +1417,11 @@ class Graph(BaseObject):
     def getEdges(self, dependenciesOnly=False):
         if not dependenciesOnly:
             return self.edges
+        return list(self._getEdgesView(dependenciesOnly).edges)
+
+    def _buildEdges(self, dependenciesOnly):
+        if not dependenciesOnly:
+            return list(self.edges)
 
         outEdges = []
         for e in self.edges:
@@ -1252,7 +1438,7 @@ class Graph(BaseObject):
     def getInputNodes(self, node, recursive, dependenciesOnly):
         """ Return either the first level input nodes of a node or the whole chain. """
         if not recursive:
-            return {edge.src.node for edge in self.getEdges(dependenciesOnly) if edge.dst.node is node}
+            return set(self._getEdgesView(dependenciesOnly).inputNodes.get(node, ()))
 
         inputNodes, edges = self.dfsOnDiscover(startNodes=[node], filterTypes=None, reverse=False)
         return inputNodes[1:]  # exclude current node
@@ -1260,7 +1446,7 @@ class Graph(BaseObject):
     def getOutputNodes(self, node, recursive, dependenciesOnly):
         """ Return either the first level output nodes of a node or the whole chain. """
         if not recursive:
-            return {edge.dst.node for edge in self.getEdges(dependenciesOnly) if edge.src.node is node}
+            return set(self._getEdgesView(dependenciesOnly).outputNodes.get(node, ()))
 
         outputNodes, edges = self.dfsOnDiscover(startNodes=[node], filterTypes=None, reverse=True)
         return outputNodes[1:]  # exclude current node
@@ -1363,6 +1549,8 @@ class Graph(BaseObject):
         path = filepath or self._filepath
         if not path:
             path = generateTempProjectFilepath()
+        if self._partial and path == self._filepath:
+            raise RuntimeError(f"Cannot save a partially loaded graph in place: '{path}'.")
 
         data = self.serialize(template)
 
@@ -1421,37 +1609,62 @@ class Graph(BaseObject):
         self.filepathChanged.emit()
 
     def updateInternals(self, startNodes=None, force=False):
-        nodes, edges = self.dfsOnFinish(startNodes=startNodes)
+        if startNodes is None and not force:
+            # Only dirty nodes need to be updated, in topological order
+            nodes = self._topology.sortedNodes(self._dirtyNodes)
+        else:
+            nodes, edges = self.dfsOnFinish(startNodes=startNodes)
         for node in nodes:
             if node.dirty or force:
                 node.updateInternals()
 
     def updateStatusFromCache(self, force=False):
-        for node in self._nodes:
-            if node.dirty or force:
-                node.updateStatusFromCache()
+        nodes = [node for node in (self._nodes if force else self._dirtyNodes) if node.dirty or force]
+        # Load the status files of all the nodes at once
+        updateChunksStatusFromCache([chunk for node in nodes for chunk in node._chunks])
+        for node in nodes:
+            node.updateOutputAttr()
 
     def updateStatisticsFromCache(self):
         for node in self._nodes:
             node.updateStatisticsFromCache()
 
-    def updateNodesPerUid(self):
-        """ Update the duplicate nodes (sharing same UID) list of each node. """
-        # First step is to construct a map UID/nodes
-        nodesPerUid = {}
-        for node in self.nodes:
-            uid = node._uid
+    def _unregisterNodeUid(self, node):
+        if node not in self._nodeUids:
+            return
+        uid = self._nodeUids.pop(node)
+        nodes = self._nodesPerUid[uid]
+        nodes.remove(node)
+        if not nodes:
+            del self._nodesPerUid[uid]
+        self._dirtyUids.add(uid)
 
-            # We try to add the node to the list corresponding to this UID
-            try:
-                nodesPerUid.get(uid).append(node)
-            # If it fails because the uid is not in the map, we add it
-            except AttributeError:
-                nodesPerUid.update({uid: [node]})
+    def _updateNodesPerUid(self, nodes):
+        """
+        Update the UID groups with the current UID of the given nodes,
+        and the duplicate nodes list of the nodes of the modified groups only.
+        """
+        for node in nodes:
+            if self._nodes.get(node.name) is not node:
+                continue  # node removed from the graph
+            if node in self._nodeUids and self._nodeUids[node] == node._uid:
+                continue
+            self._unregisterNodeUid(node)
+            self._nodeUids[node] = node._uid
+            self._nodesPerUid.setdefault(node._uid, []).append(node)
+            self._dirtyUids.add(node._uid)
 
-        # Now, update each individual node
-        for node in self.nodes:
-            node.updateDuplicates(nodesPerUid)
+        dirtyUids, self._dirtyUids = self._dirtyUids, set()
+        for uid in dirtyUids:
+            for node in self._nodesPerUid.get(uid, []):
+                node.updateDuplicates(self._nodesPerUid)
+
+    def updateNodesPerUid(self):
+        """ Update the duplicate nodes (sharing same UID) list of each node. """
+        self._nodesPerUid.clear()
+        self._nodeUids.clear()
+        self._dirtyUids.clear()
+        self._updateNodesPerUid(self._nodes)
 
     def update(self):
         if not self._updateEnabled:
@@ -1462,10 +1675,11 @@ class Graph(BaseObject):
         self.updateInternals()
         if os.path.exists(self._cacheDir):
             self.updateStatusFromCache()
-        for node in self.nodes:
+        dirtyNodes, self._dirtyNodes = self._dirtyNodes, set()
+        for node in dirtyNodes:
             node.dirty = False
 
-        self.updateNodesPerUid()
+        self._updateNodesPerUid(dirtyNodes)
 
         # Graph topology has changed
         if self.dirtyTopology:
@@ -1487,9 +1701,11 @@ class Graph(BaseObject):
         See Also:
             Graph.update, Graph.updateInternals, Graph.updateStatusFromCache
         """
-        nodes, edges = self.dfsOnDiscover(startNodes=[fromNode], reverse=True)
+        # Nodes following a dirty node are already dirty: stop the visit on those
+        nodes = self._topology.downstreamNodes([fromNode], stop=lambda node: node.dirty)
         for node in nodes:
             node.dirty = True
+        self._dirtyNodes.update(nodes)
 
     def stopExecution(self):
         """ Request graph execution to be stopped by terminating running chunks"""
@@ -1601,13 +1817,14 @@ class Graph(BaseObject):
     canComputeLeaves = Property(bool, lambda self: self._canComputeLeaves, notify=canComputeLeavesChanged)
 
 
-def loadGraph(filepath, strictCompatibility: bool = False) -> Graph:
+def loadGraph(filepath, strictCompatibility: bool = False, upstreamOf: Optional[Iterable[str]] = None) -> Graph:
     """
     Load a Graph from a Meshroom Graph (.mg) file.
 
     Args:
         filepath: The path to the Meshroom Graph file.
         strictCompatibility: If True, raise a GraphCompatibilityError if the loaded Graph has node compatibility issues.
+        upstreamOf: (optional) Only load the nodes matching these node expressions and the nodes they depend on.
 
     Returns:
         Graph: The loaded Graph instance.
@@ -1616,7 +1833,7 @@ def loadGraph(filepath, strictCompatibility: bool = False) -> Graph:
         GraphCompatibilityError: If the Graph has node compatibility issues and `strictCompatibility` is True.
     """
     graph = Graph("")
-    graph.load(filepath)
+    graph.load(filepath, upstreamOf=upstreamOf)
 
     compatibilityIssues = len(graph.compatibilityNodes) > 0
     if compatibilityIssues and strictCompatibility:
@@ -1635,8 +1852,16 @@ def getAlreadySubmittedChunks(nodes):
     return out
 
 
-def executeGraph(graph, toNodes=None, forceCompute=False, forceStatus=False):
+def executeGraph(graph, toNodes=None, forceCompute=False, forceStatus=False, jobs=None):
     """
+    Compute the nodes of `graph` in the current process, from root nodes to leaves - or nodes in 'toNodes' if specified.
+
+    Args:
+        graph: the graph to compute.
+        toNodes: specific leaves, all graph leaves if None.
+        forceCompute: force the computation despite nodes status.
+        forceStatus: force the computation even if some nodes are submitted externally.
+        jobs: maximum number of chunks computed at the same time, MESHROOM_LOCAL_MAX_JOBS if None.
     """
     if forceCompute:
         nodes, edges = graph.dfsOnFinish(startNodes=toNodes)
@@ -1663,28 +1888,30 @@ def executeGraph(graph, toNodes=None, forceCompute=False, forceStatus=False):
     for node in nodes:
         node.beginSequence(forceCompute)
 
-    for n, node in enumerate(nodes):
-        try:
-            node.preprocess()
-            multiChunks = len(node.chunks) > 1
-            for c, chunk in enumerate(node.chunks):
-                if multiChunks:
-                    print('\n[{node}/{nbNodes}]({chunk}/{nbChunks}) {nodeName}'.format(
-                        node=n+1, nbNodes=len(nodes),
-                        chunk=c+1, nbChunks=len(node.chunks), nodeName=node.nodeType))
-                else:
-                    print(f'\n[{n + 1}/{len(nodes)}] {node.nodeType}')
-                chunk.process(forceCompute)
-            node.postprocess()
-        except Exception as e:
-            logging.error(f"Error on node computation: {e}")
-            graph.clearSubmittedNodes()
-            raise
+    scheduler = _ExecutionScheduler(graph, nodes, ResourceBudget.fromEnv(jobs), forceCompute=forceCompute)
+    try:
+        scheduler.run()
+    except Exception as e:
+        logging.error(f"Error on node computation: {e}")
+        graph.clearSubmittedNodes()
+        raise
 
     for node in nodes:
         node.endSequence()
 
 
+class _ExecutionScheduler(ChunkScheduler):
+    """ ChunkScheduler printing the progress of executeGraph. """
+    def onChunkStarted(self, node, chunk):
+        n = self.nodes.index(node)
+        if len(node.chunks) > 1:
+            print('\n[{node}/{nbNodes}]({chunk}/{nbChunks}) {nodeName}'.format(
+                node=n+1, nbNodes=len(self.nodes),
+                chunk=chunk.index+1, nbChunks=len(node.chunks), nodeName=node.nodeType))
+        else:
+            print(f'\n[{n + 1}/{len(self.nodes)}] {node.nodeType}')
+
+
 def submitGraph(graph, submitter, toNodes=None, submitLabel="{projectName}"):
     nodesToProcess, edgesToProcess = graph.dfsToProcess(startNodes=toNodes)
     flowEdges = graph.flowEdges(startNodes=toNodes)
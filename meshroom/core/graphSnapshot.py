@@ -0,0 +1,107 @@
+"""
+Snapshots of the normalized content of Meshroom Graph files.
+
+When enabled (see MESHROOM_GRAPH_SNAPSHOT), loading a graph file stores its content, once parsed and normalized
+to the current file version, in a sidecar file next to it, serialized with `marshal`.
+Next loads of the same file read this snapshot instead of parsing and normalizing the JSON content again,
+which matters when the same file is loaded many times, e.g. once per chunk on a render farm.
+
+A snapshot is only used if it has been created from a file with the same modification time and size,
+by the same version of Meshroom and Python, with the same versions of the node types used in the file.
+Snapshots are written in a temporary file renamed into place, and failing to read or write them only results
+in loading the graph file itself.
+
+Only the parsing and normalization of the file are skipped: nodes are still created and validated
+against their descriptions on each load.
+"""
+
+import logging
+import marshal
+import os
+import sys
+import uuid
+from typing import Optional
+
+import meshroom
+from meshroom.core.graphIO import GraphIO
+from meshroom.env import EnvVar
+
+# Version of the snapshot content, to increase when the normalization of the graph content changes
+SNAPSHOT_VERSION = 2
+
+
+def snapshotFilepath(filepath: str) -> str:
+    """ Return the path to the snapshot of the graph file `filepath`. """
+    dirname, basename = os.path.split(filepath)
+    return os.path.join(dirname, f".{basename}.snapshot")
+
+
+def _snapshotKey(fileStat: os.stat_result) -> tuple:
+    return (SNAPSHOT_VERSION, meshroom.__version__, sys.version_info[:2], fileStat.st_mtime_ns, fileStat.st_size)
+
+
+def _nodeTypesVersions(graphData: dict) -> dict[str, tuple]:
+    """ Return the version and the modification time of the description of each node type used in `graphData`. """
+    nodeTypes = {nodeData.get("nodeType") for nodeData in graphData.get(GraphIO.Keys.Graph, {}).values()}
+    versions = {}
+    for nodeType in sorted(nodeTypes, key=str):
+        nodePlugin = meshroom.core.pluginManager.getRegisteredNodePlugin(nodeType)
+        if nodePlugin is None:
+            versions[nodeType] = None
+        else:
+            versions[nodeType] = (meshroom.core.nodeVersion(nodePlugin.nodeDescriptor), nodePlugin.timestamp)
+    return versions
+
+
+def readGraphSnapshot(filepath: str, fileStat: os.stat_result) -> Optional[dict]:
+    """
+    Read the snapshot of a graph file.
+
+    Args:
+        filepath: the path to the graph file.
+        fileStat: the stat of the graph file.
+
+    Returns:
+        The normalized graph data, or None if there is no up-to-date snapshot of the file.
+    """
+    try:
+        with open(snapshotFilepath(filepath), "rb") as f:
+            key, versions, graphData = marshal.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        logging.debug(f"Invalid graph snapshot for '{filepath}': {e}")
+        return None
+    # Node types upgraded since the snapshot was written may need the file to be normalized again
+    if key != _snapshotKey(fileStat) or versions != _nodeTypesVersions(graphData):
+        return None
+    return graphData
+
+
+def writeGraphSnapshot(filepath: str, fileStat: os.stat_result, graphData: dict):
+    """
+    Write the snapshot of a graph file.
+
+    Args:
+        filepath: the path to the graph file.
+        fileStat: the stat of the graph file the data has been read from.
+        graphData: the normalized graph data.
+    """
+    snapshotFile = snapshotFilepath(filepath)
+    # Unique name, as the same file may be loaded concurrently by the same process
+    writingFile = f"{snapshotFile}.{uuid.uuid4().hex}.writing"
+    try:
+        with open(writingFile, "wb") as f:
+            marshal.dump((_snapshotKey(fileStat), _nodeTypesVersions(graphData), graphData), f)
+        os.replace(writingFile, snapshotFile)
+    except (OSError, ValueError) as e:
+        # Read-only project folder, or unexpected data type
+        logging.debug(f"Failed to write graph snapshot for '{filepath}': {e}")
+        try:
+            os.remove(writingFile)
+        except OSError:
+            pass
+
+
+def isGraphSnapshotEnabled() -> bool:
+    return EnvVar.get(EnvVar.MESHROOM_GRAPH_SNAPSHOT)
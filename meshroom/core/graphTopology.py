@@ -0,0 +1,169 @@
+"""
+Incremental maintenance of the topological data of a Graph.
+"""
+
+import logging
+from collections import Counter, deque
+from collections.abc import Iterable
+
+from meshroom.core.node import BaseNode, CompatibilityNode, Status
+
+
+class GraphTopology:
+    """
+    Node-level adjacency of a Graph, maintained along with the nodes topological data:
+        - min and max depth of each node
+        - computability: nodes having a non-computed CompatibilityNode in their dependency chain are blocked
+
+    Adjacency and depths are updated on each topology change (add/remove nodes or edges) by only visiting
+    the nodes whose depths are affected, instead of traversing the whole graph.
+    As it depends on the nodes status, computability is evaluated on request (see updateComputability),
+    by only visiting the nodes depending on CompatibilityNodes.
+    """
+
+    def __init__(self):
+        # Number of edges between two nodes, per node
+        self._inputs: dict[BaseNode, Counter] = {}
+        self._outputs: dict[BaseNode, Counter] = {}
+        # Min and max depths per node
+        self._depths: dict[BaseNode, tuple[int, int]] = {}
+        self._compatibilityNodes: set[CompatibilityNode] = set()
+        self._blockedNodes: set[BaseNode] = set()
+
+    def clear(self):
+        self._inputs.clear()
+        self._outputs.clear()
+        self._depths.clear()
+        self._compatibilityNodes.clear()
+        self._blockedNodes.clear()
+
+    @property
+    def compatibilityNodes(self) -> set[CompatibilityNode]:
+        return self._compatibilityNodes
+
+    def addNode(self, node: BaseNode):
+        self._inputs[node] = Counter()
+        self._outputs[node] = Counter()
+        self._depths[node] = (0, 0)
+        if isinstance(node, CompatibilityNode):
+            self._compatibilityNodes.add(node)
+
+    def removeNode(self, node: BaseNode):
+        for inputNode in list(self._inputs[node]):
+            del self._outputs[inputNode][node]
+        outputNodes = list(self._outputs[node])
+        for outputNode in outputNodes:
+            del self._inputs[outputNode][node]
+        del self._inputs[node]
+        del self._outputs[node]
+        del self._depths[node]
+        self._compatibilityNodes.discard(node)
+        self._blockedNodes.discard(node)
+        self._propagateDepths(outputNodes)
+
+    def addEdge(self, srcNode: BaseNode, dstNode: BaseNode):
+        """ Register an edge between an attribute of `srcNode` and an attribute of `dstNode`. """
+        if srcNode is dstNode:
+            return
+        self._inputs[dstNode][srcNode] += 1
+        self._outputs[srcNode][dstNode] += 1
+        if self._inputs[dstNode][srcNode] == 1:
+            self._propagateDepths([dstNode])
+
+    def removeEdge(self, srcNode: BaseNode, dstNode: BaseNode):
+        """ Unregister an edge between an attribute of `srcNode` and an attribute of `dstNode`. """
+        if srcNode is dstNode:
+            return
+        self._inputs[dstNode][srcNode] -= 1
+        self._outputs[srcNode][dstNode] -= 1
+        if self._inputs[dstNode][srcNode] == 0:
+            del self._inputs[dstNode][srcNode]
+            del self._outputs[srcNode][dstNode]
+            self._propagateDepths([dstNode])
+
+    def inputNodes(self, node: BaseNode) -> Iterable[BaseNode]:
+        """ Return the nodes connected to the inputs of `node`. """
+        return self._inputs[node].keys()
+
+    def outputNodes(self, node: BaseNode) -> Iterable[BaseNode]:
+        """ Return the nodes connected to the outputs of `node`. """
+        return self._outputs[node].keys()
+
+    def leafNodes(self) -> set[BaseNode]:
+        return {node for node, outputs in self._outputs.items() if not outputs}
+
+    def rootNodes(self) -> set[BaseNode]:
+        return {node for node, inputs in self._inputs.items() if not inputs}
+
+    def depths(self, node: BaseNode) -> tuple[int, int]:
+        """ Return the min and max depths of `node`. """
+        return self._depths[node]
+
+    def sortedNodes(self, nodes: Iterable[BaseNode]) -> list[BaseNode]:
+        """
+        Return `nodes` sorted in topological order: as a node's max depth is greater than
+        the max depth of all its inputs, sorting by max depth gives a valid order.
+        """
+        return sorted(nodes, key=lambda node: self._depths[node][1])
+
+    def downstreamNodes(self, nodes: Iterable[BaseNode], stop=None) -> list[BaseNode]:
+        """
+        Return `nodes` and all the nodes depending on them, in breadth-first order.
+
+        Args:
+            nodes: the nodes to start from.
+            stop: (optional) predicate on a node to stop the visit of its outputs.
+        """
+        visited = set()
+        result = []
+        queue = deque(nodes)
+        while queue:
+            node = queue.popleft()
+            if node in visited:
+                continue
+            visited.add(node)
+            result.append(node)
+            if stop and stop(node):
+                continue
+            queue.extend(self._outputs[node])
+        return result
+
+    def isBlocked(self, node: BaseNode) -> bool:
+        """ Whether the computation of `node` is blocked by a CompatibilityNode (see updateComputability). """
+        return node in self._blockedNodes
+
+    def updateComputability(self):
+        """
+        Update the nodes blocked by a non-computed CompatibilityNode in their dependency chain.
+        A node whose outputs are already computed does not depend on its inputs computability.
+        """
+        self._blockedNodes.clear()
+        queue = deque(node for node in self._compatibilityNodes if not node.hasStatus(Status.SUCCESS))
+        while queue:
+            node = queue.popleft()
+            if node in self._blockedNodes:
+                continue
+            self._blockedNodes.add(node)
+            queue.extend(n for n in self._outputs[node] if not n.hasStatus(Status.SUCCESS))
+
+    def _propagateDepths(self, nodes: Iterable[BaseNode]):
+        """ Update the depths of `nodes` from their inputs, and propagate the changes to their outputs. """
+        updates = Counter()
+        maxUpdates = len(self._depths)
+        queue = deque(nodes)
+        while queue:
+            node = queue.popleft()
+            inputs = self._inputs[node]
+            if inputs:
+                inputDepths = [self._depths[n] for n in inputs]
+                depths = (min(d[0] for d in inputDepths) + 1, max(d[1] for d in inputDepths) + 1)
+            else:
+                depths = (0, 0)
+            if depths == self._depths[node]:
+                continue
+            updates[node] += 1
+            if updates[node] > maxUpdates:
+                logging.warning(f"Cycle detected in graph topology on node '{node.name}'.")
+                return
+            self._depths[node] = depths
+            queue.extend(self._outputs[node])
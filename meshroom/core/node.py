@@ -8,10 +8,12 @@ import os
 import platform
 import re
 import shutil
+import struct
+import threading
 import time
 import types
 import uuid
-from collections import namedtuple
+from collections import ChainMap, namedtuple
 from enum import Enum, auto
 from typing import Callable, Optional
 
@@ -21,6 +23,10 @@ from meshroom.common import Signal, Variant, Property, BaseObject, Slot, ListMod
 from meshroom.core import desc, plugins, stats, hashValue, nodeVersion, Version, MrNodeType
 from meshroom.core.attribute import attributeFactory, ListAttribute, GroupAttribute, Attribute
 from meshroom.core.exception import NodeUpgradeError, UnknownNodeTypeError
+from meshroom.core.runtimeHistory import getRuntimeHistory
+from meshroom.core.sharedCache import detachFromSharedCache, getSharedCache, relocatePaths
+from meshroom.core.statusIndex import getStatusIndex
+from meshroom.core.statusLoader import StatusFileContent, fileSignature, readStatusFile, updateChunksStatusFromCache
 
 
 def getWritingFilepath(filepath: str) -> str:
@@ -169,6 +175,16 @@ class StatusData(BaseObject):
         self.status = Status.SUBMITTED
         self.execMode = ExecMode.LOCAL
 
+    def initImport(self, node):
+        """
+        When importing a status computed by another project (see sharedCache), replace the information
+        of the source node and session by the ones of the importing node, keeping the computation information.
+        """
+        self.setNode(node)
+        self.graph = node.graph.filepath
+        self.sessionUid = meshroom.core.sessionUid
+        self.submitterSessionUid = None
+
     def initEndCompute(self):
         self.sessionUid = meshroom.core.sessionUid
         self.endDateTime = datetime.datetime.now().strftime(self.dateTimeFormatting)
@@ -222,7 +238,8 @@ class LogManager:
 
     def __init__(self, chunk):
         self.chunk = chunk
-        self.logger = logging.getLogger(chunk.node.getName())
+        # One logger per chunk: chunks of the same node may be computed concurrently
+        self.logger = logging.getLogger(chunk.name)
 
     class Formatter(logging.Formatter):
         def format(self, record):
@@ -329,6 +346,7 @@ class NodeChunk(BaseObject):
                                               node.packageVersion, node.getMrNodeType())
         self.statistics: stats.Statistics = stats.Statistics()
         self.statusFileLastModTime = -1
+        self._statusFileContent: Optional[StatusFileContent] = None
         self.subprocess = None
         # Notify update in filepaths when node's internal folder changes
         self.node.internalFolderChanged.connect(self.nodeFolderChanged)
@@ -359,26 +377,41 @@ class NodeChunk(BaseObject):
     def updateStatusFromCache(self):
         """
         Update node status based on status file content/existence.
+        See statusLoader.updateChunksStatusFromCache to update multiple chunks at once.
         """
         statusFile = self.statusFile
+        content, error = readStatusFile(statusFile, self._statusFileContent)
+        if error is not None:
+            logging.debug(f"updateStatusFromCache({self.node.name}): Error while loading status file {statusFile}: {error}")
+        self.setStatusFileContent(content)
+
+    @property
+    def statusFileContent(self) -> Optional[StatusFileContent]:
+        """ The content of the status file this chunk status has been last updated from. """
+        return self._statusFileContent
+
+    def setStatusFileContent(self, content: Optional[StatusFileContent]):
+        """
+        Update node status from the content of its status file.
+
+        Args:
+            content: the content read from the status file, None if the file does not exist or is invalid.
+        """
         oldStatus = self._status.status
-        # No status file => reset status to Status.None
-        if not os.path.exists(statusFile):
+        try:
+            if content is not None:
+                self._status.fromDict(content.data)
+                self.statusFileLastModTime = content.modTime
+                self._statusFileContent = content
+        except Exception as e:
+            logging.debug(f"updateStatusFromCache({self.node.name}): Invalid status file content {self.statusFile}: {e}")
+            content = None
+        # No valid status file => reset status to Status.None
+        if content is None:
             self.statusFileLastModTime = -1
+            self._statusFileContent = None
             self._status.reset()
             self._status.setNodeType(self.node)
-        else:
-            try:
-                with open(statusFile) as jsonFile:
-                    statusData = json.load(jsonFile)
-                # logging.debug(f"updateStatusFromCache({self.node.name}): From status {self.status.status} to {statusData['status']}")
-                self._status.fromDict(statusData)
-                self.statusFileLastModTime = os.path.getmtime(statusFile)
-            except Exception as e:
-                logging.debug(f"updateStatusFromCache({self.node.name}): Error while loading status file {statusFile}: {e}")
-                self.statusFileLastModTime = -1
-                self._status.reset()
-                self._status.setNodeType(self.node)
 
         if oldStatus != self.status.status:
             self.statusChanged.emit()
@@ -407,6 +440,14 @@ class NodeChunk(BaseObject):
             return os.path.join(self.node.graph.cacheDir, self.node.internalFolder,
                                 str(self.index) + ".log")
 
+    @property
+    def argumentsFile(self):
+        if self.range.blockSize == 0:
+            return os.path.join(self.node.graph.cacheDir, self.node.internalFolder, "arguments")
+        else:
+            return os.path.join(self.node.graph.cacheDir, self.node.internalFolder,
+                                str(self.index) + ".arguments")
+
     def saveStatusFile(self):
         """
         Write node status on disk.
@@ -417,10 +458,18 @@ class NodeChunk(BaseObject):
         os.makedirs(folder, exist_ok=True)
 
         statusFilepathWriting = getWritingFilepath(statusFilepath)
+        content = json.dumps(data, indent=4)
         with open(statusFilepathWriting, 'w') as jsonFile:
-            json.dump(data, jsonFile, indent=4)
+            jsonFile.write(content)
         renameWritingToFinalPath(statusFilepathWriting, statusFilepath)
 
+        statusIndex = getStatusIndex(self.node.graph.cacheDir)
+        if statusIndex is not None:
+            # Record the content as it is read from the status file
+            fileStat = os.stat(statusFilepath)
+            statusIndex.update({statusFilepath: StatusFileContent(fileSignature(fileStat), fileStat.st_mtime,
+                                                                  json.loads(content))})
+
     def upgradeStatusFile(self):
         """
         Upgrade node status file based on the current status.
@@ -444,21 +493,31 @@ class NodeChunk(BaseObject):
         statisticsFile = self.statisticsFile
         if not os.path.exists(statisticsFile):
             return
-        with open(statisticsFile) as jsonFile:
-            statisticsData = json.load(jsonFile)
-        self.statistics.fromDict(statisticsData)
+        try:
+            self.statistics.load(statisticsFile)
+        except (OSError, ValueError, KeyError, IndexError, struct.error) as e:
+            # The header of the file may be rewritten while the chunk is computed
+            logging.debug(f"Failed to read statistics file '{statisticsFile}': {e}")
+            return
         if oldTimes != self.statistics.times:
             self.statisticsChanged.emit()
 
     def saveStatistics(self):
-        data = self.statistics.toDict()
         statisticsFilepath = self.statisticsFile
         folder = os.path.dirname(statisticsFilepath)
         os.makedirs(folder, exist_ok=True)
-        statisticsFilepathWriting = getWritingFilepath(statisticsFilepath)
-        with open(statisticsFilepathWriting, 'w') as jsonFile:
-            json.dump(data, jsonFile, indent=4)
-        renameWritingToFinalPath(statisticsFilepathWriting, statisticsFilepath)
+        self.statistics.save(statisticsFilepath)
+
+    @Slot(result=Variant)
+    def readStatisticsFile(self):
+        """ Return the content of the statistics file, without modifying the current statistics. """
+        statistics = stats.Statistics()
+        try:
+            statistics.load(self.statisticsFile)
+        except Exception as e:
+            logging.debug(f"Failed to read statistics file {self.statisticsFile}: {e}")
+            return {}
+        return statistics.toDict()
 
     def isAlreadySubmitted(self):
         return self._status.status in (Status.SUBMITTED, Status.RUNNING)
@@ -482,6 +541,9 @@ class NodeChunk(BaseObject):
         if not forceCompute and self._status.status == Status.SUCCESS:
             logging.info(f"Node chunk already computed: {self.name}")
             return
+        if not forceCompute and self.node.importFromSharedCache():
+            logging.info(f"Node chunk imported from the shared cache: {self.name}")
+            return
 
         # Start the process environment for nodes running in isolation.
         # This only happens once, when the node has the SUBMITTED status.
@@ -491,6 +553,7 @@ class NodeChunk(BaseObject):
             self._processInIsolatedEnvironment()
             return
 
+        detachFromSharedCache(self.node.internalFolder)
         runningProcesses[self.name] = self
         self._status.setNode(self.node)
         self._status.initStartCompute()
@@ -522,6 +585,14 @@ class NodeChunk(BaseObject):
             # Ask and wait for the stats thread to stop
             self.statThread.stopRequest()
             self.statThread.join()
+            if executionStatus == Status.SUCCESS:
+                history = getRuntimeHistory()
+                if history:
+                    history.recordChunk(self)
+                try:
+                    self.node.publishToSharedCache()
+                except Exception as e:
+                    logging.warning(f"Failed to publish {self.node.name} in the shared cache: {e}")
             self.statistics = stats.Statistics()
             del runningProcesses[self.name]
 
@@ -616,6 +687,119 @@ Position = namedtuple("Position", ["x", "y"])
 Position.__new__.__defaults__ = (0,) * len(Position._fields)
 
 
+class CommandVariables(dict):
+    """
+    Variables of a node used to format its command line, its internal folder and its output expressions
+    (with 'str.format_map').
+
+    The variables of the attributes ('name' for '--name value', 'nameValue' and the concatenated arguments
+    of each command line group) are only evaluated when they are used, and memoized until the next update
+    of the node.
+    """
+
+    def __init__(self, node: "BaseNode", variables: dict):
+        super().__init__(variables)
+        self._node = node
+        # (name, attribute, group) of the attributes exposed as variables, in the order of the command line
+        self._entries: Optional[list[tuple]] = None
+        self._attributes: dict[str, Attribute] = {}
+        self._groups: set[str] = set()
+        # Names of the output attributes whose value is being evaluated
+        self._pendingOutputs: set[str] = set()
+        # Attributes and groups being evaluated, whose values may refer to themselves.
+        # Evaluations hold the lock, so that chunks of the node computed concurrently wait for them.
+        self._evaluating: set[str] = set()
+        self._lock = threading.RLock()
+
+    def _buildEntries(self):
+        entries = []
+
+        def addInput(name, attr):
+            if not attr.enabled:
+                return
+            group = attr.attributeDesc.group(attr.node) \
+                if isinstance(attr.attributeDesc.group, types.FunctionType) else attr.attributeDesc.group
+            if group is not None:
+                # If there is a valid command line "group"
+                entries.append((name, attr, group))
+            elif isinstance(attr, GroupAttribute):
+                # If the GroupAttribute is not set in a single command line argument,
+                # the sub-attributes may need to be exposed individually
+                for v in attr._value:
+                    addInput(v.name, v)
+
+        attributes = self._node._attributes.objects.items()
+        for name, attr in attributes:
+            if attr.isInput:
+                addInput(name, attr)
+        entries.extend((name, attr, attr.attributeDesc.group) for name, attr in attributes if attr.isOutput)
+        self._entries = entries
+        self._attributes = {name: attr for name, attr, _ in entries}
+        self._groups = {group for _, _, group in entries}
+
+    def _setAttributeVariables(self, name: str, attr: Attribute) -> str:
+        """ Set the variables of an attribute, and return its value as a command line argument. """
+        self._evaluating.add(name)
+        try:
+            v = attr.getValueStr(withQuotes=True)
+            valueStr = attr.getValueStr(withQuotes=False)
+        finally:
+            self._evaluating.discard(name)
+        self[name] = f"--{name} {v}"
+        # xxValue is exposed without quotes to allow to compose expressions
+        self[name + "Value"] = valueStr
+        return v
+
+    def _buildGroups(self) -> dict[str, str]:
+        """ Concatenate the arguments of each command line group, skipping the outputs being evaluated. """
+        self._evaluating.update(self._groups)
+        try:
+            groups = {}
+            for name, attr, group in self._entries:
+                if name in self._pendingOutputs:
+                    continue
+                # List elements may give a fully empty string and will not be sent to the command line.
+                # String attributes will return only quotes if it is empty and thus will be send to the command line.
+                # But a List of string containing 1 element,
+                # and this element is an empty string will also return quotes and will be sent to the command line.
+                if self._setAttributeVariables(name, attr):
+                    groups[group] = groups.get(group, "") + " " + self[name]
+        finally:
+            self._evaluating.difference_update(self._groups)
+        return groups
+
+    def __missing__(self, key):
+        with self._lock:
+            if key in self:
+                # Evaluated by another thread in the meantime
+                return dict.__getitem__(self, key)
+            return self._evaluate(key)
+
+    def _evaluate(self, key):
+        if self._entries is None:
+            self._buildEntries()
+        name = key[:-len("Value")] if key not in self._attributes and key.endswith("Value") else key
+        if name in self._evaluating or key in self._evaluating or name in self._pendingOutputs:
+            # Not available yet: expressions referring to it are not resolved
+            raise KeyError(key)
+        if name in self._attributes:
+            self._setAttributeVariables(name, self._attributes[name])
+            return self[key]
+        if key in self._groups:
+            groups = self._buildGroups()
+            # Groups are only complete once all the outputs have been evaluated
+            if not self._pendingOutputs:
+                self.update(groups)
+            return groups[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
 class BaseNode(BaseObject):
     """
     Base Abstract class for Graph nodes.
@@ -642,9 +826,10 @@ class BaseNode(BaseObject):
         self.nodePlugin: plugins.Plugin = None
 
         # instantiate node description if nodeType is valid
-        if meshroom.core.pluginManager.getRegisteredNodePlugin(nodeType):
-            self.nodeDesc = meshroom.core.pluginManager.getRegisteredNodePlugin(nodeType).nodeDescriptor()
-            self.nodePlugin = meshroom.core.pluginManager.getRegisteredNodePlugin(nodeType)
+        nodePlugin = meshroom.core.pluginManager.getRegisteredNodePlugin(nodeType)
+        if nodePlugin is not None:
+            self.nodeDesc = nodePlugin.nodeDescriptor()
+            self.nodePlugin = nodePlugin
 
         self.packageName: str = ""
         self.packageVersion: str = ""
@@ -667,6 +852,8 @@ class BaseNode(BaseObject):
         self._locked: bool = False
         self._duplicates = ListModel(parent=self)  # list of nodes with the same uid
         self._hasDuplicates: bool = False
+        # Chunks of the node computed concurrently import its outputs from the shared cache once
+        self._sharedCacheLock = threading.Lock()
 
         self.globalStatusChanged.connect(self.updateDuplicatesStatusAndLocked)
 
@@ -767,7 +954,7 @@ class BaseNode(BaseObject):
                 if idx != '':
                     # get child Attribute in List
                     assert isinstance(att, ListAttribute)
-                    att = att.value.at(int(idx))
+                    att = att.at(int(idx))
         else:
             att = self._attributes.getr(name)
         return att
@@ -880,7 +1067,7 @@ class BaseNode(BaseObject):
             # In particular, when loading a project file, the UIDs are updated first,
             # and the node status and the dynamic output values are not yet loaded,
             # so we should not read the attribute value.
-            if not dynamicOutputAttr and attr.value == attr.uidIgnoreValue:
+            if not dynamicOutputAttr and attr.isUidIgnored():
                 continue  # For non-dynamic attributes, check if the value should be ignored
             uidAttributes.append((attr.getName(), attr.uid()))
         uidAttributes.sort()
@@ -893,56 +1080,26 @@ class BaseNode(BaseObject):
     def _buildCmdVars(self):
         """
         Generate command variables using input attributes and resolved output attributes
-        names and values.
-        """
-        def _buildAttributeCmdVars(cmdVars, name, attr):
-            if attr.enabled:
-                group = attr.attributeDesc.group(attr.node) \
-                        if isinstance(attr.attributeDesc.group, types.FunctionType) else attr.attributeDesc.group
-                if group is not None:
-                    # If there is a valid command line "group"
-                    v = attr.getValueStr(withQuotes=True)
-                    cmdVars[name] = f"--{name} {v}"
-                    # xxValue is exposed without quotes to allow to compose expressions
-                    cmdVars[name + "Value"] = attr.getValueStr(withQuotes=False)
-
-                    # List elements may give a fully empty string and will not be sent to the command line.
-                    # String attributes will return only quotes if it is empty and thus will be send to the command line.
-                    # But a List of string containing 1 element,
-                    # and this element is an empty string will also return quotes and will be sent to the command line.
-                    if v:
-                        cmdVars[group] = cmdVars.get(group, "") + " " + cmdVars[name]
-                elif isinstance(attr, GroupAttribute):
-                    assert isinstance(attr.value, DictModel)
-                    # If the GroupAttribute is not set in a single command line argument,
-                    # the sub-attributes may need to be exposed individually
-                    for v in attr._value:
-                        _buildAttributeCmdVars(cmdVars, v.name, v)
-
+        names and values. Variables of the attributes are evaluated on demand (see CommandVariables).
+        """
+        if not isinstance(self._cmdVars, CommandVariables):
+            self._cmdVars = CommandVariables(self, self._cmdVars)
         self._cmdVars["uid"] = self._uid
         self._cmdVars["nodeCacheFolder"] = self.internalFolder
         self._cmdVars["nodeSourceCodeFolder"] = self.sourceCodeFolder
 
-        # Evaluate input params
-        for name, attr in self._attributes.objects.items():
-            if attr.isOutput:
-                continue  # skip outputs
-            _buildAttributeCmdVars(self._cmdVars, name, attr)
-
         # For updating output attributes invalidation values
-        cmdVarsNoCache = self._cmdVars.copy()
-        cmdVarsNoCache["cache"] = ""
-
+        noCache = {"cache": ""}
         # Use "self._internalFolder" instead of "self.internalFolder" because we do not want it to
         # be resolved with the {cache} information ("self.internalFolder" resolves
         # "self._internalFolder")
-        cmdVarsNoCache["nodeCacheFolder"] = self._internalFolder.format(**cmdVarsNoCache)
+        noCache["nodeCacheFolder"] = self._internalFolder.format_map(ChainMap(noCache, self._cmdVars))
+        cmdVarsNoCache = ChainMap(noCache, self._cmdVars)
 
         # Evaluate output params
-        for name, attr in self._attributes.objects.items():
-            if attr.isInput:
-                continue  # skip inputs
-
+        outputs = [(name, attr) for name, attr in self._attributes.objects.items() if attr.isOutput]
+        self._cmdVars._pendingOutputs = {name for name, _ in outputs}
+        for name, attr in outputs:
             # Apply expressions for File attributes
             if attr.attributeDesc.isExpression:
                 defaultValue = ""
@@ -958,8 +1115,8 @@ class BaseNode(BaseObject):
                                         format(nodeName=self.name, attrName=attr.name))
                     if defaultValue is not None:
                         try:
-                            attr.value = defaultValue.format(**self._cmdVars)
-                            attr._invalidationValue = defaultValue.format(**cmdVarsNoCache)
+                            attr.value = defaultValue.format_map(self._cmdVars)
+                            attr._invalidationValue = defaultValue.format_map(cmdVarsNoCache)
                         except KeyError as e:
                             logging.warning('Invalid expression with missing key on "{nodeName}.{attrName}" with '
                                             'value "{defaultValue}".\nError: {err}'.
@@ -970,16 +1127,7 @@ class BaseNode(BaseObject):
                                             '"{defaultValue}".\nError: {err}'.
                                             format(nodeName=self.name, attrName=attr.name, defaultValue=defaultValue,
                                             err=str(e)))
-
-            v = attr.getValueStr(withQuotes=True)
-
-            self._cmdVars[name] = f'--{name} {v}'
-            # xxValue is exposed without quotes to allow to compose expressions
-            self._cmdVars[name + 'Value'] = attr.getValueStr(withQuotes=False)
-
-            if v:
-                self._cmdVars[attr.attributeDesc.group] = \
-                    self._cmdVars.get(attr.attributeDesc.group, '') + ' ' + self._cmdVars[name]
+            self._cmdVars._pendingOutputs.discard(name)
 
     @property
     def isParallelized(self):
@@ -1010,6 +1158,65 @@ class BaseNode(BaseObject):
         # any information about the node descriptor.
         return self.getMrNodeType() != MrNodeType.INPUT
 
+    def _chunksFiles(self) -> list[str]:
+        """ Return the paths of the status, statistics and log files of the chunks, relative to the internal folder. """
+        return [os.path.relpath(filepath, self.internalFolder) for chunk in self._chunks
+                for filepath in (chunk.statusFile, chunk.statisticsFile, chunk.logFile)]
+
+    def importFromSharedCache(self) -> bool:
+        """
+        Import the outputs of this node from the shared cache, if they have been published by another project.
+
+        Returns:
+            Whether all the chunks of this node are computed once imported.
+        """
+        sharedCache = getSharedCache()
+        if not sharedCache:
+            return False
+        with self._sharedCacheLock:
+            if all(chunk.status.status == Status.SUCCESS for chunk in self._chunks):
+                # Already imported for another chunk
+                return True
+            return self._importFromSharedCache(sharedCache)
+
+    def _importFromSharedCache(self, sharedCache) -> bool:
+        if not sharedCache.importEntry(self.nodeType, self._uid, self.internalFolder, self._chunksFiles()):
+            return False
+        entry = sharedCache.entry(self.nodeType, self._uid) or {}
+        sourceFolder = entry.get("internalFolder")
+        if sourceFolder and self.nodeDesc.hasDynamicOutputAttribute and os.path.exists(self.valuesFile):
+            # Dynamic output values may point into the internal folder of the source node
+            with open(self.valuesFile) as jsonFile:
+                data = json.load(jsonFile)
+            relocated = relocatePaths(data, sourceFolder, self.internalFolder)
+            if relocated != data:
+                valuesFilepathWriting = getWritingFilepath(self.valuesFile)
+                with open(valuesFilepathWriting, 'w') as jsonFile:
+                    json.dump(relocated, jsonFile, indent=4)
+                renameWritingToFinalPath(valuesFilepathWriting, self.valuesFile)
+        self.updateStatusFromCache()
+        if not all(chunk.status.status == Status.SUCCESS for chunk in self._chunks):
+            return False
+        # Status files are private copies: make them describe this node rather than the source one
+        for chunk in self._chunks:
+            chunk._status.initImport(self)
+            chunk.saveStatusFile()
+        return True
+
+    def publishToSharedCache(self):
+        """ Publish the outputs of this node in the shared cache, once all its chunks are computed. """
+        sharedCache = getSharedCache()
+        if not sharedCache:
+            return
+        # Other chunks may have been computed by other processes
+        for chunk in self._chunks:
+            content, _ = readStatusFile(chunk.statusFile)
+            if content is None or content.data.get("status") != Status.SUCCESS.name:
+                return
+        sharedCache.publish(self.internalFolder, self.nodeType, self._uid, self._chunksFiles(),
+                            metadata={"packageName": self.packageName, "packageVersion": self.packageVersion,
+                                      "internalFolder": self.internalFolder})
+
     def clearData(self):
         """ Delete this Node internal folder.
         Status will be reset to Status.NONE
@@ -1158,8 +1365,9 @@ class BaseNode(BaseObject):
             # And we do not want notifications during the graph processing.
             return
 
-        if attr.value is None:
+        if not isinstance(attr, ListAttribute) and attr.value is None:
             # Discard dynamic values depending on the graph processing.
+            # Lists are never None: their value is not evaluated, to not create the elements stored in columns.
             return
 
         if self.graph and self.graph.isLoading:
@@ -1216,12 +1424,12 @@ class BaseNode(BaseObject):
             folder = ''
 
         # Update command variables / output attributes
-        self._cmdVars = {
+        self._cmdVars = CommandVariables(self, {
             "cache": cacheDir or self.graph.cacheDir,
             "nodeType": self.nodeType,
             "nodeCacheFolder": self._internalFolder,
             "nodeSourceCodeFolder": self.sourceCodeFolder
-        }
+        })
         self._computeUid()
         self._buildCmdVars()
         if self.nodeDesc:
@@ -1235,7 +1443,7 @@ class BaseNode(BaseObject):
 
     @property
     def internalFolder(self):
-        return self._internalFolder.format(**self._cmdVars)
+        return self._internalFolder.format_map(self._cmdVars)
 
     @property
     def sourceCodeFolder(self):
@@ -1246,8 +1454,7 @@ class BaseNode(BaseObject):
         Update node status based on status file content/existence.
         """
         s = self.globalStatus
-        for chunk in self._chunks:
-            chunk.updateStatusFromCache()
+        updateChunksStatusFromCache(self._chunks)
         # logging.warning(f"updateStatusFromCache: {self.name}, status: {s} => {self.globalStatus}")
         self.updateOutputAttr()
 
@@ -55,8 +55,10 @@ class _NodeCreator:
         self.position = Position(*self.nodeData.get("position", []))
         self.uid = self.nodeData.get("uid", None)
         self.nodeDesc = None
-        if meshroom.core.pluginManager.isRegistered(self.nodeType):
-            self.nodeDesc = meshroom.core.pluginManager.getRegisteredNodePlugin(self.nodeType).nodeDescriptor
+        # The node description of a lazily loaded node plugin may fail to be imported: it is then unregistered
+        nodePlugin = meshroom.core.pluginManager.getRegisteredNodePlugin(self.nodeType)
+        if nodePlugin is not None:
+            self.nodeDesc = nodePlugin.nodeDescriptor
 
     def create(self) -> Union[Node, CompatibilityNode]:
         compatibilityIssue = self._checkCompatibilityIssues()
@@ -0,0 +1,123 @@
+"""
+Manifests of the node plugin packages, to import node modules only when they are used.
+
+When enabled (see MESHROOM_LAZY_NODES), loading a package of nodes records the node types it contains
+(name, module, version, category and validation errors) in a manifest, stored in the temporary folder.
+Next loads of the same package create LazyNodePlugins from the manifest instead of importing all its modules:
+a node module is only imported when a node of this type is created or deserialized.
+
+A manifest is only used if the Python files of the package have not been modified since it has been written.
+Manifests are not written for packages whose modules could not all be imported, as the failure may come from
+the environment rather than from the files (e.g. a missing dependency).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+import meshroom
+from meshroom.core.plugins import LazyNodePlugin, NodePlugin
+from meshroom.env import EnvVar
+
+MANIFEST_VERSION = 1
+
+
+def isLazyLoadingEnabled() -> bool:
+    return EnvVar.get(EnvVar.MESHROOM_LAZY_NODES)
+
+
+def manifestFilepath(packageFolder: str) -> str:
+    """ Return the path to the manifest of the package located in `packageFolder`. """
+    key = hashlib.sha1(packageFolder.encode("utf-8")).hexdigest()
+    return os.path.join(EnvVar.get(EnvVar.MESHROOM_TEMP_PATH), "meshroomNodesManifests", f"{key}.json")
+
+
+def packageFiles(packageFolder: str) -> dict[str, int]:
+    """ Return the modification time (in nanoseconds) of the Python files of a package, per relative path. """
+    files = {}
+    for root, dirs, filenames in os.walk(packageFolder):
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        for filename in filenames:
+            if filename.endswith(".py"):
+                filepath = os.path.join(root, filename)
+                files[os.path.relpath(filepath, packageFolder).replace(os.sep, "/")] = os.stat(filepath).st_mtime_ns
+    return files
+
+
+def readManifest(folder: str, packageName: str) -> Optional[list[LazyNodePlugin]]:
+    """
+    Create the node plugins of a package from its manifest.
+
+    Args:
+        folder: the folder containing the package.
+        packageName: the name of the package module.
+
+    Returns:
+        The list of LazyNodePlugins, or None if there is no up-to-date manifest for this package.
+    """
+    resolvedFolder = str(Path(folder).resolve())
+    packageFolder = os.path.join(resolvedFolder, packageName)
+    try:
+        with open(manifestFilepath(packageFolder)) as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("meshroomVersion") != meshroom.__version__:
+            return None
+        if manifest["files"] != packageFiles(packageFolder):
+            return None
+        return [LazyNodePlugin(entry, resolvedFolder, manifest["packageName"], manifest["packageVersion"],
+                               manifest["packagePath"])
+                for entry in manifest["nodes"]]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logging.debug(f"Invalid nodes manifest for package '{packageFolder}': {e}")
+        return None
+
+
+def writeManifest(folder: str, packageName: str, nodePlugins: list[NodePlugin], files: dict[str, int]):
+    """
+    Write the manifest of a package, from its loaded node plugins.
+
+    Args:
+        folder: the folder containing the package.
+        packageName: the name of the package module.
+        nodePlugins: the node plugins loaded from the package.
+        files: the Python files of the package, as returned by `packageFiles` before loading it.
+    """
+    packageFolder = os.path.join(str(Path(folder).resolve()), packageName)
+    nodes = []
+    for nodePlugin in nodePlugins:
+        nodeDesc = nodePlugin.nodeDescriptor
+        module = sys.modules.get(nodeDesc.__module__)
+        nodes.append({
+            "name": nodePlugin.name,
+            "module": nodeDesc.__module__,
+            "path": nodePlugin.path,
+            "version": getattr(module, "__version__", None),
+            "category": nodeDesc.category,
+            "errors": nodePlugin.errors,
+            "timestamp": nodePlugin.timestamp,
+        })
+    first = nodePlugins[0].nodeDescriptor if nodePlugins else None
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "meshroomVersion": meshroom.__version__,
+        "packageName": getattr(first, "packageName", packageName),
+        "packageVersion": getattr(first, "packageVersion", None),
+        "packagePath": getattr(first, "packagePath", packageFolder),
+        "files": files,
+        "nodes": nodes,
+    }
+    filepath = manifestFilepath(packageFolder)
+    writingFilepath = f"{filepath}.{os.getpid()}.writing"
+    try:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(writingFilepath, "w") as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(writingFilepath, filepath)
+    except OSError as e:
+        logging.debug(f"Failed to write nodes manifest for package '{packageFolder}': {e}")
@@ -305,7 +305,7 @@ class Plugin(BaseObject):
         Args:
             nodePlugin: the NodePlugin object to add to the Plugin.
         """
-        self._nodePlugins[nodePlugin.nodeDescriptor.__name__] = nodePlugin
+        self._nodePlugins[nodePlugin.name] = nodePlugin
         nodePlugin.plugin = self
 
     def removeNodePlugin(self, name: str):
@@ -411,8 +411,8 @@ class NodePlugin(BaseObject):
         super().__init__()
         self.plugin: Plugin = plugin
         self.path: str = Path(getfile(nodeDesc)).resolve().as_posix()
-        self.nodeDescriptor: desc.Node = nodeDesc
-        self.nodeDescriptor.plugin = self
+        self._nodeDescriptor: desc.Node = None
+        self.nodeDescriptor = nodeDesc
 
         self.status: NodePluginStatus = NodePluginStatus.NOT_LOADED
         self.errors: list[str] = validateNodeDesc(nodeDesc)
@@ -463,12 +463,45 @@ class NodePlugin(BaseObject):
             return False
 
         self.nodeDescriptor = descriptor
-        self.nodeDescriptor.plugin = self
         self._timestamp = timestamp
         self.status = NodePluginStatus.NOT_LOADED
         logging.info(f"[Reload] {self.nodeDescriptor.__name__}: Successful reloading.")
         return True
 
+    @property
+    def name(self) -> str:
+        """ Return the name of the node type. """
+        return self.nodeDescriptor.__name__
+
+    @property
+    def nodeDescriptor(self) -> desc.Node:
+        """ Return the description of the node. """
+        return self._nodeDescriptor
+
+    @nodeDescriptor.setter
+    def nodeDescriptor(self, nodeDesc: desc.Node):
+        self._nodeDescriptor = nodeDesc
+        nodeDesc.plugin = self
+
+    @property
+    def category(self) -> str:
+        """ Return the category of the node type. """
+        return self.nodeDescriptor.category
+
+    @property
+    def timestamp(self) -> float:
+        """ Return the last modification time of the node description's file when it has been loaded. """
+        return self._timestamp
+
+    def load(self) -> bool:
+        """
+        Make sure the node description is loaded.
+
+        Returns:
+            bool: True if the node description is available, False otherwise.
+        """
+        return self.nodeDescriptor is not None
+
     @property
     def plugin(self):
         """
@@ -517,6 +550,82 @@ class NodePlugin(BaseObject):
             return self.plugin.configFullEnv
         return {}
 
+class LazyNodePlugin(NodePlugin):
+    """
+    A NodePlugin created from the manifest of its package (see meshroom.core.pluginManifest),
+    whose node description is only imported when first accessed.
+
+    The validation errors of the node description are the ones recorded in the manifest.
+    If the module cannot be imported, the node plugin gets an ERROR status and its node description is None.
+    """
+
+    def __init__(self, entry: dict, folder: str, packageName: str, packageVersion: str, packagePath: str,
+                 plugin: Plugin = None):
+        """
+        Args:
+            entry: the manifest entry of the node type.
+            folder: the folder containing the package of the node type.
+            packageName: the name of the package, as set on its node descriptions.
+            packageVersion: the version of the package.
+            packagePath: the path to the package.
+            plugin: (optional) the Plugin object that contains this node plugin.
+        """
+        super(NodePlugin, self).__init__()
+        self.plugin: Plugin = plugin
+        self.path: str = entry["path"]
+        self._name: str = entry["name"]
+        self._moduleName: str = entry["module"]
+        self._category: str = entry["category"]
+        self._folder: str = folder
+        self._package: tuple[str, str, str] = (packageName, packageVersion, packagePath)
+        self._nodeDescriptor: desc.Node = None
+
+        self.status: NodePluginStatus = NodePluginStatus.NOT_LOADED
+        self.errors: list[str] = list(entry["errors"])
+        if self.errors:
+            self.status = NodePluginStatus.DESC_ERROR
+
+        self._processEnv = None
+        self._timestamp = entry["timestamp"]
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def category(self) -> str:
+        return self._category
+
+    @property
+    def isImported(self) -> bool:
+        """ Return whether the node description has been imported. """
+        return self._nodeDescriptor is not None
+
+    @property
+    def nodeDescriptor(self) -> desc.Node:
+        if self._nodeDescriptor is None and self.status != NodePluginStatus.ERROR:
+            self._importNodeDescriptor()
+        return self._nodeDescriptor
+
+    @nodeDescriptor.setter
+    def nodeDescriptor(self, nodeDesc: desc.Node):
+        NodePlugin.nodeDescriptor.fset(self, nodeDesc)
+
+    def _importNodeDescriptor(self):
+        from meshroom.core import add_to_path
+        try:
+            with add_to_path(self._folder):
+                module = importlib.import_module(self._moduleName)
+            nodeDesc = getattr(module, self._name)
+        except Exception as e:
+            logging.error(f"{self._name}: Failed to import the node description from '{self.path}': {e}")
+            self.errors.append(str(e))
+            self.status = NodePluginStatus.ERROR
+            return
+        nodeDesc.packageName, nodeDesc.packageVersion, nodeDesc.packagePath = self._package
+        self.nodeDescriptor = nodeDesc
+
+
 class NodePluginManager(BaseObject):
     """
     Manager for all the loaded Plugin objects as well as the registered NodePlugin objects.
@@ -630,9 +739,12 @@ class NodePluginManager(BaseObject):
         Returns:
             NodePlugin | None: the loaded NodePlugin object if it exists, None otherwise.
         """
-        if self.isRegistered(name):
-            return self._nodePlugins[name]
-        return None
+        nodePlugin = self._nodePlugins.get(name)
+        if nodePlugin is not None and not nodePlugin.load():
+            # The node description could not be imported
+            self.unregisterNode(nodePlugin)
+            return None
+        return nodePlugin
 
     def registerNode(self, nodePlugin: NodePlugin):
         """
@@ -643,7 +755,7 @@ class NodePluginManager(BaseObject):
         Args:
             nodePlugin: the node plugin to register.
         """
-        name = nodePlugin.nodeDescriptor.__name__
+        name = nodePlugin.name
         if not self.isRegistered(name) and nodePlugin.status not in (NodePluginStatus.DESC_ERROR,
                                                                      NodePluginStatus.ERROR):
             try:
@@ -661,7 +773,7 @@ class NodePluginManager(BaseObject):
         Args:
             nodePlugin: the node plugin to unregister.
         """
-        name = nodePlugin.nodeDescriptor.__name__
+        name = nodePlugin.name
         if self.isRegistered(name):
             if nodePlugin.status != NodePluginStatus.LOADED:
                 logging.warning(f"NodePlugin {name} is registered but is not correctly loaded.")
@@ -0,0 +1,172 @@
+"""
+History of the runtime of computed NodeChunks, used to predict the duration and memory usage of the next runs.
+
+When enabled (see MESHROOM_RUNTIME_HISTORY), the elapsed time and peak memory of each successfully computed chunk
+are recorded in a local SQLite database, keyed by node type, package version and chunk size:
+the size of the chunk's range for parallelized nodes, the size of the node otherwise.
+
+Predictions are based on the most recent records of the same node type and package version:
+records of the same size are used as is, while the duration of a chunk of another size is extrapolated
+from the records of the nearest size. Records of other package versions are only used as a fallback.
+"""
+
+import logging
+import os
+import socket
+import sqlite3
+import statistics
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Optional
+
+from meshroom.env import EnvVar
+
+
+@dataclass
+class RuntimePrediction:
+    """ Predicted resources usage of the computation of a NodeChunk. """
+    # Duration, in seconds
+    duration: float
+    # Peak resident memory of the process tree, in bytes
+    peakRss: int
+    # Number of records the prediction is based on
+    samples: int
+
+
+def chunkSize(chunk) -> int:
+    """ Return the size of the work done by `chunk`, used to compare runs of the same node type. """
+    if chunk.range.blockSize:
+        return chunk.range.effectiveBlockSize
+    return chunk.node.size
+
+
+def chunkPeakRss(chunk) -> int:
+    """ Return the peak resident memory of `chunk` process tree, from its statistics. """
+    values = []
+    for value in chunk.statistics.process.curves.get("memory_info.rss", []):
+        try:
+            values.append(float(value))
+        except (TypeError, ValueError):
+            pass
+    return int(max((v for v in values if v == v), default=0))
+
+
+class RuntimeHistory:
+    """ SQLite database of the runtime of computed NodeChunks. """
+
+    # Number of records kept per node type, package version and size
+    MAX_RECORDS = 20
+    # Time (in seconds) to wait for concurrent writers to release the database
+    TIMEOUT = 5.0
+
+    def __init__(self, filepath: str):
+        self._filepath = filepath
+
+    @property
+    def filepath(self) -> str:
+        return self._filepath
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._filepath, timeout=self.TIMEOUT)
+        connection.execute("CREATE TABLE IF NOT EXISTS runtime ("
+                           "nodeType TEXT, packageVersion TEXT, size INTEGER, elapsedTime REAL, peakRss INTEGER, "
+                           "hostname TEXT, date REAL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS runtimeKey ON runtime (nodeType, packageVersion, size)")
+        return connection
+
+    def record(self, nodeType: str, packageVersion: str, size: int, elapsedTime: float, peakRss: int,
+               hostname: str = ""):
+        """ Record a run of a chunk and drop the oldest records of the same key. """
+        key = (nodeType, packageVersion, size)
+        try:
+            dirname = os.path.dirname(self._filepath)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            with closing(self._connect()) as connection, connection:
+                connection.execute("INSERT INTO runtime VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                   (*key, elapsedTime, peakRss, hostname, time.time()))
+                connection.execute("DELETE FROM runtime WHERE rowid IN ("
+                                   "SELECT rowid FROM runtime WHERE nodeType = ? AND packageVersion = ? AND size = ? "
+                                   "ORDER BY rowid DESC LIMIT -1 OFFSET ?)", (*key, self.MAX_RECORDS))
+        except (OSError, sqlite3.Error) as e:
+            logging.debug(f"Failed to update runtime history '{self._filepath}': {e}")
+
+    def recordChunk(self, chunk):
+        """ Record the run of `chunk`, from its status and statistics. """
+        node = chunk.node
+        self.record(node.nodeType, node.packageVersion, chunkSize(chunk), chunk.status.elapsedTime,
+                    chunkPeakRss(chunk), chunk.status.hostname or socket.gethostname())
+
+    def _records(self, nodeType: str, packageVersion: Optional[str]) -> dict[int, list[tuple[float, int]]]:
+        """ Get the (elapsed time, peak rss) records per size of a node type. """
+        if not os.path.exists(self._filepath):
+            return {}
+        query = "SELECT size, elapsedTime, peakRss FROM runtime WHERE nodeType = ?"
+        args = [nodeType]
+        if packageVersion is not None:
+            query += " AND packageVersion = ?"
+            args.append(packageVersion)
+        try:
+            with closing(self._connect()) as connection:
+                rows = connection.execute(query + " ORDER BY rowid DESC", args).fetchall()
+        except sqlite3.Error as e:
+            logging.debug(f"Failed to read runtime history '{self._filepath}': {e}")
+            return {}
+        records = {}
+        for size, elapsedTime, peakRss in rows:
+            sizeRecords = records.setdefault(size, [])
+            if len(sizeRecords) < self.MAX_RECORDS:
+                sizeRecords.append((elapsedTime, peakRss))
+        return records
+
+    def _nodeTypeRecords(self, nodeType: str, packageVersion: str) -> dict[int, list[tuple[float, int]]]:
+        return self._records(nodeType, packageVersion) or self._records(nodeType, None)
+
+    @staticmethod
+    def _predict(records: dict[int, list[tuple[float, int]]], size: int) -> Optional[RuntimePrediction]:
+        if not records:
+            return None
+        nearestSize = min(records, key=lambda s: (abs(s - size), -s))
+        sizeRecords = records[nearestSize]
+        duration = statistics.median(r[0] for r in sizeRecords)
+        if nearestSize != size and nearestSize > 0:
+            duration *= size / nearestSize
+        peakRss = int(statistics.median(r[1] for r in sizeRecords))
+        return RuntimePrediction(duration=duration, peakRss=peakRss, samples=len(sizeRecords))
+
+    def predict(self, nodeType: str, packageVersion: str, size: int) -> Optional[RuntimePrediction]:
+        """
+        Predict the resources usage of a chunk.
+
+        Returns:
+            The prediction, or None if no run of this node type has been recorded.
+        """
+        return self._predict(self._nodeTypeRecords(nodeType, packageVersion), size)
+
+    def predictChunk(self, chunk) -> Optional[RuntimePrediction]:
+        """ Predict the resources usage of the computation of `chunk`. """
+        node = chunk.node
+        return self.predict(node.nodeType, node.packageVersion, chunkSize(chunk))
+
+    def predictNode(self, node) -> Optional[RuntimePrediction]:
+        """
+        Predict the resources usage of the computation of all the chunks of `node`, one after the other.
+        Chunks without prediction are ignored.
+        """
+        records = self._nodeTypeRecords(node.nodeType, node.packageVersion)
+        predictions = [p for p in (self._predict(records, chunkSize(chunk)) for chunk in node.chunks)
+                       if p is not None]
+        if not predictions:
+            return None
+        return RuntimePrediction(duration=sum(p.duration for p in predictions),
+                                 peakRss=max(p.peakRss for p in predictions),
+                                 samples=min(p.samples for p in predictions))
+
+
+def getRuntimeHistory() -> Optional[RuntimeHistory]:
+    """ Get the runtime history, or None if it is disabled. """
+    filepath = EnvVar.get(EnvVar.MESHROOM_RUNTIME_HISTORY)
+    if not filepath:
+        return None
+    return RuntimeHistory(filepath)
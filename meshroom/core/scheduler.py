@@ -0,0 +1,309 @@
+"""
+Local scheduling of NodeChunks computation.
+
+The ChunkScheduler processes the NodeChunks of a list of nodes, following their dependencies,
+and dispatches ready chunks concurrently as long as the ResourceBudget allows it.
+When a RuntimeHistory is available, ready nodes are dispatched longest-path-first, using the predicted
+duration of the nodes.
+"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from meshroom.core.desc import Level
+from meshroom.core.runtimeHistory import RuntimeHistory, getRuntimeHistory
+from meshroom.env import EnvVar
+
+
+class ResourceBudget:
+    """
+    Resources available for the concurrent computation of NodeChunks on the local machine.
+
+    Resources are expressed in units of the node descriptors' computation levels (see desc.Level):
+    a chunk of a node with a NORMAL level consumes 1 unit of the corresponding resource,
+    an INTENSIVE one consumes 2 units. A resource without capacity is not limited.
+    """
+    resourceNames = ("cpu", "ram", "gpu")
+
+    def __init__(self, maxJobs: int = 1, cpu: int = None, ram: int = None, gpu: int = None):
+        """
+        Args:
+            maxJobs: the maximum number of chunks processed at the same time.
+            cpu: (optional) the amount of CPU units available.
+            ram: (optional) the amount of RAM units available.
+            gpu: (optional) the amount of GPU units available.
+        """
+        self.maxJobs = max(1, maxJobs)
+        self.capacity = {"cpu": cpu, "ram": ram, "gpu": gpu}
+        self.used = dict.fromkeys(self.resourceNames, 0)
+        self.jobs = 0
+
+    @classmethod
+    def fromEnv(cls, maxJobs: int = None) -> "ResourceBudget":
+        """
+        Create a ResourceBudget from the MESHROOM_LOCAL_MAX_JOBS and MESHROOM_LOCAL_RESOURCES
+        environment variables.
+
+        Args:
+            maxJobs: (optional) override the maximum number of concurrent jobs.
+        """
+        capacity = {}
+        for item in EnvVar.get(EnvVar.MESHROOM_LOCAL_RESOURCES).split(","):
+            if not item.strip():
+                continue
+            try:
+                name, value = item.split("=")
+                name = name.strip()
+                if name not in cls.resourceNames:
+                    raise ValueError(f"unknown resource '{name}'")
+                capacity[name] = int(value)
+            except ValueError as e:
+                logging.warning(f"Invalid local resource definition '{item}': {e}.")
+        if maxJobs is None:
+            maxJobs = EnvVar.get(EnvVar.MESHROOM_LOCAL_MAX_JOBS)
+        return cls(maxJobs=maxJobs, **capacity)
+
+    @classmethod
+    def chunkCost(cls, chunk) -> dict[str, int]:
+        """ Return the resources consumed by the processing of `chunk`. """
+        nodeDesc = chunk.node.nodeDesc
+        if nodeDesc is None:
+            return dict.fromkeys(cls.resourceNames, 0)
+        return {name: getattr(nodeDesc, name, Level.NONE).value for name in cls.resourceNames}
+
+    def canAcquire(self, cost: dict[str, int]) -> bool:
+        """
+        Whether the resources described by `cost` are available.
+        A job is always accepted when nothing else is running, so that chunks exceeding the
+        budget can still be processed.
+        """
+        if self.jobs == 0:
+            return True
+        if self.jobs >= self.maxJobs:
+            return False
+        return all(self.capacity[name] is None or self.used[name] + cost[name] <= self.capacity[name]
+                   for name in self.resourceNames)
+
+    def acquire(self, cost: dict[str, int]):
+        self.jobs += 1
+        for name in self.resourceNames:
+            self.used[name] += cost[name]
+
+    def release(self, cost: dict[str, int]):
+        self.jobs -= 1
+        for name in self.resourceNames:
+            self.used[name] -= cost[name]
+
+
+class _InlineExecutor:
+    """
+    Executor running the submitted callable immediately in the calling thread.
+    Used when a single job is allowed, to keep the computation in the scheduling thread.
+    """
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class ChunkScheduler:
+    """
+    Process the NodeChunks of a list of nodes, concurrently when the ResourceBudget allows it.
+
+    The chunks of a node become ready once all its upstream nodes that are part of the list have
+    been processed. Ready chunks are dispatched on worker threads: as the chunks of computable nodes
+    run in sub-processes (command lines or isolated environments), this gives actual parallelism.
+
+    The list of nodes is read at each scheduling step, so nodes can be added to or removed from it
+    while the computation is running.
+    Ready nodes are dispatched by decreasing predicted duration of the longest path from them to the end
+    of the computation, so that the chunks on the critical path start first. Without predictions,
+    nodes are dispatched in the order of the list.
+    Sub-classes can override the event methods to customize the behavior.
+    """
+
+    def __init__(self, graph, nodes: list, budget: ResourceBudget = None,
+                 forceCompute: bool = False, inCurrentEnv: bool = False, history: RuntimeHistory = None):
+        """
+        Args:
+            graph: the graph the nodes belong to.
+            nodes: the list of nodes to process, sorted by dependencies.
+            budget: (optional) the resources budget. Defaults to the one defined in the environment.
+            forceCompute: compute the chunks even if they are already computed.
+            inCurrentEnv: compute the chunks in the current environment.
+            history: (optional) the runtime history used to predict the nodes duration.
+                Defaults to the one defined in the environment.
+        """
+        self.graph = graph
+        self.nodes = nodes
+        self.budget = budget or ResourceBudget.fromEnv()
+        self.forceCompute = forceCompute
+        self.inCurrentEnv = inCurrentEnv
+        self.history = history or getRuntimeHistory()
+        self._upstreamNodes = {}
+        self._pendingChunks = {}
+        self._runningChunks = {}
+        self._processedNodes = set()
+        self._stopRequested = False
+        self._nodeDurations = {}
+        self._dispatchOrderCache = ((), [])
+
+    def chunksToProcess(self, node) -> list:
+        """ Return the chunks of `node` to process. """
+        return list(node.chunks)
+
+    def skipNode(self, node) -> bool:
+        """ Whether `node` should not be processed at all. """
+        return False
+
+    def skipChunk(self, chunk) -> bool:
+        """ Whether `chunk` should not be processed, checked right before its dispatch. """
+        return False
+
+    def onNodeStarted(self, node):
+        """ Called before the first chunk of `node` is dispatched. """
+        node.preprocess()
+
+    def onNodeFinished(self, node):
+        """ Called once all the chunks of `node` have been processed. """
+        node.postprocess()
+
+    def onChunkStarted(self, node, chunk):
+        """ Called when `chunk` is dispatched. """
+        pass
+
+    def onChunkError(self, node, chunk, error: Exception):
+        """ Called when the processing of `chunk` has failed. Re-raise the error by default. """
+        raise error
+
+    def processChunk(self, chunk):
+        """ Process `chunk`. Called from a worker thread if several jobs are allowed. """
+        chunk.process(self.forceCompute, self.inCurrentEnv)
+
+    def requestStop(self):
+        """ Stop dispatching new chunks. Running chunks are waited for. """
+        self._stopRequested = True
+
+    def isStopRequested(self) -> bool:
+        return self._stopRequested
+
+    def hasRunningChunks(self) -> bool:
+        return bool(self._runningChunks)
+
+    def runningChunks(self) -> list:
+        return [chunk for _, chunk, _ in self._runningChunks.values()]
+
+    def run(self):
+        """ Process all the nodes, and return once all the dispatched chunks have been processed. """
+        if self.budget.maxJobs == 1:
+            executor = _InlineExecutor()
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.budget.maxJobs)
+        try:
+            while True:
+                if not self.isStopRequested():
+                    self._dispatchReadyChunks(executor)
+                if not self._runningChunks:
+                    break
+                done, _ = wait(list(self._runningChunks.keys()), return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._onChunkDone(future)
+        except BaseException:
+            self.requestStop()
+            raise
+        finally:
+            executor.shutdown(wait=True)
+
+    def _onChunkDone(self, future: Future):
+        node, chunk, cost = self._runningChunks.pop(future)
+        self.budget.release(cost)
+        try:
+            error = future.exception()
+            if error is not None:
+                self.onChunkError(node, chunk, error)
+        finally:
+            self._finishNodeIfDone(node)
+
+    def _finishNodeIfDone(self, node):
+        if node in self._processedNodes:
+            return
+        if self.isStopRequested():
+            # No other chunk will be dispatched for this node
+            self._pendingChunks[node] = []
+        if self._pendingChunks.get(node) or any(n is node for n, _, _ in self._runningChunks.values()):
+            return
+        self._processedNodes.add(node)
+        self.onNodeFinished(node)
+
+    def _getUpstreamNodes(self, node) -> set:
+        if node not in self._upstreamNodes:
+            self._upstreamNodes[node] = set(self.graph.getInputNodes(node, recursive=True, dependenciesOnly=True))
+        return self._upstreamNodes[node]
+
+    def _isNodeReady(self, node) -> bool:
+        return all(n in self._processedNodes or n not in self.nodes for n in self._getUpstreamNodes(node))
+
+    def _nodeDuration(self, node) -> float:
+        if node not in self._nodeDurations:
+            prediction = self.history.predictNode(node) if self.history else None
+            self._nodeDurations[node] = prediction.duration if prediction else 0.0
+        return self._nodeDurations[node]
+
+    def _dispatchOrder(self) -> list:
+        """ Return the nodes to process, sorted by decreasing predicted duration of their longest downstream path. """
+        nodes = tuple(self.nodes)
+        if self._dispatchOrderCache[0] == nodes:
+            return self._dispatchOrderCache[1]
+        order = list(nodes)
+        if self.history:
+            nodesSet = set(nodes)
+            pathDurations = {}
+            # Nodes are sorted by dependencies: downstream nodes are visited first
+            for node in reversed(nodes):
+                downstream = [pathDurations[n] for n in self.graph.getOutputNodes(node, False, True)
+                              if n in nodesSet and n in pathDurations]
+                pathDurations[node] = self._nodeDuration(node) + max(downstream, default=0.0)
+            order.sort(key=lambda n: -pathDurations[n])
+        self._dispatchOrderCache = (nodes, order)
+        return order
+
+    def _dispatchReadyChunks(self, executor):
+        for node in self._dispatchOrder():
+            if node in self._processedNodes:
+                continue
+            if node not in self._pendingChunks:
+                if self.skipNode(node):
+                    self._processedNodes.add(node)
+                    continue
+                if not self._isNodeReady(node):
+                    continue
+                self._pendingChunks[node] = self.chunksToProcess(node)
+                self.onNodeStarted(node)
+
+            pendingChunks = self._pendingChunks[node]
+            while pendingChunks:
+                if self.isStopRequested():
+                    return
+                chunk = pendingChunks[0]
+                if self.skipChunk(chunk):
+                    pendingChunks.pop(0)
+                    continue
+                cost = self.budget.chunkCost(chunk)
+                if not self.budget.canAcquire(cost):
+                    # Keep the dispatch order: do not start chunks of following nodes
+                    return
+                pendingChunks.pop(0)
+                self.budget.acquire(cost)
+                self.onChunkStarted(node, chunk)
+                future = executor.submit(self.processChunk, chunk)
+                self._runningChunks[future] = (node, chunk, cost)
+                if future.done():
+                    # Processed inline: handle the result before dispatching anything else
+                    return
+            self._finishNodeIfDone(node)
@@ -0,0 +1,255 @@
+"""
+Cache of node outputs shared across projects.
+
+When enabled (see MESHROOM_SHARED_CACHE), the internal folder of each computed node is published in a global store,
+at '{sharedCache}/{nodeType}/{uid}'. A node of another project with the same UID - i.e. the same parameters and inputs -
+then imports these outputs instead of being recomputed.
+
+Files are shared without copying data when possible: reflinks (copy-on-write clones) are used on file systems
+supporting them, hard links otherwise, and files are copied as a last resort.
+The status, statistics and log files of the chunks are always copied, as they are modified in place.
+
+Entries are published in a temporary folder renamed into place, along with an entry file describing them:
+an entry exists only once complete. Node folders sharing files with the store also contain the entry file,
+so that their hard-linked files are detached from the store before the node is recomputed.
+
+On import, the status files are rewritten for the importing node, and the paths into the source node folder stored
+in the dynamic output values are relocated to the importing node folder. Other output files are shared as they are:
+node types writing absolute paths to their own internal folder inside their output files should not be shared.
+"""
+
+import datetime
+import errno
+import json
+import logging
+import os
+import shutil
+import socket
+import sys
+import uuid
+from collections.abc import Iterable
+from typing import Optional
+
+from meshroom.env import EnvVar
+
+
+def _reflink(src: str, dst: str):
+    """ Clone `src` into `dst` using a copy-on-write reflink (Linux only). """
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this platform")
+    import fcntl
+    FICLONE = 0x40049409
+    with open(src, "rb") as srcFile, open(dst, "wb") as dstFile:
+        try:
+            fcntl.ioctl(dstFile.fileno(), FICLONE, srcFile.fileno())
+        except OSError:
+            dstFile.close()
+            os.remove(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def shareFile(src: str, dst: str, allowLinks: bool = True) -> str:
+    """
+    Make `dst` have the same content as `src`, replacing any existing file, sharing the data when possible.
+
+    Args:
+        src: the source file.
+        dst: the destination file.
+        allowLinks: whether `dst` can be a hard link to `src`.
+
+    Returns:
+        The method used: "reflink", "hardlink" or "copy".
+    """
+    # Unique name, as chunks of a node may share files concurrently from the same process
+    tmp = f"{dst}.{uuid.uuid4().hex}.sharing"
+    method = "copy"
+    try:
+        _reflink(src, tmp)
+        method = "reflink"
+    except OSError:
+        try:
+            if not allowLinks:
+                raise OSError(errno.EPERM, "Hard links are not allowed")
+            os.link(src, tmp)
+            method = "hardlink"
+        except OSError:
+            shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return method
+
+
+def relocatePaths(value, srcFolder: str, dstFolder: str):
+    """ Return a copy of `value` where the paths in `srcFolder` are replaced by the same paths in `dstFolder`. """
+    if isinstance(value, str):
+        if value == srcFolder or value.startswith(os.path.join(srcFolder, "")):
+            return dstFolder + value[len(srcFolder):]
+        return value
+    if isinstance(value, dict):
+        return {key: relocatePaths(v, srcFolder, dstFolder) for key, v in value.items()}
+    if isinstance(value, list):
+        return [relocatePaths(v, srcFolder, dstFolder) for v in value]
+    return value
+
+
+def _listFiles(folder: str) -> list[str]:
+    """ Return the paths of the files of `folder`, relative to it. """
+    files = []
+    for root, _, filenames in os.walk(folder):
+        for filename in filenames:
+            if filename.endswith((".writing", ".sharing", ".detached")):
+                continue
+            files.append(os.path.relpath(os.path.join(root, filename), folder))
+    return files
+
+
+class SharedCache:
+    """ Store of node internal folders, indexed by node type and UID. """
+
+    ENTRY_FILE = "sharedCacheEntry.json"
+
+    def __init__(self, root: str):
+        self._root = root
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    def entryFolder(self, nodeType: str, uid: str) -> str:
+        return os.path.join(self._root, nodeType, uid)
+
+    def hasEntry(self, nodeType: str, uid: str) -> bool:
+        return os.path.isfile(os.path.join(self.entryFolder(nodeType, uid), self.ENTRY_FILE))
+
+    def entry(self, nodeType: str, uid: str) -> Optional[dict]:
+        """ Return the description of an entry, or None if there is no valid entry for this node. """
+        try:
+            with open(os.path.join(self.entryFolder(nodeType, uid), self.ENTRY_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _shareFiles(srcFolder: str, dstFolder: str, files: Iterable[str], copiedFiles: set[str]) -> dict[str, int]:
+        """ Share `files` of `srcFolder` into `dstFolder`, `copiedFiles` last. Return the number of files per method. """
+        methods = {}
+        files = sorted(files, key=lambda f: f in copiedFiles)
+        for relPath in files:
+            dst = os.path.join(dstFolder, relPath)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            method = shareFile(os.path.join(srcFolder, relPath), dst, allowLinks=relPath not in copiedFiles)
+            methods[method] = methods.get(method, 0) + 1
+        return methods
+
+    def publish(self, folder: str, nodeType: str, uid: str, copiedFiles: Iterable[str] = (),
+                metadata: Optional[dict] = None) -> bool:
+        """
+        Publish the content of a node internal folder, unless an entry already exists for this node.
+
+        Args:
+            folder: the node internal folder.
+            nodeType: the node type.
+            uid: the node UID.
+            copiedFiles: the paths of the files, relative to `folder`, to copy instead of linking.
+            metadata: (optional) additional information stored in the entry file.
+
+        Returns:
+            Whether a new entry has been published.
+        """
+        if not uid or self.hasEntry(nodeType, uid):
+            return False
+        entryFolder = self.entryFolder(nodeType, uid)
+        stagingFolder = os.path.join(self._root, nodeType, f".{uid}.{uuid.uuid4().hex}.publishing")
+        copiedFiles = set(copiedFiles)
+        try:
+            files = [f for f in _listFiles(folder) if f != self.ENTRY_FILE]
+            methods = self._shareFiles(folder, stagingFolder, files, copiedFiles)
+            entry = dict(metadata or {})
+            entry.update({
+                "nodeType": nodeType,
+                "uid": uid,
+                "date": datetime.datetime.now().isoformat(),
+                "hostname": socket.gethostname(),
+                "size": sum(os.path.getsize(os.path.join(stagingFolder, f)) for f in files),
+            })
+            entryContent = json.dumps(entry, indent=4)
+            with open(os.path.join(stagingFolder, self.ENTRY_FILE), "w") as f:
+                f.write(entryContent)
+            try:
+                os.rename(stagingFolder, entryFolder)
+            except OSError:
+                # Published concurrently by another process
+                return False
+            if methods.get("hardlink"):
+                # The node folder now shares files with the store
+                with open(os.path.join(folder, self.ENTRY_FILE), "w") as f:
+                    f.write(entryContent)
+            logging.info(f"Published {nodeType} {uid} in the shared cache ({methods}).")
+            return True
+        except OSError as e:
+            logging.warning(f"Failed to publish {nodeType} {uid} in the shared cache: {e}")
+            return False
+        finally:
+            shutil.rmtree(stagingFolder, ignore_errors=True)
+
+    def importEntry(self, nodeType: str, uid: str, folder: str, copiedFiles: Iterable[str] = ()) -> bool:
+        """
+        Import the published content of a node into its internal folder.
+
+        Args:
+            nodeType: the node type.
+            uid: the node UID.
+            folder: the node internal folder.
+            copiedFiles: the paths of the files, relative to the entry folder, to copy instead of linking.
+
+        Returns:
+            Whether the entry exists and has been imported.
+        """
+        if not uid or not self.hasEntry(nodeType, uid):
+            return False
+        entryFolder = self.entryFolder(nodeType, uid)
+        try:
+            files = [f for f in _listFiles(entryFolder) if f != self.ENTRY_FILE]
+            # Chunks files (status files in particular) are written last
+            methods = self._shareFiles(entryFolder, folder, files, set(copiedFiles))
+            entryFile = os.path.join(entryFolder, self.ENTRY_FILE)
+            shutil.copyfile(entryFile, os.path.join(folder, self.ENTRY_FILE))
+            # Keep track of the last use of the entry
+            os.utime(entryFile)
+        except OSError as e:
+            logging.warning(f"Failed to import {nodeType} {uid} from the shared cache: {e}")
+            return False
+        logging.info(f"Imported {nodeType} {uid} from the shared cache ({methods}).")
+        return True
+
+
+def detachFromSharedCache(folder: str):
+    """
+    Replace the files of a node internal folder hard-linked to the shared cache by private copies,
+    so that recomputing the node does not modify the shared entry.
+    """
+    entryFile = os.path.join(folder, SharedCache.ENTRY_FILE)
+    if not os.path.exists(entryFile):
+        return
+    for relPath in _listFiles(folder):
+        filepath = os.path.join(folder, relPath)
+        try:
+            if os.stat(filepath).st_nlink > 1:
+                detachedFile = f"{filepath}.{uuid.uuid4().hex}.detached"
+                shareFile(filepath, detachedFile, allowLinks=False)
+                os.replace(detachedFile, filepath)
+        except OSError as e:
+            logging.warning(f"Failed to detach '{filepath}' from the shared cache: {e}")
+    try:
+        os.remove(entryFile)
+    except FileNotFoundError:
+        # Detached concurrently by another chunk
+        pass
+
+
+def getSharedCache() -> Optional[SharedCache]:
+    """ Get the shared cache, or None if it is disabled. """
+    root = EnvVar.get(EnvVar.MESHROOM_SHARED_CACHE)
+    if not root:
+        return None
+    return SharedCache(root)
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from array import array
 import subprocess
 import logging
 import psutil
@@ -6,8 +7,12 @@ import time
 import threading
 import platform
 import os
+import sys
+import json
+import math
+import mmap
+import struct
 
-import xml.etree.ElementTree as ET
 
 
 def bytes2human(n):
@@ -28,6 +33,212 @@ def bytes2human(n):
     return f'{n:.2f} B'
 
 
+class GpuSampler:
+    """
+    Interface of the GPU statistics backends.
+    This base class is the null backend: it does not provide any information.
+    """
+    name = "none"
+
+    def setInterval(self, interval):
+        """ Set the expected time between two samples, in seconds. """
+        pass
+
+    def sample(self):
+        """
+        Return the current GPU statistics, as a dict with the following optional keys:
+        gpuName, gpuMemoryTotal, gpuMemoryUsed (MiB), gpuUsed (%), gpuTemperature (C).
+        """
+        return {}
+
+    def close(self):
+        """ Release the resources used by the sampler. """
+        pass
+
+
+class NvmlGpuSampler(GpuSampler):
+    """ GPU sampler using the NVIDIA Management Library, through the optional pynvml package. """
+    name = "nvml"
+
+    def __init__(self):
+        import pynvml
+        self._nvml = pynvml
+        pynvml.nvmlInit()
+        self._handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+        name = pynvml.nvmlDeviceGetName(self._handle)
+        self._gpuName = name.decode() if isinstance(name, bytes) else name
+
+    def sample(self):
+        nvml = self._nvml
+        memory = nvml.nvmlDeviceGetMemoryInfo(self._handle)
+        return {
+            "gpuName": self._gpuName,
+            "gpuMemoryTotal": memory.total // (1024 * 1024),
+            "gpuMemoryUsed": memory.used // (1024 * 1024),
+            "gpuUsed": nvml.nvmlDeviceGetUtilizationRates(self._handle).gpu,
+            "gpuTemperature": nvml.nvmlDeviceGetTemperature(self._handle, nvml.NVML_TEMPERATURE_GPU),
+        }
+
+    def close(self):
+        try:
+            self._nvml.nvmlShutdown()
+        except Exception:
+            pass
+
+
+class NvidiaSmiGpuSampler(GpuSampler):
+    """
+    GPU sampler relying on a persistent nvidia-smi process, querying the GPU at a regular interval.
+    The last reported values are read from its output by a background thread.
+    """
+    name = "nvidia-smi"
+    _queryFields = ("gpuName", "gpuMemoryTotal", "gpuMemoryUsed", "gpuUsed", "gpuTemperature")
+
+    def __init__(self, executable, interval=2):
+        self._executable = executable
+        self._interval = None
+        self._process = None
+        self._lastSample = {}
+        self._mutex = threading.Lock()
+        self.setInterval(interval)
+
+    @staticmethod
+    def findExecutable():
+        """ Return the path to the nvidia-smi executable, or None if it cannot be found. """
+        import shutil
+        executable = shutil.which("nvidia-smi")
+        if executable is None and platform.system() == "Windows":
+            # Could not be found from the environment path,
+            # try to find it from system drive with default installation path
+            defaultExecutable = f"{os.environ['systemdrive']}\\Program Files\\NVIDIA Corporation\\NVSMI\\nvidia-smi.exe"
+            if os.path.isfile(defaultExecutable):
+                executable = defaultExecutable
+        return executable
+
+    def setInterval(self, interval):
+        interval = max(1, int(interval))
+        if interval == self._interval and self._process and self._process.poll() is None:
+            return
+        self._interval = interval
+        self._stopProcess()
+        try:
+            self._process = subprocess.Popen(
+                [self._executable, "--query-gpu=name,memory.total,memory.used,utilization.gpu,temperature.gpu",
+                 "--format=csv,noheader,nounits", "-i", "0", "-l", str(interval)],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        except OSError as e:
+            logging.debug(f'Failed to start nvidia-smi: "{e}".')
+            self._process = None
+            return
+        threading.Thread(target=self._readOutput, args=(self._process,), daemon=True).start()
+
+    def _readOutput(self, process):
+        for line in process.stdout:
+            values = [v.strip() for v in line.split(",")]
+            if len(values) != len(self._queryFields):
+                continue
+            with self._mutex:
+                self._lastSample = {k: v for k, v in zip(self._queryFields, values) if v and "N/A" not in v}
+
+    def sample(self):
+        with self._mutex:
+            return dict(self._lastSample)
+
+    def _stopProcess(self):
+        if self._process is None:
+            return
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+        self._process = None
+
+    def close(self):
+        self._stopProcess()
+
+
+def createGpuSampler(backend=None):
+    """
+    Create the GPU sampler for the given backend (one of "auto", "nvml", "nvidia-smi" or "none").
+    By default, the backend is defined by MESHROOM_STATS_GPU_SAMPLER.
+    With "auto", the first available backend among NVML and nvidia-smi is used.
+    """
+    from meshroom.env import EnvVar
+    backend = backend or EnvVar.get(EnvVar.MESHROOM_STATS_GPU_SAMPLER)
+    if backend in ("auto", NvmlGpuSampler.name):
+        try:
+            return NvmlGpuSampler()
+        except Exception as e:
+            logging.debug(f'NVML is not available: "{e}".')
+    if backend in ("auto", NvidiaSmiGpuSampler.name):
+        executable = NvidiaSmiGpuSampler.findExecutable()
+        if executable:
+            return NvidiaSmiGpuSampler(executable)
+    return GpuSampler()
+
+
+class ProcessTreeSampler:
+    """
+    Sample the resources used by a process and all its descendants (e.g. the command line processes of a node).
+    Cumulative values are summed over the processes.
+    """
+
+    def __init__(self, proc):
+        self.proc = proc
+        # Processes are kept between samples, as their CPU usage is computed since the previous call
+        self._processes = {}
+
+    def _treeProcesses(self):
+        try:
+            children = self.proc.children(recursive=True)
+        except psutil.Error:
+            children = []
+        processes = {}
+        for p in [self.proc] + children:
+            # psutil.Process equality takes the process creation time into account
+            processes[p] = self._processes.get(p, p)
+        self._processes = processes
+        return list(processes)
+
+    def sample(self):
+        """ Return the resources usage of the process tree, as a dict of values and named tuples. """
+        cpuPercent = 0.0
+        memoryPercent = 0.0
+        numThreads = 0
+        memoryInfo = None
+        ctxSwitches = None
+        nbProcesses = 0
+        for p in self._treeProcesses():
+            try:
+                with p.oneshot():
+                    cpuPercent += p.cpu_percent()
+                    memoryPercent += p.memory_percent()
+                    numThreads += p.num_threads()
+                    memory = p.memory_info()
+                    ctx = p.num_ctx_switches()
+            except psutil.Error:
+                continue
+            nbProcesses += 1
+            memoryInfo = memory if memoryInfo is None else memoryInfo._make(a + b for a, b in zip(memoryInfo, memory))
+            ctxSwitches = ctx if ctxSwitches is None else ctxSwitches._make(a + b for a, b in zip(ctxSwitches, ctx))
+
+        data = {
+            "cpu_percent": cpuPercent,
+            "memory_percent": memoryPercent,
+            "num_threads": numThreads,
+            "num_processes": nbProcesses,
+        }
+        if memoryInfo is not None:
+            data["memory_info"] = memoryInfo
+            data["num_ctx_switches"] = ctxSwitches
+        try:
+            data["status"] = self.proc.status()
+        except psutil.Error:
+            pass
+        return data
+
+
 class ComputerStatistics:
     def __init__(self):
         self.nbCores = 0
@@ -39,7 +250,7 @@ class ComputerStatistics:
         self.gpuMemoryTotal = 0
         self.gpuName = ''
         self.curves = defaultdict(list)
-        self.nvidia_smi = None
+        self._gpuSampler = None
         self._isInit = False
 
     def initOnFirstTime(self):
@@ -49,19 +260,20 @@ class ComputerStatistics:
 
         self.cpuFreq = psutil.cpu_freq().max
         self.ramTotal = psutil.virtual_memory().total / (1024*1024*1024)
+        if self._gpuSampler is None:
+            self._gpuSampler = createGpuSampler()
 
-        if platform.system() == "Windows":
-            import shutil
-            # If the platform is Windows and nvidia-smi
-            self.nvidia_smi = shutil.which('nvidia-smi')
-            if self.nvidia_smi is None:
-                # Could not be found from the environment path,
-                # try to find it from system drive with default installation path
-                default_nvidia_smi = f"{os.environ['systemdrive']}\\Program Files\\NVIDIA Corporation\\NVSMI\\nvidia-smi.exe"
-                if os.path.isfile(default_nvidia_smi):
-                    self.nvidia_smi = default_nvidia_smi
-        else:
-            self.nvidia_smi = "nvidia-smi"
+    def setGpuSampler(self, sampler):
+        """ Set the GPU sampler backend (see createGpuSampler). """
+        self._gpuSampler = sampler
+
+    def setInterval(self, interval):
+        if self._gpuSampler:
+            self._gpuSampler.setInterval(interval)
+
+    def close(self):
+        if self._gpuSampler:
+            self._gpuSampler.close()
 
     def _addKV(self, k, v):
         if isinstance(v, tuple):
@@ -87,58 +299,28 @@ class ComputerStatistics:
             logging.debug(f'Failed to get statistics: "{e}".')
 
     def updateGpu(self):
-        if not self.nvidia_smi:
+        if not self._gpuSampler:
             return
         try:
-            p = subprocess.Popen([self.nvidia_smi, "-q", "-x"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            xmlGpu, stdError = p.communicate(timeout=10)  # 10 seconds
-
-            smiTree = ET.fromstring(xmlGpu)
-            gpuTree = smiTree.find('gpu')
-
-            try:
-                self.gpuName = gpuTree.find('product_name').text
-            except Exception as e:
-                logging.debug(f'Failed to get gpuName: "{e}".')
-                pass
-            try:
-                gpuMemoryUsed = gpuTree.find('fb_memory_usage').find('used').text.split(" ")[0]
-                self._addKV('gpuMemoryUsed', gpuMemoryUsed)
-            except Exception as e:
-                logging.debug(f'Failed to get gpuMemoryUsed: "{e}".')
-                pass
-            try:
-                self.gpuMemoryTotal = gpuTree.find('fb_memory_usage').find('total').text.split(" ")[0]
-            except Exception as e:
-                logging.debug(f'Failed to get gpuMemoryTotal: "{e}".')
-                pass
-            try:
-                gpuUsed = gpuTree.find('utilization').find('gpu_util').text.split(" ")[0]
-                self._addKV('gpuUsed', gpuUsed)
-            except Exception as e:
-                logging.debug(f'Failed to get gpuUsed: "{e}".')
-                pass
-            try:
-                gpuTemperature = gpuTree.find('temperature').find('gpu_temp').text.split(" ")[0]
-                self._addKV('gpuTemperature', gpuTemperature)
-            except Exception as e:
-                logging.debug(f'Failed to get gpuTemperature: "{e}".')
-                pass
-        except subprocess.TimeoutExpired as e:
-            logging.debug(f'Timeout when retrieving information from nvidia_smi: "{e}".')
-            p.kill()
-            outs, errs = p.communicate()
-            return
+            gpu = self._gpuSampler.sample()
         except Exception as e:
-            logging.debug(f'Failed to get information from nvidia_smi: "{e}".')
+            logging.debug(f'Failed to get GPU statistics: "{e}".')
             return
+        if "gpuName" in gpu:
+            self.gpuName = gpu["gpuName"]
+        if "gpuMemoryTotal" in gpu:
+            self.gpuMemoryTotal = gpu["gpuMemoryTotal"]
+        for key in ("gpuMemoryUsed", "gpuUsed", "gpuTemperature"):
+            if key in gpu:
+                self._addKV(key, gpu[key])
 
     def toDict(self):
-        return self.__dict__
+        return {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
 
     def fromDict(self, d):
         for k, v in d.items():
-            setattr(self, k, v)
+            if not k.startswith("_"):
+                setattr(self, k, v)
 
 
 class ProcStatistics:
@@ -161,28 +343,13 @@ class ProcStatistics:
         # 'terminal',
         'username',
         ]
-    dynamicKeys = [
-        # 'memory_full_info',
-        # 'connections',
-        'cpu_percent',
-        # 'open_files',
-        'memory_info',
-        'memory_percent',
-        'threads',
-        'num_threads',
-        # 'memory_maps',
-        'status',
-        # 'num_fds', # The number of file descriptors currently opened by this process (non cumulative) - N/A on Windows
-        # 'io_counters', # The number and bytes read/write by the process - N/A on some platforms
-        'num_ctx_switches',
-        ]
-
     def __init__(self):
         self.iterIndex = 0
         self.lastIterIndexWithFiles = -1
         self.duration = 0  # computation time set at the end of the execution
         self.curves = defaultdict(list)
         self.openFiles = {}
+        self._sampler = None
 
     def _addKV(self, k, v):
         if isinstance(v, tuple):
@@ -198,7 +365,9 @@ class ProcStatistics:
         '''
         proc: psutil.Process object
         '''
-        data = proc.as_dict(self.dynamicKeys)
+        if self._sampler is None or self._sampler.proc != proc:
+            self._sampler = ProcessTreeSampler(proc)
+        data = self._sampler.sample()
         for k, v in data.items():
             self._addKV(k, v)
 
@@ -229,16 +398,207 @@ class ProcStatistics:
         self.openFiles = d.get('openFiles', {})
 
 
+class StatisticsFile:
+    """
+    Compact binary storage of Statistics, written by appending the new samples.
+
+    File layout:
+        - magic number (8 bytes) and header size (uint32, little-endian)
+        - header: JSON description of the statistics (static information, columns),
+          padded to the header size so it can be updated in place
+        - records: one float64 per column for each sample, memory-mappable
+    Values of non-numeric curves are stored as indices in the list of the column's categories.
+    Missing values are stored as NaN.
+    """
+    MAGIC = b"MRSTATS\0"
+    _PREFIX = struct.Struct("<8sI")
+    HEADER_BLOCK_SIZE = 4096
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._columns = None
+        self._categories = {}
+        # Number of values of each curve already written
+        self._curveSizes = {}
+        self._header = None
+        self._headerSize = 0
+        self._nbSamples = 0
+
+    @classmethod
+    def isStatisticsFile(cls, filepath):
+        """ Whether `filepath` is a binary statistics file. """
+        try:
+            with open(filepath, "rb") as f:
+                return f.read(len(cls.MAGIC)) == cls.MAGIC
+        except OSError:
+            return False
+
+    @staticmethod
+    def _getCurves(statistics):
+        curves = {}
+        for prefix, stats in (("computer.", statistics.computer), ("process.", statistics.process)):
+            for key, curve in stats.curves.items():
+                curves[prefix + key] = curve
+        return curves
+
+    def _encode(self, column, value):
+        if value is None:
+            return math.nan
+        categories = self._categories.get(column)
+        if categories is None:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return math.nan
+        value = str(value)
+        if value not in categories:
+            categories.append(value)
+        return float(categories.index(value))
+
+    def _encodeRows(self, statistics, curves, firstSample):
+        """ Encode the samples of `statistics` from `firstSample` as a flat array of values. """
+        nbSamples = len(statistics.times) - firstSample
+        columnsValues = [array("d", statistics.times[firstSample:])]
+        for column in self._columns[1:]:
+            curve = curves.get(column, [])
+            newValues = curve[self._curveSizes.get(column, 0):]
+            self._curveSizes[column] = len(curve)
+            # Curves with missing values are aligned on the last sample
+            newValues = [None] * (nbSamples - len(newValues)) + newValues[-nbSamples:] if nbSamples else []
+            columnsValues.append(array("d", (self._encode(column, value) for value in newValues)))
+        rows = array("d", bytes(8 * nbSamples * len(self._columns)))
+        for index, values in enumerate(columnsValues):
+            rows[index::len(self._columns)] = values
+        return rows
+
+    def _buildHeader(self, statistics):
+        header = {
+            "fileVersion": statistics.fileVersion,
+            "interval": statistics.interval,
+            "computer": {k: v for k, v in statistics.computer.toDict().items() if k != "curves"},
+            "process": {k: v for k, v in statistics.process.toDict().items() if k != "curves"},
+            "columns": self._columns,
+            "categories": self._categories,
+            "byteOrder": sys.byteorder,
+        }
+        return json.dumps(header).encode()
+
+    def write(self, statistics):
+        """
+        Write the samples of `statistics` added since the last call.
+        The whole file is only written on the first call and when the list of curves changes.
+        """
+        curves = self._getCurves(statistics)
+        columns = ["times"] + list(curves)
+        if columns != self._columns or not os.path.exists(self.filepath):
+            self._writeAll(statistics, curves, columns)
+            return
+
+        rows = self._encodeRows(statistics, curves, self._nbSamples)
+        header = self._buildHeader(statistics)
+        if header != self._header:
+            if len(header) > self._headerSize:
+                self._writeAll(statistics, curves, columns)
+                return
+            with open(self.filepath, "r+b") as f:
+                f.seek(self._PREFIX.size)
+                f.write(header.ljust(self._headerSize))
+            self._header = header
+        if rows:
+            with open(self.filepath, "ab") as f:
+                rows.tofile(f)
+        self._nbSamples = len(statistics.times)
+
+    def _writeAll(self, statistics, curves, columns):
+        self._columns = columns
+        self._curveSizes = {}
+        self._categories = {}
+        for column in columns[1:]:
+            firstValue = next((v for v in curves[column] if v is not None), None)
+            if isinstance(firstValue, str):
+                try:
+                    float(firstValue)
+                except ValueError:
+                    self._categories[column] = []
+        rows = self._encodeRows(statistics, curves, 0)
+        self._header = self._buildHeader(statistics)
+        blockSize = self.HEADER_BLOCK_SIZE
+        self._headerSize = (len(self._header) // blockSize + 1) * blockSize
+        writingFilepath = self.filepath + ".writing"
+        with open(writingFilepath, "wb") as f:
+            f.write(self._PREFIX.pack(self.MAGIC, self._headerSize))
+            f.write(self._header.ljust(self._headerSize))
+            rows.tofile(f)
+        os.replace(writingFilepath, self.filepath)
+        self._nbSamples = len(statistics.times)
+
+    @classmethod
+    def read(cls, filepath):
+        """
+        Read a binary statistics file.
+
+        Returns:
+            dict: the statistics, in the same form as Statistics.toDict.
+        """
+        with open(filepath, "rb") as f:
+            magic, headerSize = cls._PREFIX.unpack(f.read(cls._PREFIX.size))
+            if magic != cls.MAGIC:
+                raise ValueError(f"Invalid statistics file: {filepath}")
+            header = json.loads(f.read(headerSize))
+            columns = header["columns"]
+            dataOffset = cls._PREFIX.size + headerSize
+            rowSize = 8 * len(columns)
+            # Ignore an incomplete record being written
+            nbSamples = (os.fstat(f.fileno()).st_size - dataOffset) // rowSize
+            columnsValues = [[] for _ in columns]
+            if nbSamples > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    values = memoryview(mm)[dataOffset:dataOffset + nbSamples * rowSize].cast("d")
+                    try:
+                        if header.get("byteOrder", sys.byteorder) != sys.byteorder:
+                            swapped = array("d", values)
+                            swapped.byteswap()
+                            values.release()
+                            values = memoryview(swapped)
+                        columnsValues = [values[index::len(columns)].tolist() for index in range(len(columns))]
+                    finally:
+                        values.release()
+
+        categories = header.get("categories", {})
+        curves = {"computer": defaultdict(list), "process": defaultdict(list)}
+        for column, values in zip(columns[1:], columnsValues[1:]):
+            group, key = column.split(".", 1)
+            # Keep missing values, for the curves to stay aligned with the times
+            values = [None if math.isnan(v) else v for v in values]
+            if column in categories:
+                values = [None if v is None else categories[column][int(v)] for v in values]
+            curves[group][key] = values
+
+        return {
+            "fileVersion": header.get("fileVersion", 0.0),
+            "computer": dict(header.get("computer", {}), curves=curves["computer"]),
+            "process": dict(header.get("process", {}), curves=curves["process"]),
+            "times": columnsValues[0],
+            "interval": header.get("interval", 10),
+        }
+
+
 class Statistics:
     """
     """
-    fileVersion = 2.0
+    fileVersion = 3.0
+    # Bounds of the refresh interval (in seconds): the interval is doubled each time this number of samples
+    # has been taken with it, to limit the sampling cost and the number of samples of long computations
+    minInterval = 2
+    maxInterval = 64
+    samplesPerInterval = 150
 
     def __init__(self):
         self.computer = ComputerStatistics()
         self.process = ProcStatistics()
         self.times = []
-        self.interval = 10  # refresh interval in seconds
+        self.interval = self.minInterval  # refresh interval in seconds
+        self._file = None
 
     def update(self, proc):
         '''
@@ -251,6 +611,19 @@ class Statistics:
         self.process.update(proc)
         return True
 
+    def adaptInterval(self, elapsedTime):
+        """ Adapt the refresh interval to the time elapsed since the start of the computation. """
+        interval = self.interval
+        while interval < self.maxInterval and elapsedTime >= self.samplesPerInterval * interval:
+            interval = min(interval * 2, self.maxInterval)
+        if interval != self.interval:
+            self.interval = interval
+            self.computer.setInterval(interval)
+
+    def close(self):
+        """ Release the resources used to collect the statistics. """
+        self.computer.close()
+
     def toDict(self):
         return {
             'fileVersion': self.fileVersion,
@@ -280,6 +653,23 @@ class Statistics:
         except Exception as e:
             logging.debug(f'Failed while loading statistics: times: "{e}".')
 
+    def save(self, filepath):
+        """
+        Write the statistics to `filepath`.
+        The file is written on the first call, and only the new samples are appended by the following calls.
+        """
+        if self._file is None or self._file.filepath != filepath:
+            self._file = StatisticsFile(filepath)
+        self._file.write(self)
+
+    def load(self, filepath):
+        """ Load the statistics from `filepath`, either a binary statistics file or a JSON file (fileVersion <= 2.0). """
+        if StatisticsFile.isStatisticsFile(filepath):
+            self.fromDict(StatisticsFile.read(filepath))
+        else:
+            with open(filepath) as jsonFile:
+                self.fromDict(json.load(jsonFile))
+
 
 bytesPerGiga = 1024. * 1024. * 1024.
 
@@ -298,9 +688,11 @@ class StatisticsThread(threading.Thread):
             self.chunk.saveStatistics()
 
     def run(self):
+        startTime = time.time()
         try:
             while True:
                 self.updateStats()
+                self.statistics.adaptInterval(time.time() - startTime)
                 if self._stopFlag.wait(self.statistics.interval):
                     # stopFlag has been set
                     # update stats one last time and exit main loop
@@ -309,6 +701,8 @@ class StatisticsThread(threading.Thread):
                     return
         except (KeyboardInterrupt, SystemError, GeneratorExit, psutil.NoSuchProcess):
             pass
+        finally:
+            self.statistics.close()
 
     def stopRequest(self):
         """ Request the thread to exit as soon as possible. """
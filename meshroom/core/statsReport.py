@@ -0,0 +1,408 @@
+"""
+Performance report of the computation of a graph, aggregated from the status and statistics of its chunks:
+    - time, CPU and memory usage per node type
+    - critical path through the graph
+    - parallelism efficiency over time (busy vs available cores)
+"""
+
+import datetime
+import html
+import math
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from meshroom.core.node import StatusData
+
+
+@dataclass
+class ChunkMetrics:
+    """ Performance metrics of a NodeChunk. """
+    name: str
+    nodeName: str
+    nodeType: str
+    status: str
+    hostname: str
+    # Start time (seconds since epoch), if the chunk has been computed
+    start: Optional[float]
+    wallTime: float
+    cpuSeconds: float
+    # Peak resident memory of the process tree, in bytes
+    peakRss: int
+    # System-wide disk I/O during the computation, in bytes
+    diskReadBytes: int
+    diskWriteBytes: int
+    nbCores: int
+    # List of (time, busy cores) samples
+    samples: list = field(default_factory=list)
+
+    @property
+    def end(self) -> Optional[float]:
+        return self.start + self.wallTime if self.start is not None else None
+
+
+def _parseDateTime(value: str) -> Optional[float]:
+    try:
+        return datetime.datetime.strptime(value, StatusData.dateTimeFormatting).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _alignedCurve(curve, nbSamples: int) -> list:
+    """ Align `curve` on the last of `nbSamples` samples (curves can miss values). """
+    curve = [_toFloat(v) for v in curve[-nbSamples:]] if nbSamples else []
+    return [math.nan] * (nbSamples - len(curve)) + curve
+
+
+def _toFloat(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _curveDelta(curve) -> int:
+    values = [v for v in (_toFloat(v) for v in curve) if not math.isnan(v)]
+    return int(values[-1] - values[0]) if len(values) > 1 else 0
+
+
+def chunkMetrics(chunk) -> ChunkMetrics:
+    """ Compute the performance metrics of `chunk` from its status and statistics. """
+    status = chunk.status
+    statistics = chunk.statistics
+    times = list(statistics.times)
+    computerCurves = statistics.computer.curves
+    processCurves = statistics.process.curves
+
+    nbCores = len([k for k in computerCurves if k.startswith("cpuUsage.")]) or os.cpu_count() or 1
+
+    # CPU usage of the process tree is measured since the previous sample
+    cpuPercent = _alignedCurve(processCurves.get("cpu_percent", []), len(times))
+    samples = []
+    cpuSeconds = 0.0
+    for index in range(1, len(times)):
+        if math.isnan(cpuPercent[index]):
+            continue
+        busyCores = cpuPercent[index] / 100.0
+        cpuSeconds += busyCores * (times[index] - times[index - 1])
+        samples.append((times[index], busyCores))
+
+    rss = [v for v in (_toFloat(v) for v in processCurves.get("memory_info.rss", [])) if not math.isnan(v)]
+
+    start = _parseDateTime(status.startDateTime)
+    if start is None and times:
+        start = times[0]
+    wallTime = status.elapsedTime
+    if not wallTime and len(times) > 1:
+        wallTime = times[-1] - times[0]
+
+    return ChunkMetrics(
+        name=chunk.name,
+        nodeName=chunk.node.name,
+        nodeType=chunk.node.nodeType,
+        status=status.status.name,
+        hostname=status.hostname,
+        start=start,
+        wallTime=wallTime,
+        cpuSeconds=cpuSeconds,
+        peakRss=int(max(rss, default=0)),
+        diskReadBytes=_curveDelta(computerCurves.get("ioCounters.read_bytes", [])),
+        diskWriteBytes=_curveDelta(computerCurves.get("ioCounters.write_bytes", [])),
+        nbCores=nbCores,
+        samples=samples,
+    )
+
+
+def _efficiency(cpuSeconds: float, coreSeconds: float) -> float:
+    return cpuSeconds / coreSeconds if coreSeconds > 0 else 0.0
+
+
+def nodeTypesMetrics(chunks: list[ChunkMetrics]) -> dict:
+    """ Aggregate the metrics of `chunks` per node type, sorted by decreasing wall time. """
+    perType = defaultdict(lambda: {
+        "nodes": set(), "chunks": 0, "wallTime": 0.0, "cpuSeconds": 0.0, "coreSeconds": 0.0,
+        "peakRss": 0, "diskReadBytes": 0, "diskWriteBytes": 0,
+    })
+    for chunk in chunks:
+        metrics = perType[chunk.nodeType]
+        metrics["nodes"].add(chunk.nodeName)
+        metrics["chunks"] += 1
+        metrics["wallTime"] += chunk.wallTime
+        metrics["cpuSeconds"] += chunk.cpuSeconds
+        metrics["coreSeconds"] += chunk.wallTime * chunk.nbCores
+        metrics["peakRss"] = max(metrics["peakRss"], chunk.peakRss)
+        metrics["diskReadBytes"] += chunk.diskReadBytes
+        metrics["diskWriteBytes"] += chunk.diskWriteBytes
+
+    result = {}
+    for nodeType, metrics in sorted(perType.items(), key=lambda item: item[1]["wallTime"], reverse=True):
+        result[nodeType] = {
+            "nodes": len(metrics["nodes"]),
+            "chunks": metrics["chunks"],
+            "wallTime": metrics["wallTime"],
+            "cpuHours": metrics["cpuSeconds"] / 3600.0,
+            "peakRss": metrics["peakRss"],
+            "diskReadBytes": metrics["diskReadBytes"],
+            "diskWriteBytes": metrics["diskWriteBytes"],
+            "efficiency": _efficiency(metrics["cpuSeconds"], metrics["coreSeconds"]),
+        }
+    return result
+
+
+def nodeDuration(chunks: list[ChunkMetrics]) -> float:
+    """
+    Duration of a node: from the start of its first chunk to the end of its last one,
+    or the sum of its chunks wall time if their start time is unknown.
+    """
+    if chunks and all(c.start is not None for c in chunks):
+        return max(c.end for c in chunks) - min(c.start for c in chunks)
+    return sum(c.wallTime for c in chunks)
+
+
+def criticalPath(graph, nodes, durations: dict) -> tuple[list, float]:
+    """
+    Find the longest path through `nodes`, weighted by their durations.
+
+    Args:
+        graph: the graph containing the nodes.
+        nodes: the nodes, in topological order (see Graph.dfsOnFinish).
+        durations: the duration per node.
+
+    Returns:
+        The nodes of the critical path from the roots, and its duration.
+    """
+    nodesSet = set(nodes)
+    finish = {}
+    previous = {}
+    for node in nodes:
+        inputs = [n for n in graph.getInputNodes(node, recursive=False, dependenciesOnly=True) if n in nodesSet]
+        longestInput = max(inputs, key=lambda n: finish[n], default=None)
+        finish[node] = durations.get(node, 0.0) + (finish[longestInput] if longestInput is not None else 0.0)
+        previous[node] = longestInput
+    if not finish:
+        return [], 0.0
+
+    node = max(nodes, key=lambda n: finish[n])
+    duration = finish[node]
+    path = []
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    return path[::-1], duration
+
+
+def parallelismTimeline(chunks: list[ChunkMetrics], resolution: Optional[float] = None,
+                        maxBuckets: int = 200) -> tuple[list, float]:
+    """
+    Compute the busy and available cores over time.
+    The available cores at a given time are the cores of the hosts computing a chunk at that time.
+
+    Args:
+        chunks: the chunks metrics.
+        resolution: (optional) the duration of a time bucket in seconds; by default, the project time span
+                    is divided in `maxBuckets` buckets.
+        maxBuckets: the number of buckets if no resolution is given.
+
+    Returns:
+        The list of buckets (start time relative to the project start, busy cores, available cores,
+        running chunks) and the overall efficiency (busy / available core-seconds).
+    """
+    computed = [c for c in chunks if c.start is not None and c.wallTime > 0]
+    if not computed:
+        return [], 0.0
+    projectStart = min(c.start for c in computed)
+    projectEnd = max(c.end for c in computed)
+    span = max(projectEnd - projectStart, 1e-6)
+    if resolution is None:
+        resolution = max(span / maxBuckets, 1.0)
+    nbBuckets = int(math.ceil(span / resolution))
+
+    busy = [0.0] * nbBuckets
+    runningChunks = [0] * nbBuckets
+    hostsCores = [dict() for _ in range(nbBuckets)]
+    for chunk in computed:
+        first = int((chunk.start - projectStart) // resolution)
+        # Buckets are half-open intervals
+        last = max(first, min(int(math.ceil((chunk.end - projectStart) / resolution)) - 1, nbBuckets - 1))
+        for bucket in range(first, last + 1):
+            runningChunks[bucket] += 1
+            hostsCores[bucket][chunk.hostname] = max(hostsCores[bucket].get(chunk.hostname, 0), chunk.nbCores)
+        previousTime = chunk.start
+        for sampleTime, busyCores in chunk.samples:
+            # Spread the CPU time measured since the previous sample over the buckets it covers
+            sampleStart = max(previousTime, projectStart)
+            firstBucket = min(int((sampleStart - projectStart) // resolution), nbBuckets - 1)
+            lastBucket = min(int((sampleTime - projectStart) // resolution), nbBuckets - 1)
+            for bucket in range(firstBucket, lastBucket + 1):
+                bucketStart = max(sampleStart, projectStart + bucket * resolution)
+                bucketEnd = sampleTime if bucket == nbBuckets - 1 else \
+                    min(sampleTime, projectStart + (bucket + 1) * resolution)
+                if bucketEnd > bucketStart:
+                    busy[bucket] += busyCores * (bucketEnd - bucketStart)
+            previousTime = sampleTime
+
+    timeline = []
+    busyCoreSeconds = 0.0
+    availableCoreSeconds = 0.0
+    for bucket in range(nbBuckets):
+        availableCores = sum(hostsCores[bucket].values())
+        timeline.append({
+            "time": bucket * resolution,
+            "busyCores": busy[bucket] / resolution,
+            "availableCores": availableCores,
+            "runningChunks": runningChunks[bucket],
+        })
+        busyCoreSeconds += busy[bucket]
+        availableCoreSeconds += availableCores * resolution
+    return timeline, _efficiency(busyCoreSeconds, availableCoreSeconds)
+
+
+def buildReport(graph, nodes=None) -> dict:
+    """
+    Build the performance report of `nodes`, from their chunks status and statistics.
+    Status and statistics are expected to be up-to-date (see Graph.update and Graph.updateStatisticsFromCache).
+
+    Args:
+        graph: the graph.
+        nodes: (optional) the nodes to report, in topological order; all the graph nodes by default.
+
+    Returns:
+        The report, as a JSON-serializable dict.
+    """
+    if nodes is None:
+        nodes, _ = graph.dfsOnFinish()
+    chunksPerNode = {node: [chunkMetrics(chunk) for chunk in node.chunks] for node in nodes}
+    chunks = [c for nodeChunks in chunksPerNode.values() for c in nodeChunks]
+
+    durations = {node: nodeDuration(nodeChunks) for node, nodeChunks in chunksPerNode.items()}
+    path, pathDuration = criticalPath(graph, nodes, durations)
+    timeline, efficiency = parallelismTimeline(chunks)
+
+    computed = [c for c in chunks if c.start is not None]
+    wallTime = (max(c.end for c in computed) - min(c.start for c in computed)) if computed else 0.0
+    cpuSeconds = sum(c.cpuSeconds for c in chunks)
+
+    return {
+        "graph": graph.filepath,
+        "summary": {
+            "nodes": len(nodes),
+            "chunks": len(chunks),
+            "wallTime": wallTime,
+            "computeTime": sum(c.wallTime for c in chunks),
+            "cpuHours": cpuSeconds / 3600.0,
+            "peakRss": max((c.peakRss for c in chunks), default=0),
+            "efficiency": efficiency,
+        },
+        "nodeTypes": nodeTypesMetrics(chunks),
+        "criticalPath": {
+            "duration": pathDuration,
+            "nodes": [{"name": node.name, "nodeType": node.nodeType, "duration": durations[node]} for node in path],
+        },
+        "timeline": timeline,
+        "chunks": [
+            {
+                "name": c.name, "node": c.nodeName, "nodeType": c.nodeType, "status": c.status,
+                "hostname": c.hostname, "wallTime": c.wallTime, "cpuHours": c.cpuSeconds / 3600.0,
+                "peakRss": c.peakRss, "efficiency": _efficiency(c.cpuSeconds, c.wallTime * c.nbCores),
+            } for c in chunks
+        ],
+    }
+
+
+def _formatDuration(seconds: float) -> str:
+    return str(datetime.timedelta(seconds=int(round(seconds))))
+
+
+def _formatBytes(value: float) -> str:
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(value) < 1024 or unit == "TB":
+            return f"{value:.1f} {unit}"
+        value /= 1024.0
+
+
+def reportToText(report: dict) -> str:
+    """ Format the main information of a report as text. """
+    summary = report["summary"]
+    lines = [
+        f"Nodes: {summary['nodes']}, chunks: {summary['chunks']}",
+        f"Wall time: {_formatDuration(summary['wallTime'])}, compute time: {_formatDuration(summary['computeTime'])}",
+        f"CPU hours: {summary['cpuHours']:.2f}, peak RSS: {_formatBytes(summary['peakRss'])}, "
+        f"parallelism efficiency: {summary['efficiency']:.0%}",
+        "",
+        f"{'Node type':<32}{'Nodes':>7}{'Chunks':>8}{'Wall time':>12}{'CPU hours':>11}{'Peak RSS':>12}"
+        f"{'Disk read':>12}{'Disk write':>12}{'Efficiency':>12}",
+    ]
+    for nodeType, m in report["nodeTypes"].items():
+        lines.append(f"{nodeType:<32}{m['nodes']:>7}{m['chunks']:>8}{_formatDuration(m['wallTime']):>12}"
+                     f"{m['cpuHours']:>11.2f}{_formatBytes(m['peakRss']):>12}{_formatBytes(m['diskReadBytes']):>12}"
+                     f"{_formatBytes(m['diskWriteBytes']):>12}{m['efficiency']:>12.0%}")
+    criticalPathReport = report["criticalPath"]
+    lines += ["", f"Critical path ({_formatDuration(criticalPathReport['duration'])}):"]
+    lines += [f"  {n['name']} ({_formatDuration(n['duration'])})" for n in criticalPathReport["nodes"]]
+    return "\n".join(lines)
+
+
+def _timelineSvg(timeline: list, width: int = 800, height: int = 200) -> str:
+    if not timeline:
+        return ""
+    maxTime = timeline[-1]["time"] or 1.0
+    maxCores = max(max(b["availableCores"], b["busyCores"]) for b in timeline) or 1.0
+
+    def points(key):
+        return " ".join(f"{b['time'] / maxTime * width:.1f},{height - b[key] / maxCores * height:.1f}"
+                        for b in timeline)
+
+    return (f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+            f'<polyline fill="none" stroke="#9e9e9e" points="{points("availableCores")}"/>'
+            f'<polyline fill="none" stroke="#2196f3" points="{points("busyCores")}"/></svg>'
+            f'<p>Busy cores (blue) vs available cores (grey), max {maxCores:.0f} cores '
+            f'over {_formatDuration(maxTime)}.</p>')
+
+
+def reportToHtml(report: dict) -> str:
+    """ Format a report as a standalone HTML page. """
+    def table(headers, rows):
+        head = "".join(f"<th>{html.escape(str(h))}</th>" for h in headers)
+        body = "".join("<tr>" + "".join(f"<td>{html.escape(str(v))}</td>" for v in row) + "</tr>" for row in rows)
+        return f"<table><tr>{head}</tr>{body}</table>"
+
+    summary = report["summary"]
+    nodeTypes = table(
+        ["Node type", "Nodes", "Chunks", "Wall time", "CPU hours", "Peak RSS", "Disk read", "Disk write",
+         "Efficiency"],
+        [[nodeType, m["nodes"], m["chunks"], _formatDuration(m["wallTime"]), f"{m['cpuHours']:.2f}",
+          _formatBytes(m["peakRss"]), _formatBytes(m["diskReadBytes"]), _formatBytes(m["diskWriteBytes"]),
+          f"{m['efficiency']:.0%}"] for nodeType, m in report["nodeTypes"].items()])
+    criticalPathTable = table(
+        ["Node", "Node type", "Duration"],
+        [[n["name"], n["nodeType"], _formatDuration(n["duration"])] for n in report["criticalPath"]["nodes"]])
+
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Meshroom performance report</title>
+<style>
+body {{ font-family: sans-serif; }}
+table {{ border-collapse: collapse; margin-bottom: 1em; }}
+th, td {{ border: 1px solid #ccc; padding: 2px 8px; text-align: right; }}
+th:first-child, td:first-child {{ text-align: left; }}
+</style>
+</head>
+<body>
+<h1>Performance report</h1>
+<p>{html.escape(report["graph"] or "")}</p>
+{table(["Nodes", "Chunks", "Wall time", "Compute time", "CPU hours", "Peak RSS", "Efficiency"],
+       [[summary["nodes"], summary["chunks"], _formatDuration(summary["wallTime"]),
+         _formatDuration(summary["computeTime"]), f"{summary['cpuHours']:.2f}", _formatBytes(summary["peakRss"]),
+         f"{summary['efficiency']:.0%}"]])}
+<h2>Node types</h2>
+{nodeTypes}
+<h2>Critical path ({_formatDuration(report["criticalPath"]["duration"])})</h2>
+{criticalPathTable}
+<h2>Parallelism</h2>
+{_timelineSvg(report["timeline"])}
+</body>
+</html>
+"""
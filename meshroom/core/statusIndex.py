@@ -0,0 +1,108 @@
+"""
+Consolidated index of the NodeChunks status files of a cache folder.
+
+When enabled (see MESHROOM_STATUS_INDEX), the content of each status file written in a cache folder is also recorded
+in a SQLite database at the root of this folder, along with the signature of the file.
+Readers can then get the content of all the status files of a graph with a few queries, and only need to stat
+the files to check that the recorded contents are up-to-date.
+
+Status files remain the reference: a record is only used if its signature matches the one of the status file,
+so an index that is outdated (status files written without the index, removed folders...) or unavailable
+only results in reading the status files. Records are refreshed by readers when outdated.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from collections.abc import Iterable
+from contextlib import closing
+from typing import Optional
+
+from meshroom.env import EnvVar
+
+
+class StatusIndex:
+    """ SQLite index of the status files contained in a cache folder. """
+
+    FILENAME = "statusIndex.db"
+    # Time (in seconds) to wait for concurrent writers to release the database
+    TIMEOUT = 5.0
+    # Number of status files queried at once, below the limit of SQLite variables per statement
+    QUERY_BATCH_SIZE = 500
+
+    def __init__(self, cacheDir: str):
+        self._cacheDir = cacheDir
+        self._filepath = os.path.join(cacheDir, self.FILENAME)
+
+    @property
+    def filepath(self) -> str:
+        return self._filepath
+
+    def _key(self, statusFile: str) -> str:
+        return os.path.relpath(statusFile, self._cacheDir).replace(os.sep, "/")
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._filepath, timeout=self.TIMEOUT)
+        connection.execute("CREATE TABLE IF NOT EXISTS status ("
+                           "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, inode INTEGER, "
+                           "mtime REAL, data TEXT)")
+        return connection
+
+    def read(self, statusFiles: Iterable[str]) -> dict[str, tuple[tuple, float, dict]]:
+        """
+        Get the recorded contents of `statusFiles`.
+
+        Returns:
+            The recorded (signature, modification time, data) per status file, for the status files that have a record.
+        """
+        statusFilesPerKey = {self._key(statusFile): statusFile for statusFile in statusFiles}
+        if not statusFilesPerKey or not os.path.exists(self._filepath):
+            return {}
+        keys = list(statusFilesPerKey)
+        rows = []
+        try:
+            with closing(self._connect()) as connection:
+                for i in range(0, len(keys), self.QUERY_BATCH_SIZE):
+                    batch = keys[i:i + self.QUERY_BATCH_SIZE]
+                    rows += connection.execute("SELECT path, mtime_ns, size, inode, mtime, data FROM status "
+                                               f"WHERE path IN ({', '.join('?' * len(batch))})", batch).fetchall()
+        except sqlite3.Error as e:
+            logging.debug(f"Failed to read status index '{self._filepath}': {e}")
+            return {}
+
+        contents = {}
+        for key, mtimeNs, size, inode, mtime, data in rows:
+            statusFile = statusFilesPerKey[key]
+            try:
+                contents[statusFile] = ((mtimeNs, size, inode), mtime, json.loads(data))
+            except ValueError:
+                pass
+        return contents
+
+    def update(self, contents: dict, removed: Iterable[str] = ()):
+        """
+        Record the contents of status files and remove the records of deleted status files, in a single transaction.
+
+        Args:
+            contents: the content per status file to record, as StatusFileContent.
+            removed: the status files to remove from the index.
+        """
+        removed = [(self._key(statusFile),) for statusFile in removed]
+        if not contents and not removed:
+            return
+        rows = [(self._key(statusFile), *content.signature, content.modTime, json.dumps(content.data))
+                for statusFile, content in contents.items()]
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.executemany("INSERT OR REPLACE INTO status VALUES (?, ?, ?, ?, ?, ?)", rows)
+                connection.executemany("DELETE FROM status WHERE path = ?", removed)
+        except sqlite3.Error as e:
+            logging.debug(f"Failed to update status index '{self._filepath}': {e}")
+
+
+def getStatusIndex(cacheDir: str) -> Optional[StatusIndex]:
+    """ Get the status index of `cacheDir`, or None if status indexing is disabled. """
+    if not cacheDir or not EnvVar.get(EnvVar.MESHROOM_STATUS_INDEX):
+        return None
+    return StatusIndex(cacheDir)
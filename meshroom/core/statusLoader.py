@@ -0,0 +1,165 @@
+"""
+Loading of NodeChunks status files from the cache.
+
+Status files of multiple chunks are loaded in bulk: each node internal folder is listed once,
+folders are processed in parallel, and only the status files modified since their last read are parsed.
+When the status index of the cache folder is enabled, up-to-date status files are not parsed but read from the index
+(see meshroom.core.statusIndex).
+"""
+
+import json
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+from meshroom.core.statusIndex import getStatusIndex
+
+
+class StatusFileContent(NamedTuple):
+    """ Content of a status file, along with the signature of the file it has been read from. """
+    # (mtime_ns, size, inode) of the file: status files are renamed into place when written,
+    # so the signature changes on each write
+    signature: tuple
+    # Modification time of the file, in seconds
+    modTime: float
+    # Parsed JSON content
+    data: dict
+
+
+def fileSignature(fileStat: os.stat_result) -> tuple:
+    return (fileStat.st_mtime_ns, fileStat.st_size, fileStat.st_ino)
+
+
+def readStatusFile(statusFile: str, previousContent: Optional[StatusFileContent] = None,
+                   fileStat: Optional[os.stat_result] = None) -> tuple[Optional[StatusFileContent], Optional[Exception]]:
+    """
+    Read a status file, if it has been modified since `previousContent` has been read.
+    Does not modify any NodeChunk, and can therefore be called from any thread.
+
+    Args:
+        statusFile: the path to the status file.
+        previousContent: (optional) the content previously read from this file.
+        fileStat: (optional) the stat of the file if already known.
+
+    Returns:
+        The content of the file (None if the file does not exist or could not be read),
+        and the error raised while reading it if any.
+    """
+    try:
+        if fileStat is None:
+            fileStat = os.stat(statusFile)
+        signature = fileSignature(fileStat)
+        if previousContent is not None and previousContent.signature == signature:
+            return previousContent, None
+        with open(statusFile) as jsonFile:
+            data = json.load(jsonFile)
+        return StatusFileContent(signature, fileStat.st_mtime, data), None
+    except FileNotFoundError:
+        return None, None
+    except Exception as e:
+        return None, e
+
+
+def _readFolderStatusFiles(folder: str, requests: list) -> list:
+    """
+    Read the status files of a folder, listing it once.
+
+    Args:
+        folder: the folder containing the status files.
+        requests: list of (key, status filename, already known contents of the file).
+
+    Returns:
+        The list of (key, content, error).
+    """
+    try:
+        with os.scandir(folder) as it:
+            entries = {entry.name: entry for entry in it}
+    except OSError:
+        entries = {}
+
+    results = []
+    for key, filename, knownContents in requests:
+        entry = entries.get(filename)
+        if entry is None:
+            results.append((key, None, None))
+            continue
+        try:
+            fileStat = entry.stat()
+        except OSError as e:
+            results.append((key, None, e))
+            continue
+        signature = fileSignature(fileStat)
+        previousContent = next((c for c in knownContents if c is not None and c.signature == signature), None)
+        results.append((key, *readStatusFile(entry.path, previousContent, fileStat)))
+    return results
+
+
+def _cacheDir(chunk) -> str:
+    return chunk.node.graph.cacheDir if chunk.node.graph else ""
+
+
+def updateChunksStatusFromCache(chunks, maxWorkers: int = 8):
+    """
+    Update the status of `chunks` from their status files.
+
+    Each internal folder is listed once and folders are processed in a thread pool.
+    Status files are parsed only if they have been modified since their last read,
+    and the chunks status are updated from the calling thread.
+    If enabled, the status index of the cache folder is read once, and refreshed with the outdated records.
+
+    Args:
+        chunks: the NodeChunks to update.
+        maxWorkers: the maximum number of folders processed in parallel.
+    """
+    chunks = list(chunks)
+    chunksPerCacheDir = defaultdict(list)
+    for chunk in chunks:
+        chunksPerCacheDir[_cacheDir(chunk)].append(chunk)
+
+    # Contents recorded in the status index of each cache folder, if enabled
+    statusIndexes = {}
+    indexedContents = {}
+    for cacheDir, cacheDirChunks in chunksPerCacheDir.items():
+        statusIndex = getStatusIndex(cacheDir)
+        if statusIndex is None:
+            continue
+        statusIndexes[cacheDir] = statusIndex
+        for statusFile, content in statusIndex.read(c.statusFile for c in cacheDirChunks).items():
+            indexedContents[statusFile] = StatusFileContent(*content)
+
+    requestsPerFolder = defaultdict(list)
+    for chunk in chunks:
+        statusFile = chunk.statusFile
+        requestsPerFolder[os.path.dirname(statusFile)].append(
+            (chunk, os.path.basename(statusFile), (chunk.statusFileContent, indexedContents.get(statusFile))))
+
+    if not requestsPerFolder:
+        return
+
+    if len(requestsPerFolder) == 1 or maxWorkers <= 1:
+        allResults = [_readFolderStatusFiles(folder, requests) for folder, requests in requestsPerFolder.items()]
+    else:
+        with ThreadPoolExecutor(max_workers=min(maxWorkers, len(requestsPerFolder))) as pool:
+            allResults = list(pool.map(lambda item: _readFolderStatusFiles(*item), requestsPerFolder.items()))
+
+    # Records of the status index to refresh, per cache folder
+    indexUpdates = defaultdict(lambda: ({}, []))
+    for results in allResults:
+        for chunk, content, error in results:
+            if error is not None:
+                logging.debug(f"updateStatusFromCache({chunk.node.name}): Error while loading status file "
+                              f"{chunk.statusFile}: {error}")
+            chunk.setStatusFileContent(content)
+            cacheDir = _cacheDir(chunk)
+            if cacheDir not in statusIndexes:
+                continue
+            indexedContent = indexedContents.get(chunk.statusFile)
+            if content is None and indexedContent is not None:
+                indexUpdates[cacheDir][1].append(chunk.statusFile)
+            elif content is not None and (indexedContent is None or content.signature != indexedContent.signature):
+                indexUpdates[cacheDir][0][chunk.statusFile] = content
+
+    for cacheDir, (contents, removed) in indexUpdates.items():
+        statusIndexes[cacheDir].update(contents, removed)
@@ -6,6 +6,7 @@ import meshroom
 from meshroom.common import BaseObject, DictModel, Property, Signal, Slot
 from meshroom.core.node import Status, Node
 from meshroom.core.graph import Graph
+from meshroom.core.scheduler import ChunkScheduler
 import meshroom.core.graph
 
 
@@ -37,55 +38,10 @@ class TaskThread(Thread):
         """ Consume compute tasks. """
         self._state = State.RUNNING
 
-        stopAndRestart = False
+        scheduler = _TaskScheduler(self)
+        scheduler.run()
 
-        for nId, node in enumerate(self._manager._nodesToProcess):
-
-            # skip already finished/running nodes
-            if node.isFinishedOrRunning():
-                continue
-
-            # if a node does not exist anymore, node.chunks becomes a PySide property
-            try:
-                multiChunks = len(node.chunks) > 1
-            except TypeError:
-                continue
-
-            node.preprocess()
-            for cId, chunk in enumerate(node.chunks):
-                if chunk.isFinishedOrRunning() or not self.isRunning():
-                    continue
-
-                if multiChunks:
-                    logging.info('[{node}/{nbNodes}]({chunk}/{nbChunks}) {nodeName}'.format(
-                        node=nId+1, nbNodes=len(self._manager._nodesToProcess),
-                        chunk=cId+1, nbChunks=len(node.chunks), nodeName=node.nodeType))
-                else:
-                    logging.info('[{node}/{nbNodes}] {nodeName}'.format(
-                        node=nId+1, nbNodes=len(self._manager._nodesToProcess), nodeName=node.nodeType))
-                try:
-                    chunk.process(self.forceCompute)
-                except Exception as e:
-                    if chunk.isStopped():
-                        stopAndRestart = True
-                        break
-                    else:
-                        logging.error(f"Error on node computation: {e}.")
-                        nodesToRemove, _ = self._manager._graph.dfsOnDiscover(startNodes=[node], reverse=True)
-                        # remove following nodes from the task queue
-                        for n in nodesToRemove[1:]:  # exclude current node
-                            try:
-                                self._manager._nodesToProcess.remove(n)
-                            except ValueError:
-                                # Node already removed (for instance a global clear of _nodesToProcess)
-                                pass
-                            n.clearSubmittedChunks()
-            node.postprocess()
-
-            if stopAndRestart:
-                break
-
-        if stopAndRestart:
+        if scheduler.stopAndRestart:
             self._state = State.STOPPED
             self._manager.restartRequested.emit()
         else:
@@ -93,6 +49,59 @@ class TaskThread(Thread):
             self._state = State.DEAD
 
 
+class _TaskScheduler(ChunkScheduler):
+    """
+    ChunkScheduler consuming the nodes to process of a TaskThread's manager.
+    Up to MESHROOM_LOCAL_MAX_JOBS chunks are computed at the same time (see ResourceBudget).
+    """
+    def __init__(self, thread: TaskThread):
+        super().__init__(thread._manager._graph, thread._manager._nodesToProcess, forceCompute=thread.forceCompute)
+        self._thread = thread
+        self.stopAndRestart = False
+
+    def isStopRequested(self):
+        return self.stopAndRestart or not self._thread.isRunning()
+
+    def skipNode(self, node):
+        # skip already finished/running nodes
+        if node.isFinishedOrRunning():
+            return True
+        # if a node does not exist anymore, node.chunks becomes a PySide property
+        try:
+            len(node.chunks)
+        except TypeError:
+            return True
+        return False
+
+    def skipChunk(self, chunk):
+        return chunk.isFinishedOrRunning()
+
+    def onChunkStarted(self, node, chunk):
+        nId = self.nodes.index(node) if node in self.nodes else -1
+        if len(node.chunks) > 1:
+            logging.info('[{node}/{nbNodes}]({chunk}/{nbChunks}) {nodeName}'.format(
+                node=nId+1, nbNodes=len(self.nodes),
+                chunk=chunk.index+1, nbChunks=len(node.chunks), nodeName=node.nodeType))
+        else:
+            logging.info('[{node}/{nbNodes}] {nodeName}'.format(
+                node=nId+1, nbNodes=len(self.nodes), nodeName=node.nodeType))
+
+    def onChunkError(self, node, chunk, error):
+        if chunk.isStopped():
+            self.stopAndRestart = True
+            return
+        logging.error(f"Error on node computation: {error}.")
+        nodesToRemove, _ = self._thread._manager._graph.dfsOnDiscover(startNodes=[node], reverse=True)
+        # remove following nodes from the task queue
+        for n in nodesToRemove[1:]:  # exclude current node
+            try:
+                self._thread._manager._nodesToProcess.remove(n)
+            except ValueError:
+                # Node already removed (for instance a global clear of _nodesToProcess)
+                pass
+            n.clearSubmittedChunks()
+
+
 class TaskManager(BaseObject):
     """
     Manage graph - local and external - computation tasks.
@@ -28,10 +28,11 @@ def checkTemplateVersions(path: str, nodesAlreadyLoaded: bool = False) -> bool:
 
         for _, nodeData in graphData.items():
             nodeType = nodeData["nodeType"]
-            if not meshroom.core.pluginManager.isRegistered(nodeType):
+            nodePlugin = meshroom.core.pluginManager.getRegisteredNodePlugin(nodeType)
+            if nodePlugin is None:
                 return False
 
-            nodeDesc = meshroom.core.pluginManager.getRegisteredNodePlugin(nodeType).nodeDescriptor
+            nodeDesc = nodePlugin.nodeDescriptor
             currentNodeVersion = meshroom.core.nodeVersion(nodeDesc)
 
             inputs = nodeData.get("inputs", {})
@@ -49,6 +49,54 @@ class EnvVar(Enum):
     MESHROOM_REZ_PLUGINS = VarDefinition(str, "", "List of Rez plugins, defined by the package name associated with the plugin's root path. "
                                                   "For example, 'packageA=/path/to/packageA/version/root'.")
     MESHROOM_TEMP_PATH = VarDefinition(str, tempfile.gettempdir(), "Path to the temporary folder.")
+    MESHROOM_LAZY_NODES = VarDefinition(bool, "False",
+                                        "Record the node types of each plugin package in a manifest, and only import "
+                                        "the node modules when nodes of their types are created.")
+
+    MESHROOM_SHARED_CACHE = VarDefinition(str, "",
+                                          "Path to a cache folder shared across projects: computed nodes are "
+                                          "published there, and nodes with the same UID in other projects import "
+                                          "their outputs instead of being recomputed. Disabled if empty.")
+
+    MESHROOM_GRAPH_SNAPSHOT = VarDefinition(bool, "False",
+                                            "Store the parsed content of the loaded graph files in a snapshot next "
+                                            "to them, to speed up the next loads of the same files. Only the "
+                                            "parsing and normalization of the files are skipped: nodes are still "
+                                            "created and validated on each load.")
+    MESHROOM_COLUMNAR_LISTS = VarDefinition(bool, "False",
+                                            "Store the elements of the lists of groups of parameters (e.g. images "
+                                            "viewpoints) in columns, and only create their attributes when accessed.")
+
+    # Core - Local computation
+    MESHROOM_LOCAL_MAX_JOBS = VarDefinition(int, "1", "Maximum number of node chunks computed at the same time on the local machine.")
+    MESHROOM_LOCAL_RESOURCES = VarDefinition(str, "",
+                                             "Resources available for the local concurrent computation, in units of the nodes' "
+                                             "cpu/ram/gpu levels (NORMAL=1, INTENSIVE=2). For example, 'cpu=8,ram=6,gpu=2'. "
+                                             "Resources that are not specified are not limited.")
+
+    MESHROOM_ARGUMENTS_FILE_SIZE = VarDefinition(int, "0",
+                                                 "Size (in characters) above which the list arguments of command line "
+                                                 "nodes supporting it are written to an arguments file in the node "
+                                                 "folder, passed as '@<file>'. Command lines saved in the status files "
+                                                 "are truncated to this size. Disabled if 0.")
+
+    # Core - Statistics
+    MESHROOM_STATS_GPU_SAMPLER = VarDefinition(str, "auto",
+                                               "Backend used to collect the GPU statistics of the computed nodes: "
+                                               "'nvml' (requires pynvml), 'nvidia-smi', 'none', or 'auto' to use the "
+                                               "first available one.")
+    MESHROOM_RUNTIME_HISTORY = VarDefinition(str, "",
+                                             "Path to the database recording the runtime of the computed node chunks, "
+                                             "used to predict the duration of the next computations. "
+                                             "Disabled if empty.")
+
+    # Core - Status
+    MESHROOM_STATUS_INDEX = VarDefinition(bool, "False",
+                                          "Record the nodes status in a database at the root of the cache folder, "
+                                          "in addition to the status files, to load them all in a single read.")
+    MESHROOM_STATUS_INOTIFY = VarDefinition(bool, "True",
+                                            "Use inotify to monitor the status files located on local file systems "
+                                            "(Linux only). Status files are polled otherwise.")
 
 
     @staticmethod
@@ -366,6 +366,43 @@ class ListAttributeAppendCommand(GraphCommand):
         listAttribute.remove(self.index, self.count)
 
 
+class ListAttributeSetValueCommand(GraphCommand):
+    """
+    Set the value of a ListAttribute, only replacing the range of elements which differ.
+    Only this range is recorded to undo the change.
+    """
+    def __init__(self, graph, listAttribute, value, parent=None):
+        super().__init__(graph, parent)
+        assert isinstance(listAttribute, ListAttribute)
+        self.attrName = listAttribute.getFullNameToNode()
+        self.value = value
+        # Replaced range, computed on the first redo
+        self.index = None
+        self.values = []
+        self.oldValues = []
+        self.setText(f"Set Attribute '{self.attrName}'")
+
+    def _attribute(self):
+        if self.graph.attribute(self.attrName) is not None:
+            return self.graph.attribute(self.attrName)
+        return self.graph.internalAttribute(self.attrName)
+
+    def redoImpl(self):
+        listAttribute = self._attribute()
+        if self.index is None:
+            diff = listAttribute.diff(listAttribute.desc.validateValue(self.value))
+            self.value = None
+            if diff is None:
+                return False
+            self.index, count, self.values = diff
+            self.oldValues = [listAttribute.getElementExportValue(i) for i in range(self.index, self.index + count)]
+        listAttribute.replace(self.index, len(self.oldValues), self.values)
+        return True
+
+    def undoImpl(self):
+        self._attribute().replace(self.index, len(self.values), self.oldValues)
+
+
 class ListAttributeRemoveCommand(GraphCommand):
     def __init__(self, graph, attribute, parent=None):
         super().__init__(graph, parent)
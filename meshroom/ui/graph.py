@@ -5,7 +5,6 @@ import os
 import json
 from enum import Enum
 from threading import Thread, Event, Lock
-from multiprocessing.pool import ThreadPool
 from typing import Optional, Union
 from collections.abc import Iterator
 
@@ -30,6 +29,9 @@ from meshroom.core.graphIO import GraphIO
 from meshroom.core.taskManager import TaskManager
 
 from meshroom.core.node import NodeChunk, Node, Status, ExecMode, CompatibilityNode, Position
+from meshroom.core.statusLoader import updateChunksStatusFromCache
+from meshroom.core.fileWatcher import FilesWatcher, getFileLastModTime
+from meshroom.env import EnvVar
 from meshroom.core import submitters, MrNodeType
 from meshroom.ui import commands
 from meshroom.ui.utils import makeProperty
@@ -43,8 +45,8 @@ class PollerRefreshStatus(Enum):
 
 class FilesModTimePollerThread(QObject):
     """
-    Thread responsible for non-blocking polling of last modification times of a list of files.
-    Uses a Python ThreadPool internally to split tasks on multiple threads.
+    Thread responsible for non-blocking monitoring of last modification times of a list of files.
+    Uses a FilesWatcher internally, relying on inotify when available and on adaptive polling otherwise.
     """
     timesAvailable = Signal(list)
 
@@ -52,9 +54,8 @@ class FilesModTimePollerThread(QObject):
         super().__init__(parent)
         self._thread = None
         self._mutex = Lock()
-        self._threadPool = ThreadPool(4)
         self._stopFlag = Event()
-        self._refreshInterval = 5  # refresh interval in seconds
+        self._watcher = FilesWatcher(useInotify=EnvVar.get(EnvVar.MESHROOM_STATUS_INOTIFY))
         self._files = []
         if submitters:
             self._filePollerRefresh = PollerRefreshStatus.MINIMAL_ENABLED
@@ -62,8 +63,7 @@ class FilesModTimePollerThread(QObject):
             self._filePollerRefresh = PollerRefreshStatus.DISABLED
 
     def __del__(self):
-        self._threadPool.terminate()
-        self._threadPool.join()
+        self._watcher.close()
 
     def start(self, files=None):
         """ Start polling thread.
@@ -77,7 +77,7 @@ class FilesModTimePollerThread(QObject):
             # thread already running, return
             return
         self._stopFlag.clear()
-        self._files = files or []
+        self.setFiles(files or self._files)
         self._thread = Thread(target=self.run)
         self._thread.start()
 
@@ -89,29 +89,29 @@ class FilesModTimePollerThread(QObject):
         """
         with self._mutex:
             self._files = files
+        self._watcher.setFiles(files)
 
     def stop(self):
         """ Request polling thread to stop. """
         if not self._thread:
             return
         self._stopFlag.set()
+        self._watcher.wakeup()
         self._thread.join()
         self._thread = None
 
     @staticmethod
     def getFileLastModTime(f):
         """ Return 'mtime' of the file if it exists, -1 otherwise. """
-        try:
-            return os.path.getmtime(f)
-        except OSError:
-            return -1
+        return getFileLastModTime(f)
 
     def run(self):
-        """ Poll watched files for last modification time. """
-        while not self._stopFlag.wait(self._refreshInterval):
-            with self._mutex:
-                files = list(self._files)
-            times = self._threadPool.map(FilesModTimePollerThread.getFileLastModTime, files)
+        """ Wait for changes of the watched files last modification times. """
+        while True:
+            result = self._watcher.waitForChanges(self._stopFlag)
+            if result is None:
+                break
+            files, times = result
             with self._mutex:
                 if files == self._files:
                     self.timesAvailable.emit(times)
@@ -137,7 +137,8 @@ class ChunksMonitor(QObject):
     But when a graph is being computed externally - either via a Submitter or on another machine,
     NodeChunks status files are modified by another instance, potentially outside this machine file system scope.
     Same goes when status files are deleted/modified manually.
-    Thus, for genericity, monitoring is based on regular polling and not file system watching.
+    Thus, for genericity, monitoring relies on file system watching only for local folders, and on regular
+    polling otherwise (see FilesWatcher).
     """
     def __init__(self, chunks=(), parent=None):
         super().__init__(parent)
@@ -201,13 +202,16 @@ class ChunksMonitor(QObject):
             times: the last modification times for currently monitored files.
         """
         newRecords = dict(zip(self.monitoredChunks, times))
+        # update chunks status if last modification time has changed since previous record
+        modifiedChunks = [chunk for chunk, fileModTime in newRecords.items()
+                          if fileModTime != chunk.statusFileLastModTime]
+        if not modifiedChunks:
+            return
+        updateChunksStatusFromCache(modifiedChunks)
         hasChangesAndSuccess = False
-        for chunk, fileModTime in newRecords.items():
-            # update chunk status if last modification time has changed since previous record
-            if fileModTime != chunk.statusFileLastModTime:
-                chunk.updateStatusFromCache()
-                if chunk.status.status == Status.SUCCESS:
-                    hasChangesAndSuccess = True
+        for chunk in modifiedChunks:
+            if chunk.status.status == Status.SUCCESS:
+                hasChangesAndSuccess = True
         if hasChangesAndSuccess:
             chunk.node.loadOutputAttr()
 
@@ -902,6 +906,10 @@ class UIGraph(QObject):
 
     @Slot(Attribute, "QVariant")
     def setAttribute(self, attribute, value):
+        if isinstance(attribute, ListAttribute) and isinstance(value, list) and not attribute.isLink:
+            # Only replace the elements which differ, e.g. when adding images to a CameraInit
+            self.push(commands.ListAttributeSetValueCommand(self._graph, attribute, value))
+            return
         self.push(commands.SetAttributeCommand(self._graph, attribute, value))
 
     @Slot(Attribute)
@@ -37,6 +37,7 @@ FocusScope {
             id: statViewer
             anchors.fill: parent
             source: componentLoader.sourceFile
+            chunk: root.currentChunk
         }
     }
 
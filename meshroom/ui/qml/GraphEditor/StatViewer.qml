@@ -16,6 +16,8 @@ Item {
 
     /// Statistics source file
     property url source
+    /// NodeChunk the statistics file belongs to
+    property var chunk
 
     property var sourceModified: undefined
     property var jsonObject
@@ -78,6 +80,12 @@ Item {
         readSourceFile()
     }
 
+    onChunkChanged: {
+        sourceModified = undefined;
+        resetCharts()
+        readSourceFile()
+    }
+
     function getPropertyWithDefault(prop, name, defaultValue) {
         if (prop.hasOwnProperty(name)) {
             return prop[name]
@@ -94,30 +102,27 @@ Item {
 
     function readSourceFile() {
         // Make sure we are trying to load a statistics file
-        if (!Filepath.urlToString(source).endsWith("statistics"))
+        if (!root.chunk || !Filepath.urlToString(source).endsWith("statistics"))
             return
 
-        var xhr = new XMLHttpRequest
-        xhr.open("GET", source)
-
-        xhr.onreadystatechange = function() {
-            if (xhr.readyState === XMLHttpRequest.DONE && xhr.status == 200) {
-                if (sourceModified === undefined || sourceModified < xhr.getResponseHeader("Last-Modified")) {
-                    try {
-                        root.jsonObject = JSON.parse(xhr.responseText)
-                    } catch(exc) {
-                        console.warning("Failed to parse statistics file: " + source)
-                        root.jsonObject = {}
-                        return
-                    }
-                    resetCharts()
-                    sourceModified = xhr.getResponseHeader("Last-Modified")
-                    root.createCharts()
-                    reloadTimer.restart()
-                }
-            }
+        // Statistics files are binary files that are read through the NodeChunk
+        var statistics = root.chunk.readStatisticsFile()
+        var nbSamples = getPropertyWithDefault(statistics, "times", []).length
+        if (nbSamples > 0 && (sourceModified === undefined || sourceModified !== nbSamples)) {
+            root.jsonObject = statistics
+            resetCharts()
+            sourceModified = nbSamples
+            root.createCharts()
+            reloadTimer.restart()
         }
-        xhr.send()
+    }
+
+    /// Time (in minutes) of the sample at `index` since the first sample: the refresh interval varies over time
+    function sampleTime(index) {
+        var times = jsonObject ? getPropertyWithDefault(jsonObject, "times", []) : []
+        if (index < times.length)
+            return (times[index] - times[0]) / 60.0
+        return index * root.deltaTime
     }
 
     function resetCharts() {
@@ -172,7 +177,7 @@ Item {
                 var step = categories[j].length / displayLength
                 for (var kk = 0; kk < displayLength; kk += step) {
                     var k = Math.floor(kk * step)
-                    lineSerie.append(k * root.deltaTime, categories[j][k])
+                    lineSerie.append(sampleTime(k), categories[j][k])
                 }
             }
             lineSerie.color = colors[j % colors.length]
@@ -198,7 +203,7 @@ Item {
 
         for (var q = 0; q < average.length; q++) {
             average[q] = average[q] / (categories.length)
-            averageLine.append(q * root.deltaTime * stepA, average[q])
+            averageLine.append(sampleTime(Math.floor(q * stepA)), average[q])
         }
 
         averageLine.color = colors[colors.length - 1]
@@ -242,7 +247,7 @@ Item {
             var step = ram.length / displayLength
             for(var ii = 0; ii < displayLength; ii++) {
                 var i = Math.floor(ii * step)
-                ramSerie.append(i * root.deltaTime, ram[i])
+                ramSerie.append(sampleTime(i), ram[i])
             }
         }
         ramSerie.color = colors[10]
@@ -282,11 +287,11 @@ Item {
             var step = gpuUsedMemory.length / displayLength
             for (var ii = 0; ii < displayLength; ii += step) {
                 var i = Math.floor(ii*step)
-                gpuUsedSerie.append(i * root.deltaTime, gpuUsed[i])
+                gpuUsedSerie.append(sampleTime(i), gpuUsed[i])
 
-                gpuUsedMemorySerie.append(i * root.deltaTime, gpuUsedMemory[i] * gpuMemoryRatio)
+                gpuUsedMemorySerie.append(sampleTime(i), gpuUsedMemory[i] * gpuMemoryRatio)
 
-                gpuTemperatureSerie.append(i * root.deltaTime, gpuTemperature[i])
+                gpuTemperatureSerie.append(sampleTime(i), gpuTemperature[i])
                 root.gpuMaxAxis = Math.max(gpuMaxAxis, gpuTemperature[i])
             }
         }
@@ -406,7 +411,7 @@ Item {
                 ValueAxis {
                     id: valueCpuX
                     min: 0
-                    max: root.deltaTime * Math.max(1, root.nbReads)
+                    max: Math.max(root.deltaTime, root.sampleTime(root.nbReads))
                     titleText: "<span style='color: " + textColor + "'>Minutes</span>"
                     color: textColor
                     gridLineColor: textColor
@@ -455,7 +460,7 @@ Item {
                 ValueAxis {
                     id: valueRamX
                     min: 0
-                    max: root.deltaTime * Math.max(1, root.nbReads)
+                    max: Math.max(root.deltaTime, root.sampleTime(root.nbReads))
                     titleText: "<span style='color: " + textColor + "'>Minutes</span>"
                     color: textColor
                     gridLineColor: textColor
@@ -504,7 +509,7 @@ Item {
                 ValueAxis {
                     id: valueGpuX
                     min: 0
-                    max: root.deltaTime * Math.max(1, root.nbReads)
+                    max: Math.max(root.deltaTime, root.sampleTime(root.nbReads))
                     titleText: "<span style='color: " + textColor + "'>Minutes</span>"
                     color: textColor
                     gridLineColor: textColor
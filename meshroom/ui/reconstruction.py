@@ -441,7 +441,7 @@ class Reconstruction(UIGraph):
         for plugin in meshroom.core.pluginManager.getPlugins().values():
             for node in plugin.nodes.values():
                 if node.reload():
-                    nodeTypes.append(node.nodeDescriptor.__name__)
+                    nodeTypes.append(node.name)
 
         self._graph.reloadNodePlugins(nodeTypes)
 
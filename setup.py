@@ -133,6 +133,7 @@ executables = [
     ),
     # Command line
     PlatformExecutable("bin/meshroom_batch"),
+    PlatformExecutable("bin/meshroom_cacheGC"),
     PlatformExecutable("bin/meshroom_compute"),
     PlatformExecutable("bin/meshroom_newNodeType"),
     PlatformExecutable("bin/meshroom_statistics"),
@@ -0,0 +1,71 @@
+import os
+
+from meshroom.core.cacheGC import (CacheSizeIndex, deleteFolders, liveFolders, normPath, scanCache,
+                                   selectGarbage)
+from meshroom.core.node import Status
+
+
+def writeFile(filepath, size, mtime=None):
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, "wb") as f:
+        f.write(b"\0" * size)
+    if mtime is not None:
+        os.utime(os.path.dirname(filepath), (mtime, mtime))
+
+
+def test_cacheGarbageCollection(graphSavedOnDisk):
+    graph = graphSavedOnDisk
+    node = graph.addNewNode("Ls", input="/tmp")
+    graph.save()
+    cacheDir = graph.cacheDir
+    writeFile(os.path.join(node.internalFolder, "output"), 100)
+
+    # Orphaned folders of older versions of the node
+    old = os.path.join(cacheDir, "Ls", "old")
+    writeFile(os.path.join(old, "output"), 1000, mtime=1000)
+    older = os.path.join(cacheDir, "Ls", "older")
+    writeFile(os.path.join(older, "sub", "output"), 2000, mtime=500)
+    os.utime(older, (500, 500))
+    running = os.path.join(cacheDir, "Ls", "running")
+    writeFile(os.path.join(running, "output"), 10)
+    with open(os.path.join(running, "status"), "w") as f:
+        f.write('{"status": "RUNNING"}')
+
+    live = liveFolders([graph.filepath])
+    assert list(live) == [normPath(cacheDir)]
+    assert normPath(node.internalFolder) in live[normPath(cacheDir)]
+
+    folders = {os.path.basename(f.path): f for f in scanCache(cacheDir, live[normPath(cacheDir)])}
+    assert set(folders) == {node._uid, "old", "older", "running"}
+    assert folders[node._uid].live
+    assert folders["old"].size == 1000
+    assert folders["older"].size == 2000
+    assert folders["older"].lastModified == 500
+
+    folders = list(folders.values())
+    # Live folders and folders being computed are never selected
+    assert [os.path.basename(f.path) for f in selectGarbage(folders)] == ["older", "old"]
+    assert [os.path.basename(f.path) for f in selectGarbage(folders, minAge=100, now=1050)] == ["older"]
+    # Size budget: remove the oldest folders first
+    assert [os.path.basename(f.path) for f in selectGarbage(folders, maxSize=2000)] == ["older"]
+    assert [os.path.basename(f.path) for f in selectGarbage(folders, maxSize=500)] == ["older", "old"]
+
+    assert deleteFolders(cacheDir, selectGarbage(folders, maxSize=2000)) == 2000
+    assert not os.path.exists(older)
+    assert set(CacheSizeIndex(cacheDir).read()) == {f"Ls/{node._uid}", "Ls/old", "Ls/running"}
+
+
+def test_cacheSizeIndex(tmp_path):
+    cacheDir = str(tmp_path)
+    folder = os.path.join(cacheDir, "Ls", "uid")
+    writeFile(os.path.join(folder, "output"), 100)
+    assert scanCache(cacheDir)[0].size == 100
+
+    # Files modified in place are not accounted for until their folder changes
+    folderStat = os.stat(folder)
+    writeFile(os.path.join(folder, "output"), 200)
+    os.utime(folder, ns=(folderStat.st_atime_ns, folderStat.st_mtime_ns))
+    assert scanCache(cacheDir)[0].size == 100
+    assert scanCache(cacheDir, useIndex=False)[0].size == 200
+    writeFile(os.path.join(folder, "other"), 50)
+    assert scanCache(cacheDir)[0].size == 250
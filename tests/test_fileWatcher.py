@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+
+import pytest
+
+from meshroom.core.fileWatcher import FilesWatcher, Inotify, isNetworkFileSystem
+
+
+def writeStatusFile(filepath, content):
+    """ Write a file like status files are written: in a temporary file renamed into place. """
+    with open(filepath + ".writing", "w") as f:
+        f.write(content)
+    os.rename(filepath + ".writing", filepath)
+
+
+class WaitThread(threading.Thread):
+    """ Thread waiting for the next changes of a FilesWatcher. """
+    def __init__(self, watcher, stopFlag):
+        super().__init__()
+        self.watcher = watcher
+        self.stopFlag = stopFlag
+        self.result = None
+        self.start()
+
+    def run(self):
+        self.result = self.watcher.waitForChanges(self.stopFlag)
+
+
+@pytest.mark.parametrize("useInotify", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not Inotify.isAvailable(), reason="inotify is not available")),
+])
+def test_filesWatcher(tmp_path, useInotify):
+    folder = str(tmp_path / "node")
+    statusFile = os.path.join(folder, "status")
+    watcher = FilesWatcher(minInterval=0.05, maxInterval=0.2, useInotify=useInotify)
+    stopFlag = threading.Event()
+    try:
+        watcher.setFiles([statusFile])
+        # Changing the files gives their current modification times
+        assert watcher.waitForChanges(stopFlag) == ([statusFile], [-1])
+        # Folders that do not exist yet are polled
+        assert watcher.polledFolders == {folder}
+
+        thread = WaitThread(watcher, stopFlag)
+        time.sleep(0.1)
+        os.makedirs(folder)
+        writeStatusFile(statusFile, "a")
+        thread.join(5)
+        assert thread.result == ([statusFile], [os.path.getmtime(statusFile)])
+        if useInotify:
+            assert watcher.watchedFolders == {folder}
+            assert not watcher.polledFolders
+
+        # Other files of the folder do not trigger any change
+        thread = WaitThread(watcher, stopFlag)
+        writeStatusFile(os.path.join(folder, "log"), "log")
+        time.sleep(0.3)
+        assert thread.is_alive()
+        writeStatusFile(statusFile, "b")
+        thread.join(5)
+        assert thread.result == ([statusFile], [os.path.getmtime(statusFile)])
+
+        thread = WaitThread(watcher, stopFlag)
+        os.remove(statusFile)
+        thread.join(5)
+        assert thread.result == ([statusFile], [-1])
+
+        # Setting the stop flag interrupts the wait
+        thread = WaitThread(watcher, stopFlag)
+        stopFlag.set()
+        watcher.wakeup()
+        thread.join(5)
+        assert not thread.is_alive()
+        assert thread.result is None
+    finally:
+        stopFlag.set()
+        watcher.wakeup()
+        watcher.close()
+
+
+def test_networkFileSystem():
+    mountPoints = [("/mnt/share/local", "ext4"), ("/mnt/share", "nfs4"), ("/mnt/fuse", "fuse.sshfs"), ("/", "ext4")]
+    assert isNetworkFileSystem("/mnt/share/project", mountPoints)
+    assert not isNetworkFileSystem("/mnt/share/local/project", mountPoints)
+    assert isNetworkFileSystem("/mnt/fuse", mountPoints)
+    assert not isNetworkFileSystem("/mnt/shared", mountPoints)
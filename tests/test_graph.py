@@ -1,4 +1,7 @@
-from meshroom.core.graph import Graph
+import sys
+
+from meshroom.core.exception import StopBranchVisit
+from meshroom.core.graph import Graph, GraphModification, Visitor
 
 
 def test_depth():
@@ -115,6 +118,66 @@ def test_depth_diamond_graph2():
     assert len(edges) == 1
 
 
+def test_depth_update_on_topology_change():
+    graph = Graph("Tests tasks depth")
+
+    tA = graph.addNewNode("Ls", input="/tmp")
+    tB = graph.addNewNode("AppendText", inputText="echo B")
+    tC = graph.addNewNode("AppendText", inputText="echo C")
+    tD = graph.addNewNode("AppendFiles")
+
+    graph.addEdges(
+        (tA.output, tB.input),
+        (tB.output, tC.input),
+        (tA.output, tD.input),
+        (tC.output, tD.input2),
+    )
+    assert tD.depth == 3
+    assert tD.minDepth == 1
+
+    # Removing an edge only updates the depths of the following nodes
+    graph.removeEdge(tC.input)
+    assert tC.depth == 0
+    assert tD.depth == 1
+    assert tB.depth == 1
+
+    graph.addEdge(tB.output, tC.input)
+    assert tD.depth == 3
+
+    graph.removeNode(tB.name)
+    assert tC.depth == 0
+    assert tD.depth == 1
+    assert tD.minDepth == 1
+    assert graph._topology.leafNodes() == {tD}
+    assert graph._topology.rootNodes() == {tA, tC}
+
+
+def test_mark_nodes_dirty():
+    graph = Graph("Tests dirty nodes")
+
+    tA = graph.addNewNode("Ls", input="/tmp")
+    tB = graph.addNewNode("AppendText", inputText="echo B")
+    tC = graph.addNewNode("AppendText", inputText="echo C")
+
+    graph.addEdges(
+        (tA.output, tB.input),
+        (tB.output, tC.input),
+    )
+    assert not any(node.dirty for node in graph.nodes)
+
+    graph.markNodesDirty(tB)
+    assert not tA.dirty
+    assert tB.dirty and tC.dirty
+
+    # The visit stops on already dirty nodes
+    tC.dirty = False
+    graph.markNodesDirty(tB)
+    assert not tC.dirty
+
+    graph.update()
+    assert not any(node.dirty for node in graph.nodes)
+
+
 def test_transitive_reduction():
     graph = Graph("Tests tasks depth")
 
@@ -151,8 +214,8 @@ def test_transitive_reduction():
                     ]
     assert set(flowEdgesRes) == set(flowEdges)
 
-    assert len(graph._nodesMinMaxDepths) == len(graph.nodes)
-    for node, (_, maxDepth) in graph._nodesMinMaxDepths.items():
+    assert len(graph._topology._depths) == len(graph.nodes)
+    for node, (_, maxDepth) in graph._topology._depths.items():
         assert node.depth == maxDepth
 
 
@@ -278,3 +341,77 @@ def test_duplicate_nodes():
     assert nMap[n2][0].input.getLinkParam() == nMap[n1][0].output
     assert nMap[n3][0].input.getLinkParam() == nMap[n1][0].output
     assert nMap[n3][0].input2.getLinkParam() == nMap[n2][0].output
+
+
+def test_edges_index():
+    graph = Graph("Tests edges index")
+
+    tA = graph.addNewNode("Ls", input="/tmp")
+    tB = graph.addNewNode("AppendText", inputText="echo B")
+    tC = graph.addNewNode("AppendText", inputText="echo C")
+
+    graph.addEdges(
+        (tA.output, tB.input),
+        (tA.output, tC.input),
+        # Link between input attributes: not a dependency
+        (tB.inputText, tC.inputText),
+    )
+
+    assert tA.output.hasOutputConnections
+    assert not tB.output.hasOutputConnections
+    assert {edge.dst for edge in tA.output.getOutputConnections()} == {tB.input, tC.input}
+    assert [edge.src for edge in tC.input.getInputConnections()] == [tA.output]
+    assert len(graph.nodeOutEdges(tA)) == 2
+    assert len(graph.nodeInEdges(tC)) == 2
+
+    assert graph.getInputNodes(tC, recursive=False, dependenciesOnly=False) == {tA, tB}
+    assert graph.getInputNodes(tC, recursive=False, dependenciesOnly=True) == {tA}
+    assert graph.getRootNodes(dependenciesOnly=True) == {tA}
+    assert graph.getLeafNodes(dependenciesOnly=True) == {tB, tC}
+    assert graph.getLeafNodes(dependenciesOnly=False) == {tC}
+
+    # Indexes and cached views are updated on edges changes
+    graph.removeEdge(tC.input)
+    assert not tC.input.getInputConnections()
+    assert [edge.dst for edge in tA.output.getOutputConnections()] == [tB.input]
+    assert graph.getInputNodes(tC, recursive=False, dependenciesOnly=True) == set()
+    assert graph.getRootNodes(dependenciesOnly=True) == {tA, tC}
+
+    graph.removeNode(tB.name)
+    assert not tA.output.hasOutputConnections
+    assert not graph.nodeInEdges(tC)
+    assert graph.getLeafNodes(dependenciesOnly=False) == {tA, tC}
+
+
+def test_dfs_long_chain():
+    graph = Graph("Tests long chain")
+    nbNodes = sys.getrecursionlimit() + 100
+
+    with GraphModification(graph):
+        nodes = [graph.addNewNode("Ls", input="/tmp")]
+        for _ in range(nbNodes - 1):
+            node = graph.addNewNode("AppendText", inputText="echo")
+            graph.addEdge(nodes[-1].output, node.input)
+            nodes.append(node)
+
+    assert nodes[-1].depth == nbNodes - 1
+
+    finishedNodes, edges = graph.dfsOnFinish(startNodes=[nodes[-1]])
+    assert finishedNodes == nodes
+    assert len(edges) == nbNodes - 1
+
+    discoveredNodes, _ = graph.dfsOnDiscover(startNodes=[nodes[0]], reverse=True)
+    assert discoveredNodes == nodes
+
+    # Generic visit, stopping branches on a node
+    visitor = Visitor(reverse=False, dependenciesOnly=True)
+    visited = []
+
+    def discoverVertex(vertex, graph):
+        visited.append(vertex)
+        if vertex is nodes[10]:
+            raise StopBranchVisit()
+
+    visitor.discoverVertex = discoverVertex
+    graph.dfs(visitor, startNodes=[nodes[-1]])
+    assert visited == nodes[:9:-1]
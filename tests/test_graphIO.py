@@ -1,8 +1,10 @@
 import json
 from textwrap import dedent
 
+import pytest
+
 from meshroom.core import desc
-from meshroom.core.graph import Graph
+from meshroom.core.graph import Graph, loadGraph
 from meshroom.core.node import CompatibilityIssue
 
 from .utils import registeredNodeTypes, overrideNodeTypeVersion
@@ -364,3 +366,41 @@ class TestImportGraphContentFromMinimalGraphData:
             }
             """)
             graph._deserialize(json.loads(sampleGraphContent))
+
+
+def test_loadUpstreamNodes(graphSavedOnDisk):
+    #      / B \
+    #  A -      - D    E
+    #      \ C /
+    graph = graphSavedOnDisk
+    nodeA = graph.addNewNode("Ls", input="/tmp")
+    nodeB = graph.addNewNode("AppendText", inputText="echo B")
+    nodeC = graph.addNewNode("AppendText", inputText="echo C")
+    nodeD = graph.addNewNode("AppendFiles")
+    nodeE = graph.addNewNode("Ls", input="/tmp")
+    graph.addEdges(
+        (nodeA.output, nodeB.input),
+        (nodeA.output, nodeC.input),
+        (nodeB.output, nodeD.input),
+        (nodeC.output, nodeD.input2),
+    )
+    graph.save()
+
+    partialGraph = loadGraph(graph.filepath, upstreamOf=[nodeB.name])
+    assert {node.name for node in partialGraph.nodes} == {nodeA.name, nodeB.name}
+    assert partialGraph.node(nodeB.name)._uid == nodeB._uid
+    assert partialGraph.node(nodeB.name).input.linkParam == partialGraph.node(nodeA.name).output
+
+    partialGraph = loadGraph(graph.filepath, upstreamOf=[nodeD.name])
+    assert {node.name for node in partialGraph.nodes} == {nodeA.name, nodeB.name, nodeC.name, nodeD.name}
+    assert partialGraph.node(nodeD.name)._uid == nodeD._uid
+
+    # A partial graph cannot overwrite the graph file
+    with pytest.raises(RuntimeError):
+        partialGraph.save()
+
+    # Once cleared, the graph content is not partial anymore
+    partialGraph.clear()
+    partialGraph.addNewNode("Ls", input="/tmp")
+    partialGraph.save(graph.filepath)
+    partialGraph.save()
@@ -0,0 +1,57 @@
+import json
+import os
+from unittest.mock import patch
+
+from meshroom.core import graph as graphModule
+from meshroom.core.graph import loadGraph
+from meshroom.core.graphSnapshot import snapshotFilepath
+
+from .utils import overrideNodeTypeVersion
+
+
+def test_graphSnapshot(graphSavedOnDisk, monkeypatch):
+    monkeypatch.setenv("MESHROOM_GRAPH_SNAPSHOT", "1")
+    graph = graphSavedOnDisk
+    nodeA = graph.addNewNode("Ls", input="/tmp")
+    nodeB = graph.addNewNode("AppendText", inputText="echo B")
+    graph.addEdge(nodeA.output, nodeB.input)
+    graph.save()
+    filepath = graph.filepath
+
+    loaded = loadGraph(filepath)
+    assert os.path.exists(snapshotFilepath(filepath))
+
+    # The snapshot is loaded instead of the graph file
+    with patch.object(graphModule.json, "load", wraps=json.load) as jsonLoad:
+        reloaded = loadGraph(filepath)
+        assert jsonLoad.call_count == 0
+    assert reloaded.serialize() == loaded.serialize()
+    assert reloaded.node(nodeB.name).input.linkParam == reloaded.node(nodeA.name).output
+
+    # Snapshots are not used once the node types used in the file are upgraded
+    with overrideNodeTypeVersion(nodeA.nodeDesc.__class__, "99.0"):
+        with patch.object(graphModule.json, "load", wraps=json.load) as jsonLoad:
+            loadGraph(filepath)
+            assert jsonLoad.call_count == 1
+
+    # Modified files are parsed again
+    graph.removeNode(nodeB.name)
+    graph.save()
+    with patch.object(graphModule.json, "load", wraps=json.load) as jsonLoad:
+        reloaded = loadGraph(filepath)
+        assert jsonLoad.call_count == 1
+    assert reloaded.node(nodeB.name) is None
+
+
+def test_graphSnapshotOldFileVersion(tmp_path, monkeypatch):
+    monkeypatch.setenv("MESHROOM_GRAPH_SNAPSHOT", "1")
+    filepath = str(tmp_path / "old.mg")
+    with open(filepath, "w") as f:
+        json.dump({
+            "header": {"fileVersion": "1.1", "nodesVersions": {}},
+            "graph": {"Ls_1": {"nodeType": "Ls", "uids": {"0": "abcdef"}, "inputs": {"input": "/tmp"},
+                               "internalFolder": "{cache}/{nodeType}/{uid0}/"}},
+        }, f)
+    for _ in range(2):
+        graph = loadGraph(filepath)
+        assert graph.node("Ls_1").internalFolder.endswith(f"Ls/{graph.node('Ls_1')._uid}/")
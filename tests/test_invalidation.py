@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 # coding:utf-8
+from unittest.mock import patch
+
 from meshroom.core.graph import Graph
+from meshroom.core.node import Node
 from meshroom.core import desc
 
 from .utils import registerNodeDesc
@@ -63,3 +66,55 @@ def test_inputLinkInvalidation():
     graph.addEdges((n1.input, n2.input))
     assert n1.input.uid() == n2.input.uid()
     assert n1.output.value == n2.output.value
+
+
+def test_invalidationOnlyUpdatesDownstreamNodes():
+    graph = Graph("")
+    n1 = graph.addNewNode("SampleNode", input="/tmp")
+    n2 = graph.addNewNode("SampleNode")
+    n3 = graph.addNewNode("SampleNode", input="/tmp/other")
+    graph.addEdges((n1.output, n2.input))
+
+    n3Uid = n3._uid
+    n2Uid = n2._uid
+
+    with patch.object(Node, "updateInternals", autospec=True, side_effect=Node.updateInternals) as updateInternals:
+        n1.input.value = "/a/path"
+    # Only the modified node and the following ones are updated
+    assert [call.args[0] for call in updateInternals.call_args_list] == [n1, n2]
+    assert n2._uid != n2Uid
+    assert n3._uid == n3Uid
+
+
+def test_uidMemoization():
+    graph = Graph("")
+    n1 = graph.addNewNode("SampleNode", input="1")
+    uid = n1.input.uid()
+    assert n1.input.uid() == uid
+
+    n1.input.value = "2"
+    assert n1.input.uid() != uid
+    n1.input.value = "1"
+    assert n1.input.uid() == uid
+
+
+def test_duplicatesUpdate():
+    graph = Graph("")
+    n1 = graph.addNewNode("SampleNode", input="/tmp")
+    n2 = graph.addNewNode("SampleNode", input="/tmp")
+    n3 = graph.addNewNode("SampleNode", input="/tmp/other")
+
+    assert n1.hasDuplicates and n2.hasDuplicates
+    assert list(n1.duplicates) == [n2]
+    assert not n3.hasDuplicates
+
+    n3.input.value = "/tmp"
+    assert set(n1.duplicates) == {n2, n3}
+    assert set(n3.duplicates) == {n1, n2}
+
+    n1.input.value = "/tmp/other"
+    assert not n1.hasDuplicates
+    assert list(n2.duplicates) == [n3]
+
+    graph.removeNode(n3.name)
+    assert not n2.hasDuplicates
@@ -1,4 +1,7 @@
+import pytest
+
 from meshroom.core import desc
+from meshroom.core.attribute import ListColumns
 from meshroom.core.graph import Graph
 
 from .utils import registerNodeDesc, unregisterNodeDesc
@@ -15,6 +18,38 @@ class NodeWithListAttribute(desc.Node):
     ]
 
 
+class NodeWithListOfGroups(desc.Node):
+    inputs = [
+        desc.ListAttribute(
+            name="viewpoints",
+            label="Viewpoints",
+            description="ListAttribute of GroupAttributes.",
+            elementDesc=desc.GroupAttribute(
+                name="viewpoint", label="Viewpoint", description="", joinChar=":", groupDesc=[
+                    desc.IntParam(name="viewId", label="View Id", description="", value=-1),
+                    desc.File(name="path", label="Path", description="", value=""),
+                    desc.FloatParam(name="focal", label="Focal", description="", value=1.0,
+                                    enabled=lambda node: node.input.value != "noFocal"),
+                    desc.BoolParam(name="valid", label="Valid", description="", value=True),
+                ]),
+        ),
+        desc.File(
+            name="input",
+            label="Input",
+            description="",
+            value="",
+        ),
+    ]
+    outputs = [
+        desc.File(
+            name="output",
+            label="Output",
+            description="",
+            value="{nodeCacheFolder}",
+        ),
+    ]
+
+
 class TestListAttribute:
 
     @classmethod
@@ -62,3 +97,168 @@ class TestListAttribute:
 
         assert nodeB.listInput.at(0).node == nodeA
         assert nodeB.listInput.index(nodeB.listInput.at(0)) == 0
+
+    def test_elementIndexAndFullName(self):
+        graph = Graph("")
+        node = graph.addNewNode(NodeWithListAttribute.__name__)
+        node.listInput.extend(["A", "B", "C"])
+        elementB, elementC = node.listInput.at(1), node.listInput.at(2)
+        assert node.listInput.index(elementC) == 2
+        assert elementC.getFullName() == "listInput[2]"
+
+        # Indexes and full names follow the insertions and removals
+        node.listInput.insert(0, "Z")
+        assert node.listInput.index(elementC) == 3
+        assert elementC.getFullName() == "listInput[3]"
+        node.listInput.remove(0, 2)
+        assert node.listInput.index(elementB) == 0
+        assert elementC.getFullNameToNode() == f"{node.name}.listInput[1]"
+
+        removed = node.listInput.at(0)
+        node.listInput.remove(0)
+        with pytest.raises(ValueError):
+            node.listInput.index(removed)
+
+
+class TestColumnarListAttribute:
+
+    VIEWPOINTS = [{"viewId": i, "path": f"/images/{i}.jpg", "focal": 0.5 * i} for i in range(5)]
+
+    @classmethod
+    def setup_class(cls):
+        registerNodeDesc(NodeWithListOfGroups)
+
+    @classmethod
+    def teardown_class(cls):
+        unregisterNodeDesc(NodeWithListOfGroups)
+
+    def createNode(self, monkeypatch, columnar):
+        monkeypatch.setenv("MESHROOM_COLUMNAR_LISTS", "1" if columnar else "0")
+        graph = Graph("")
+        node = graph.addNewNode(NodeWithListOfGroups.__name__, viewpoints=self.VIEWPOINTS)
+        assert (node.viewpoints._columns is not None) == columnar
+        return graph, node
+
+    def test_sameValuesAsAttributes(self, monkeypatch):
+        _, reference = self.createNode(monkeypatch, columnar=False)
+        _, node = self.createNode(monkeypatch, columnar=True)
+
+        assert len(node.viewpoints) == 5
+        assert node.viewpoints.getExportValue() == reference.viewpoints.getExportValue()
+        assert node.viewpoints.getPrimitiveValue(exportDefault=False) == \
+            reference.viewpoints.getPrimitiveValue(exportDefault=False)
+        assert node.viewpoints.getValueStr() == reference.viewpoints.getValueStr()
+        assert node.viewpoints.uid() == reference.viewpoints.uid()
+        assert node._uid == reference._uid
+        # No element has been created
+        assert node.viewpoints._columns.elements == [None] * 5
+
+    def test_elementsCreatedOnDemand(self, monkeypatch):
+        _, reference = self.createNode(monkeypatch, columnar=False)
+        _, node = self.createNode(monkeypatch, columnar=True)
+        uid = node._uid
+
+        element = node.viewpoints.at(2)
+        assert node.viewpoints.at(2) is element
+        assert node.viewpoints._columns.elements.count(None) == 4
+        assert element.viewId.value == 2
+        assert element.path.getFullNameToNode() == f"{node.name}.viewpoints[2].path"
+        assert node.attribute("viewpoints[2].path") is element.path
+
+        # Created elements hold their values
+        element.focal.value = 3.0
+        reference.viewpoints.at(2).focal.value = 3.0
+        assert node.viewpoints.getExportValue() == reference.viewpoints.getExportValue()
+        assert node._uid == reference._uid != uid
+
+        # Accessing the value creates the remaining elements
+        assert [v.viewId.value for v in node.viewpoints.value] == list(range(5))
+        assert node.viewpoints._columns is None
+        assert node.viewpoints.at(2) is element
+
+    def test_modifications(self, monkeypatch):
+        graph, node = self.createNode(monkeypatch, columnar=True)
+        node.viewpoints.remove(1, 2)
+        node.viewpoints.insert(0, {"viewId": 10})
+        node.viewpoints.append([11, "/images/11.jpg", 2.0, False])
+        assert [v["viewId"] for v in node.viewpoints.getExportValue()] == [10, 0, 3, 4, 11]
+        assert node.viewpoints.getExportValue()[0] == {"viewId": 10, "path": "", "focal": 1.0, "valid": True}
+        assert node.viewpoints._columns is not None
+
+        # Links to the children of the elements are only supported by the created elements
+        other = graph.addNewNode(NodeWithListOfGroups.__name__)
+        node.viewpoints.append({"path": "{" + f"{other.name}.output" + "}"})
+        assert node.viewpoints._columns is None
+        assert node.viewpoints.at(5).path.isLink
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_childrenUidCache(self, monkeypatch, columnar):
+        graph, node = self.createNode(monkeypatch, columnar)
+        _, reference = self.createNode(monkeypatch, columnar=False)
+        viewpoints = node.viewpoints
+        uid = viewpoints.uid()
+        assert viewpoints._childrenUidCache is not None
+
+        # Changing a child invalidates the UIDs cached by its parents
+        element = viewpoints.at(1)
+        element.uid()
+        element.focal.value = 5.0
+        reference.viewpoints.at(1).focal.value = 5.0
+        assert viewpoints.uid() == reference.viewpoints.uid() != uid
+
+        # The cached UID is not used if the enabled children change
+        node.input.value = "noFocal"
+        reference.input.value = "noFocal"
+        assert viewpoints.uid() == reference.viewpoints.uid()
+
+        # UIDs depending on linked attributes are not cached
+        other = graph.addNewNode(NodeWithListOfGroups.__name__)
+        graph.addEdge(other.output, element.path)
+        linkedUid = viewpoints.uid()
+        assert viewpoints._childrenUidCache is None
+        other.input.value = "/other"
+        assert viewpoints.uid() != linkedUid
+        graph.removeEdge(element.path)
+        assert viewpoints.uid() == reference.viewpoints.uid()
+        assert viewpoints._childrenUidCache is not None
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_setValueKeepsElements(self, monkeypatch, columnar):
+        graph, node = self.createNode(monkeypatch, columnar)
+        viewpoints = node.viewpoints
+        first, last = viewpoints.at(0), viewpoints.at(4)
+        values = viewpoints.getExportValue()
+        added = [{"viewId": i, "path": f"/images/{i}.jpg", "focal": 1.0, "valid": True} for i in (5, 6)]
+        newValues = values + added
+        assert viewpoints.diff(values) is None
+        assert viewpoints.diff(newValues) == (5, 0, added)
+
+        # Setting the value only creates the new elements, with a single notification
+        notifications = []
+
+        def onValueChanged():
+            notifications.append(len(viewpoints))
+
+        viewpoints.valueChanged.connect(onValueChanged)
+        viewpoints.value = newValues
+        assert len(notifications) == 1
+        assert viewpoints.at(0) is first and viewpoints.at(4) is last
+        assert [v["viewId"] for v in viewpoints.getExportValue()] == list(range(7))
+        if columnar:
+            assert viewpoints._columns.elements.count(None) == 5
+
+        # Only the range of elements which differ is replaced
+        newValues[2] = {**newValues[2], "viewId": 20}
+        assert viewpoints.diff(newValues) == (2, 1, [newValues[2]])
+        viewpoints.replace(2, 3, [{"viewId": 20}, {"viewId": 21}])
+        assert len(notifications) == 2
+        assert [v["viewId"] for v in viewpoints.getExportValue()] == [0, 1, 20, 21, 5, 6]
+        assert viewpoints.at(0) is first
+
+
+def test_columnsSupport():
+    assert ListColumns.supports(NodeWithListOfGroups.inputs[0].elementDesc)
+    assert not ListColumns.supports(NodeWithListAttribute.inputs[0].elementDesc)
+    assert not ListColumns.supports(desc.GroupAttribute(
+        name="group", label="", description="",
+        groupDesc=[desc.ChoiceParam(name="choice", label="", description="", value="a", values=["a", "b"])]))
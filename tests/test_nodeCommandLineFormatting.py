@@ -1,8 +1,15 @@
 #!/usr/bin/env python
 # coding:utf-8
 
+import os
+import shlex
+import threading
+
+import pytest
+
 from meshroom.core.graph import Graph
 from meshroom.core import desc
+from meshroom.core.desc.node import truncateCommandLine
 
 from .utils import registerNodeDesc, unregisterNodeDesc
 
@@ -101,6 +108,49 @@ class NodeWithAttributesNeedingFormatting(desc.Node):
     ]
 
 
+class CommandLineNodeWithList(desc.CommandLineNode):
+    commandLine = "program {allParams}"
+    supportsArgumentsFile = True
+
+    inputs = [
+        desc.ListAttribute(
+            name="images",
+            label="Images",
+            description="List of images.",
+            elementDesc=desc.File(name="image", label="Image", description="", value=""),
+        ),
+        desc.File(
+            name="input",
+            label="Input File",
+            description="An input file.",
+            value="",
+        ),
+    ]
+
+    outputs = [
+        desc.File(
+            name="output",
+            label="Output",
+            description="Output file.",
+            value="{nodeCacheFolder}/output",
+        ),
+    ]
+
+
+class NodeWithUnresolvedVariables(desc.CommandLineNode):
+    commandLine = "program {allParams}"
+
+    inputs = [
+        desc.StringParam(name="s", label="String", description="", value="a {foo} b"),
+        desc.File(name="input", label="Input File", description="", value="/in"),
+    ]
+
+    outputs = [
+        desc.File(name="output", label="Output", description="", value="{nodeCacheFolder}/{unknownVar}"),
+        desc.File(name="output2", label="Output 2", description="", value="{nodeCacheFolder}/out2"),
+    ]
+
+
 class TestCommandLineFormatting:
 
     @classmethod
@@ -187,3 +237,98 @@ class TestCommandLineFormatting:
 
         assert node.secondGroup.getValueStr() == '"False,second_value,3.0"'
         assert node._cmdVars["secondGroupValue"] == 'False,second_value,3.0'
+
+    def test_lazyCommandVariables(self):
+        graph = Graph("")
+        node = graph.addNewNode("NodeWithAttributesNeedingFormatting", images=["a"])
+
+        # Variables are evaluated when they are used, and memoized
+        assert "images" not in node._cmdVars
+        assert node._cmdVars["imagesValue"] == "a"
+        assert node._cmdVars["images"] == '--images "a"'
+        assert "method" not in node._cmdVars
+        assert '--images "a"' in node._cmdVars["allParams"]
+        assert node._cmdVars["method"] == '--method "MethodC"'
+        with pytest.raises(KeyError):
+            node._cmdVars["unknown"]
+
+        # They are evaluated again when the node is updated
+        node.images.append("b")
+        assert node._cmdVars["imagesValue"] == "a b"
+        assert '--images "a" "b"' in node._cmdVars["allParams"]
+
+
+def test_argumentsFile(graphSavedOnDisk, monkeypatch):
+    registerNodeDesc(CommandLineNodeWithList)
+    try:
+        images = [f"/images/image {i}.jpg" for i in range(20)]
+        node = graphSavedOnDisk.addNewNode(CommandLineNodeWithList.__name__, images=images, input="/input")
+        chunk = node.chunks[0]
+        os.makedirs(os.path.dirname(chunk.argumentsFile), exist_ok=True)
+        fullCmd = node.nodeDesc.commandLine.format_map(node.nodeDesc.writeArgumentsFile(chunk))
+        assert images[0] in fullCmd
+
+        # Large list arguments are passed by reference to the arguments file
+        monkeypatch.setenv("MESHROOM_ARGUMENTS_FILE_SIZE", "300")
+        cmd = node.nodeDesc.commandLine.format_map(node.nodeDesc.writeArgumentsFile(chunk))
+        assert shlex.split(cmd) == ["program", f"@{chunk.argumentsFile}", "--input", "/input",
+                                    "--output", node.output.value]
+        with open(chunk.argumentsFile) as f:
+            assert f.read().splitlines() == ["--images"] + images
+        assert node._cmdVars["images"] in fullCmd
+
+        # Command lines saved in the status files are truncated
+        assert truncateCommandLine(cmd) == cmd
+        assert truncateCommandLine(fullCmd) == f"{fullCmd[:300]}... ({len(fullCmd)} characters)"
+    finally:
+        unregisterNodeDesc(CommandLineNodeWithList)
+
+
+def test_unresolvedCommandVariables():
+    registerNodeDesc(NodeWithUnresolvedVariables)
+    try:
+        graph = Graph("")
+        node = graph.addNewNode(NodeWithUnresolvedVariables.__name__)
+        # Unknown variables are left as is
+        assert node.s.getEvalValue() == "a {foo} b"
+        node.s.value = "{sValue}"
+        assert node.s.getEvalValue() == "{sValue}"
+        assert node._cmdVars["s"] == '--s "{sValue}"'
+
+        # Outputs evaluated after an invalid expression are part of the command line
+        cmd = node.nodeDesc.commandLine.format_map(node._cmdVars)
+        assert cmd == f'program  --s "{{sValue}}" --input "/in" --output "{node.output.value}" ' \
+                      f'--output2 "{node.internalFolder}/out2"'
+    finally:
+        unregisterNodeDesc(NodeWithUnresolvedVariables)
+
+
+def test_concurrentCommandVariables():
+    registerNodeDesc(CommandLineNodeWithList)
+    try:
+        graph = Graph("")
+        node = graph.addNewNode(CommandLineNodeWithList.__name__, images=[f"/image{i}.jpg" for i in range(500)],
+                                input="/input")
+        for _ in range(5):
+            # Chunks of the same node may format their command line at the same time
+            node.images.append("/image.jpg")
+            barrier = threading.Barrier(4)
+            results = []
+            errors = []
+
+            def formatCommandLine():
+                barrier.wait()
+                try:
+                    results.append(node.nodeDesc.commandLine.format_map(node._cmdVars))
+                except KeyError as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=formatCommandLine) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert not errors
+            assert len(set(results)) == 1
+    finally:
+        unregisterNodeDesc(CommandLineNodeWithList)
@@ -1,9 +1,12 @@
 # coding:utf-8
 
 from meshroom.core import pluginManager, loadClassesNodes
-from meshroom.core.plugins import NodePluginStatus, Plugin
+from meshroom.core.node import CompatibilityNode
+from meshroom.core.nodeFactory import nodeFactory
+from meshroom.core.plugins import LazyNodePlugin, NodePluginStatus, Plugin
 
 import os
+import sys
 import time
 
 
@@ -214,3 +217,64 @@ class TestPluginWithInvalidNodes:
         pluginManager.unregisterNode(node)
         assert node.status == NodePluginStatus.DESC_ERROR  # Not NOT_LOADED
         assert not pluginManager.isRegistered(nodeName)
+
+
+def test_lazyNodePlugins(tmp_path, monkeypatch):
+    monkeypatch.setenv("MESHROOM_LAZY_NODES", "1")
+    monkeypatch.setenv("MESHROOM_TEMP_PATH", str(tmp_path))
+    folder = os.path.join(os.path.dirname(__file__), "plugins", "meshroom")
+
+    # The first load imports the modules and writes the manifest
+    nodes = loadClassesNodes(folder, "pluginB")
+    assert not any(isinstance(node, LazyNodePlugin) for node in nodes)
+
+    # Next loads do not import the modules
+    for moduleName in ("pluginB.PluginBNodeA", "pluginB.PluginBNodeB"):
+        monkeypatch.delitem(sys.modules, moduleName)
+    lazyNodes = {node.name: node for node in loadClassesNodes(folder, "pluginB")}
+    assert set(lazyNodes) == {node.name for node in nodes}
+    assert "pluginB.PluginBNodeA" not in sys.modules
+    nodeA = lazyNodes["PluginBNodeA"]
+    assert isinstance(nodeA, LazyNodePlugin)
+    assert not nodeA.isImported
+    assert nodeA.category == "Other"
+    # Validation errors are recorded in the manifest
+    assert lazyNodes["PluginBNodeB"].status == NodePluginStatus.DESC_ERROR
+
+    # The module is imported when the node type is used
+    pluginManager.registerNode(nodeA)
+    try:
+        assert not nodeA.isImported
+        nodeDesc = pluginManager.getRegisteredNodePlugin("PluginBNodeA").nodeDescriptor
+        assert nodeA.isImported
+        assert "pluginB.PluginBNodeA" in sys.modules
+        assert nodeDesc.__name__ == "PluginBNodeA"
+        assert nodeDesc.plugin is nodeA
+        assert nodeDesc.packageName == "pluginB"
+    finally:
+        pluginManager.unregisterNode(nodeA)
+
+    # Modifying a file of the package invalidates the manifest
+    nodePath = os.path.join(folder, "pluginB", "PluginBNodeA.py")
+    stat = os.stat(nodePath)
+    os.utime(nodePath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    try:
+        nodes = loadClassesNodes(folder, "pluginB")
+        assert not any(isinstance(node, LazyNodePlugin) for node in nodes)
+    finally:
+        os.utime(nodePath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def test_lazyNodePluginImportFailure(tmp_path):
+    entry = {"name": "BrokenNode", "module": "doesnotexist.BrokenNode", "path": str(tmp_path / "BrokenNode.py"),
+             "version": None, "category": "Other", "errors": [], "timestamp": 0.0}
+    nodePlugin = LazyNodePlugin(entry, str(tmp_path), "doesnotexist", None, str(tmp_path))
+    pluginManager.registerNode(nodePlugin)
+    try:
+        # Nodes of this type are created as compatibility nodes
+        node = nodeFactory({"nodeType": "BrokenNode", "inputs": {}}, "BrokenNode_1")
+        assert isinstance(node, CompatibilityNode)
+        assert nodePlugin.status == NodePluginStatus.ERROR
+        assert not pluginManager.isRegistered("BrokenNode")
+    finally:
+        pluginManager.unregisterNode(nodePlugin)
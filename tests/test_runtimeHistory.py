@@ -0,0 +1,81 @@
+from meshroom.core.graph import Graph
+from meshroom.core.runtimeHistory import RuntimeHistory, chunkSize
+from meshroom.core.scheduler import ResourceBudget
+
+from .test_scheduler import RecordingScheduler
+
+
+def test_runtimePrediction(tmp_path):
+    history = RuntimeHistory(str(tmp_path / "history" / "runtime.db"))
+    assert history.predict("Ls", "1.0", 10) is None
+
+    for elapsedTime in (10.0, 12.0, 11.0):
+        history.record("Ls", "1.0", 10, elapsedTime, 1000)
+    history.record("Ls", "1.0", 20, 30.0, 4000)
+    history.record("Ls", "0.9", 10, 100.0, 1000)
+
+    prediction = history.predict("Ls", "1.0", 10)
+    assert prediction.duration == 11.0
+    assert prediction.peakRss == 1000
+    assert prediction.samples == 3
+    # Duration extrapolated from the records of the nearest size
+    assert history.predict("Ls", "1.0", 40).duration == 60.0
+    assert history.predict("Ls", "1.0", 5).duration == 5.5
+    # Records of other versions are used as a fallback
+    prediction = history.predict("Ls", "2.0", 10)
+    assert prediction.samples == 4
+    assert prediction.duration == 11.5
+
+    # Only the most recent records are kept
+    for _ in range(RuntimeHistory.MAX_RECORDS):
+        history.record("Ls", "1.0", 10, 1.0, 500)
+    prediction = history.predict("Ls", "1.0", 10)
+    assert prediction.duration == 1.0
+    assert prediction.samples == RuntimeHistory.MAX_RECORDS
+
+
+def test_recordChunk(tmp_path):
+    graph = Graph("")
+    node = graph.addNewNode("Ls", input="/tmp")
+    chunk = node.chunks[0]
+    chunk.status.elapsedTime = 42.0
+    chunk.statistics.process.curves["memory_info.rss"] = [100, 300, 200]
+    history = RuntimeHistory(str(tmp_path / "runtime.db"))
+    history.recordChunk(chunk)
+    prediction = history.predictChunk(chunk)
+    assert prediction.duration == 42.0
+    assert prediction.peakRss == 300
+    assert history.predict(node.nodeType, node.packageVersion, chunkSize(chunk)) == prediction
+    assert history.predictNode(node).duration == 42.0
+
+
+def test_longestPathFirstScheduling(tmp_path):
+    #  A - B
+    #  C - D - E
+    graph = Graph("")
+    tA = graph.addNewNode("Ls", input="/tmp")
+    tB = graph.addNewNode("AppendText", inputText="echo B")
+    tC = graph.addNewNode("Ls", input="/tmp")
+    tD = graph.addNewNode("AppendText", inputText="echo D")
+    tE = graph.addNewNode("AppendText", inputText="echo E")
+    graph.addEdges(
+        (tA.output, tB.input),
+        (tC.output, tD.input),
+        (tD.output, tE.input),
+    )
+    nodes = [tA, tB, tC, tD, tE]
+
+    # Without history, nodes are dispatched in the order of the list
+    scheduler = RecordingScheduler(graph, list(nodes), ResourceBudget(maxJobs=1))
+    scheduler.run()
+    assert [name for event, name in scheduler.events if event == "start"] == [n.name for n in nodes]
+
+    history = RuntimeHistory(str(tmp_path / "runtime.db"))
+    history.record("Ls", tA.packageVersion, chunkSize(tA.chunks[0]), 1.0, 0)
+    history.record("AppendText", tB.packageVersion, chunkSize(tB.chunks[0]), 5.0, 0)
+    scheduler = RecordingScheduler(graph, list(nodes), ResourceBudget(maxJobs=1))
+    scheduler.history = history
+    scheduler.run()
+    # C-D-E is the longest path
+    assert [name for event, name in scheduler.events if event == "start"] == \
+        [tC.name, tD.name, tA.name, tB.name, tE.name]
@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+
+from meshroom.core import desc, pluginManager
+from meshroom.core.graph import Graph, executeGraph
+from meshroom.core.node import Status
+from meshroom.core.scheduler import ChunkScheduler, ResourceBudget
+
+from .utils import registerNodeDesc, unregisterNodeDesc
+
+
+class RecordingScheduler(ChunkScheduler):
+    """ ChunkScheduler recording the chunks processing instead of computing them. """
+    def __init__(self, graph, nodes, budget, duration=0.0):
+        super().__init__(graph, nodes, budget)
+        self.duration = duration
+        self.events = []
+        self.maxConcurrency = 0
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def onNodeStarted(self, node):
+        self.events.append(("start", node.name))
+
+    def onNodeFinished(self, node):
+        self.events.append(("finish", node.name))
+
+    def processChunk(self, chunk):
+        with self._lock:
+            self._running += 1
+            self.maxConcurrency = max(self.maxConcurrency, self._running)
+        time.sleep(self.duration)
+        with self._lock:
+            self._running -= 1
+
+
+def diamondGraph():
+    graph = Graph("")
+    tA = graph.addNewNode("Ls", input="/tmp")
+    tB = graph.addNewNode("AppendText", inputText="echo B")
+    tC = graph.addNewNode("AppendText", inputText="echo C")
+    tD = graph.addNewNode("AppendFiles")
+    graph.addEdges(
+        (tA.output, tB.input),
+        (tA.output, tC.input),
+        (tB.output, tD.input),
+        (tC.output, tD.input2),
+    )
+    return graph, [tA, tB, tC, tD]
+
+
+def test_resourceBudget():
+    budget = ResourceBudget(maxJobs=2, cpu=2, ram=4, gpu=0)
+    normal = {"cpu": 1, "ram": 1, "gpu": 0}
+    intensive = {"cpu": 2, "ram": 2, "gpu": 0}
+    gpu = {"cpu": 1, "ram": 1, "gpu": 1}
+
+    # A job exceeding the budget is accepted when nothing is running
+    assert budget.canAcquire(gpu)
+    budget.acquire(normal)
+    assert budget.canAcquire(normal)
+    assert not budget.canAcquire(intensive)
+    assert not budget.canAcquire(gpu)
+    budget.acquire(normal)
+    # Maximum number of jobs reached
+    assert not budget.canAcquire({"cpu": 0, "ram": 0, "gpu": 0})
+    budget.release(normal)
+    budget.release(normal)
+    assert budget.jobs == 0
+    assert budget.used == {"cpu": 0, "ram": 0, "gpu": 0}
+
+    # Resources without capacity are not limited
+    unlimited = ResourceBudget(maxJobs=8)
+    for _ in range(7):
+        unlimited.acquire(intensive)
+    assert unlimited.canAcquire(intensive)
+
+
+def test_resourceBudgetFromEnv(monkeypatch):
+    monkeypatch.setenv("MESHROOM_LOCAL_MAX_JOBS", "3")
+    monkeypatch.setenv("MESHROOM_LOCAL_RESOURCES", "cpu=8,gpu=1,unknown=2")
+    budget = ResourceBudget.fromEnv()
+    assert budget.maxJobs == 3
+    assert budget.capacity == {"cpu": 8, "ram": None, "gpu": 1}
+    assert ResourceBudget.fromEnv(maxJobs=1).maxJobs == 1
+
+
+def test_serialScheduling():
+    graph, nodes = diamondGraph()
+    scheduler = RecordingScheduler(graph, list(nodes), ResourceBudget(maxJobs=1))
+    scheduler.run()
+    assert scheduler.maxConcurrency == 1
+    assert scheduler.events == [(event, node.name) for node in nodes for event in ("start", "finish")]
+
+
+def test_concurrentScheduling():
+    graph, nodes = diamondGraph()
+    tA, tB, tC, tD = nodes
+    scheduler = RecordingScheduler(graph, list(nodes), ResourceBudget(maxJobs=4), duration=0.1)
+    scheduler.run()
+    # B and C only depend on A and are processed at the same time
+    assert scheduler.maxConcurrency == 2
+    events = scheduler.events
+    assert events.index(("finish", tA.name)) < events.index(("start", tB.name))
+    assert events.index(("finish", tA.name)) < events.index(("start", tC.name))
+    assert events.index(("start", tC.name)) < events.index(("finish", tB.name))
+    assert events.index(("finish", tB.name)) < events.index(("start", tD.name))
+    assert events.index(("finish", tC.name)) < events.index(("start", tD.name))
+
+
+def test_schedulingWithinBudget():
+    graph, nodes = diamondGraph()
+    # Test nodes have a NORMAL cpu level: only one chunk fits in the budget at a time
+    scheduler = RecordingScheduler(graph, list(nodes), ResourceBudget(maxJobs=4, cpu=1), duration=0.05)
+    scheduler.run()
+    assert scheduler.maxConcurrency == 1
+    assert len(scheduler.events) == 8
+
+
+def test_schedulingError():
+    graph, nodes = diamondGraph()
+    tA, tB, tC, tD = nodes
+    nodesToProcess = list(nodes)
+
+    class FailingScheduler(RecordingScheduler):
+        def processChunk(self, chunk):
+            if chunk.node is tB:
+                raise RuntimeError("Failure")
+
+        def onChunkError(self, node, chunk, error):
+            # Remove downstream nodes from the nodes to process
+            nodesToProcess.remove(tD)
+
+    scheduler = FailingScheduler(graph, nodesToProcess, ResourceBudget(maxJobs=2))
+    scheduler.run()
+    processedNodes = [name for event, name in scheduler.events if event == "start"]
+    assert processedNodes == [tA.name, tB.name, tC.name]
+
+
+class ParallelizedNode(desc.Node):
+    size = desc.StaticNodeSize(2)
+    parallelization = desc.Parallelization(blockSize=1)
+    inputs = []
+    outputs = []
+
+
+def test_concurrentChunkLogs(graphSavedOnDisk):
+    registerNodeDesc(ParallelizedNode)
+    try:
+        node = graphSavedOnDisk.addNewNode(ParallelizedNode.__name__)
+        chunks = list(node.chunks)
+        assert len(chunks) == 2
+        os.makedirs(os.path.dirname(chunks[0].logFile), exist_ok=True)
+        for chunk in chunks:
+            chunk.logManager.start("info")
+        # Chunks of the same node running at the same time write to their own log file
+        threads = [threading.Thread(target=chunk.logger.info, args=(f"chunk {chunk.index}",)) for chunk in chunks]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for chunk in chunks:
+            chunk.logManager.end()
+            with open(chunk.logFile) as f:
+                lines = f.read().splitlines()
+            assert len(lines) == 1 and lines[0].endswith(f"[info] chunk {chunk.index}")
+    finally:
+        unregisterNodeDesc(ParallelizedNode)
+
+
+class ParallelizedCommandLineNode(desc.CommandLineNode):
+    commandLine = "echo {allParams}"
+    commandLineRange = "--range {rangeStart} {rangeBlockSize}"
+    size = desc.StaticNodeSize(6)
+    parallelization = desc.Parallelization(blockSize=1)
+    inputs = [
+        desc.StringParam(name="text", label="Text", description="Text.", value="text"),
+    ]
+    outputs = [
+        desc.File(name="output", label="Output", description="Output.", value="{nodeCacheFolder}/output"),
+    ]
+
+
+def test_executeGraphWithJobs(graphSavedOnDisk):
+    registerNodeDesc(ParallelizedCommandLineNode)
+    # Command line nodes are executed in the environment of their plugin
+    pluginManager.getRegisteredNodePlugin(ParallelizedCommandLineNode.__name__).plugin = \
+        pluginManager.getRegisteredNodePlugin("Ls").plugin
+    try:
+        node = graphSavedOnDisk.addNewNode(ParallelizedCommandLineNode.__name__)
+        assert len(node.chunks) == 6
+        # Chunks of the same node are computed concurrently
+        executeGraph(graphSavedOnDisk, jobs=2)
+        for chunk in node.chunks:
+            assert chunk.status.status == Status.SUCCESS
+            with open(chunk.logFile) as f:
+                assert f"--range {chunk.index} 1" in f.read()
+    finally:
+        unregisterNodeDesc(ParallelizedCommandLineNode)
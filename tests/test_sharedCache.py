@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+from unittest.mock import patch
+
+import meshroom.core
+from meshroom.core import desc
+from meshroom.core.graph import Graph
+from meshroom.core.node import Status
+from meshroom.core.sharedCache import SharedCache, detachFromSharedCache, relocatePaths, shareFile
+
+from .utils import registerNodeDesc, unregisterNodeDesc
+
+
+class SharedParallelizedNode(desc.Node):
+    size = desc.StaticNodeSize(4)
+    parallelization = desc.Parallelization(blockSize=1)
+    inputs = []
+    outputs = []
+
+
+def projectNode(tmp_path, name, otherNodes=0, nodeType="Ls", **kwargs):
+    graph = Graph()
+    os.makedirs(tmp_path / name)
+    graph.saveAsTemp(str(tmp_path / name))
+    for i in range(otherNodes):
+        graph.addNewNode("Ls", input=f"/other{i}")
+    if nodeType == "Ls":
+        kwargs.setdefault("input", "/tmp")
+    return graph.addNewNode(nodeType, **kwargs)
+
+
+def test_shareFile(tmp_path):
+    src = tmp_path / "src"
+    src.write_text("data")
+    dst = tmp_path / "dst"
+    dst.write_text("old")
+    assert shareFile(str(src), str(dst)) in ("reflink", "hardlink")
+    assert dst.read_text() == "data"
+    assert shareFile(str(src), str(dst), allowLinks=False) in ("reflink", "copy")
+    assert os.stat(dst).st_ino != os.stat(src).st_ino
+
+
+def test_sharedCacheAcrossProjects(tmp_path, monkeypatch):
+    sharedCacheDir = tmp_path / "shared"
+    monkeypatch.setenv("MESHROOM_SHARED_CACHE", str(sharedCacheDir))
+
+    monkeypatch.setattr(meshroom.core, "sessionUid", "sessionA")
+    nodeA = projectNode(tmp_path, "projectA")
+    os.makedirs(nodeA.internalFolder, exist_ok=True)
+    with open(os.path.join(nodeA.internalFolder, "output.txt"), "w") as f:
+        f.write("result")
+    chunkA = nodeA.chunks[0]
+    chunkA.upgradeStatusTo(Status.SUCCESS)
+    nodeA.publishToSharedCache()
+    sharedCache = SharedCache(str(sharedCacheDir))
+    assert sharedCache.hasEntry(nodeA.nodeType, nodeA._uid)
+
+    # Same node in another project: outputs are imported instead of being computed
+    monkeypatch.setattr(meshroom.core, "sessionUid", "sessionB")
+    nodeB = projectNode(tmp_path, "projectB", otherNodes=1)
+    assert nodeB._uid == nodeA._uid
+    assert nodeB.name != nodeA.name
+    assert nodeB.internalFolder != nodeA.internalFolder
+    chunkB = nodeB.chunks[0]
+    chunkB.process()
+    assert chunkB.status.status == Status.SUCCESS
+    outputB = os.path.join(nodeB.internalFolder, "output.txt")
+    with open(outputB) as f:
+        assert f.read() == "result"
+    # Status files are never linked to the shared cache
+    entryStatusFile = os.path.join(sharedCache.entryFolder(nodeA.nodeType, nodeA._uid), "status")
+    assert os.stat(chunkB.statusFile).st_ino != os.stat(entryStatusFile).st_ino
+    # Imported status files describe the importing node
+    with open(chunkB.statusFile) as f:
+        statusB = json.load(f)
+    assert statusB["nodeName"] == nodeB.name
+    assert statusB["graph"] == nodeB.graph.filepath
+    assert statusB["sessionUid"] == "sessionB"
+
+    # Detaching the node folder gives private copies of the outputs
+    detachFromSharedCache(nodeB.internalFolder)
+    assert os.stat(outputB).st_nlink == 1
+    assert not os.path.exists(os.path.join(nodeB.internalFolder, SharedCache.ENTRY_FILE))
+    with open(outputB) as f:
+        assert f.read() == "result"
+
+
+def test_sharedCacheIncompleteNode(tmp_path, monkeypatch):
+    sharedCacheDir = tmp_path / "shared"
+    monkeypatch.setenv("MESHROOM_SHARED_CACHE", str(sharedCacheDir))
+    node = projectNode(tmp_path, "project")
+    node.chunks[0].upgradeStatusTo(Status.ERROR)
+    node.publishToSharedCache()
+    assert not SharedCache(str(sharedCacheDir)).hasEntry(node.nodeType, node._uid)
+    assert not node.importFromSharedCache()
+
+
+def test_relocatePaths():
+    value = {"a": "/cacheA/Node/uid/out.txt", "b": ["/cacheA/Node/uid", "/cacheA/Node/uid2/out.txt", 1]}
+    assert relocatePaths(value, "/cacheA/Node/uid", "/cacheB/Node/uid") == {
+        "a": "/cacheB/Node/uid/out.txt",
+        "b": ["/cacheB/Node/uid", "/cacheA/Node/uid2/out.txt", 1],
+    }
+
+
+def test_sharedCacheConcurrentChunks(tmp_path, monkeypatch):
+    monkeypatch.setenv("MESHROOM_SHARED_CACHE", str(tmp_path / "shared"))
+    registerNodeDesc(SharedParallelizedNode)
+    try:
+        nodeA = projectNode(tmp_path, "projectA", nodeType=SharedParallelizedNode.__name__)
+        os.makedirs(nodeA.internalFolder, exist_ok=True)
+        with open(os.path.join(nodeA.internalFolder, "output.txt"), "w") as f:
+            f.write("result")
+        for chunk in nodeA.chunks:
+            chunk.upgradeStatusTo(Status.SUCCESS)
+        nodeA.publishToSharedCache()
+
+        # Chunks of the node processed at the same time import its outputs once
+        nodeB = projectNode(tmp_path, "projectB", nodeType=SharedParallelizedNode.__name__)
+        barrier = threading.Barrier(len(nodeB.chunks))
+        errors = []
+
+        def process(chunk):
+            barrier.wait()
+            try:
+                chunk.process()
+            except Exception as e:
+                errors.append(e)
+
+        with patch.object(SharedCache, "importEntry", autospec=True, side_effect=SharedCache.importEntry) as importEntry:
+            threads = [threading.Thread(target=process, args=(chunk,)) for chunk in nodeB.chunks]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert not errors
+        assert importEntry.call_count == 1
+        assert all(chunk.status.status == Status.SUCCESS for chunk in nodeB.chunks)
+        with open(os.path.join(nodeB.internalFolder, "output.txt")) as f:
+            assert f.read() == "result"
+    finally:
+        unregisterNodeDesc(SharedParallelizedNode)
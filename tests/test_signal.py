@@ -0,0 +1,92 @@
+import threading
+from functools import partial
+
+from meshroom.common.PySignal import ClassSignal, Signal
+
+
+class Emitter:
+    changed = ClassSignal()
+
+    def update(self, value):
+        self.changed.emit(value)
+
+
+class Receiver:
+    def __init__(self):
+        self.values = []
+        self.senders = []
+
+    def onChanged(self, value):
+        self.values.append(value)
+
+
+def test_signalSlots():
+    signal = Signal()
+    receiver = Receiver()
+    values = []
+    calls = []
+    signal.connect(receiver.onChanged)
+    signal.connect(receiver.onChanged)
+    signal.connect(lambda value: values.append(value))
+    signal.connect(partial(calls.append, "called"))
+    signal.emit(1)
+    assert receiver.values == [1]
+    assert values == [1]
+    assert calls == ["called"]
+
+    signal.disconnect(receiver.onChanged)
+    signal.emit(2)
+    assert receiver.values == [1]
+
+    # Methods of deleted objects are not called anymore
+    signal.connect(receiver.onChanged)
+    del receiver
+    signal.emit(3)
+    assert values == [1, 2, 3]
+
+
+def test_signalSender():
+    emitter = Emitter()
+    senders = []
+    emitter.changed.connect(lambda value: senders.append(emitter.changed.sender()))
+    emitter.update(1)
+    assert senders == [emitter.update]
+    assert emitter.changed.sender() == emitter.update
+    # Signals are created once per instance
+    assert emitter.changed is emitter.changed
+    assert Emitter().changed is not emitter.changed
+
+
+def test_signalSenderPerThread():
+    emitter = Emitter()
+    otherEmitter = Emitter()
+    signal = Signal()
+    senders = []
+    emitted = threading.Event()
+    ended = threading.Event()
+    thread = threading.Thread(target=otherEmitter.update, args=("other",))
+
+    def onEmitted(value):
+        if value == "main":
+            # Emit from another thread while this emission is being dispatched
+            thread.start()
+            assert emitted.wait(5)
+        else:
+            emitted.set()
+            # Wait for the emission of the main thread to end
+            assert ended.wait(5)
+        senders.append((value, signal.sender()))
+
+    signal.connect(onEmitted)
+    emitter.changed.connect(signal)
+    otherEmitter.changed.connect(signal)
+    emitter.update("main")
+    ended.set()
+    thread.join()
+    # Emissions ending in another thread do not change the sender seen by each thread
+    assert senders == [("main", emitter.changed.emit), ("other", otherEmitter.changed.emit)]
+
+    # Without calling sender() during an emission, the sender is not kept after it
+    signal.disconnect(onEmitted)
+    emitter.update("noSender")
+    assert signal.sender() is None
@@ -0,0 +1,147 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import psutil
+import pytest
+
+from meshroom.core.stats import (Statistics, StatisticsFile, GpuSampler, NvidiaSmiGpuSampler,
+                                 ProcessTreeSampler)
+
+
+def addSample(statistics, time, **curves):
+    statistics.times.append(time)
+    for key, value in curves.items():
+        statistics.process.curves[key].append(value)
+
+
+def test_statisticsFileRoundTrip(tmp_path):
+    filepath = str(tmp_path / "statistics")
+    statistics = Statistics()
+    statistics.computer.ramTotal = 16.0
+    addSample(statistics, 1.0, cpu_percent=10.0, status="running")
+    statistics.save(filepath)
+    assert StatisticsFile.isStatisticsFile(filepath)
+
+    # New samples are appended to the file
+    size = os.path.getsize(filepath)
+    addSample(statistics, 2.0, cpu_percent=20.0, status="sleeping")
+    statistics.save(filepath)
+    assert os.path.getsize(filepath) == size + 8 * 3
+
+    # A new curve rewrites the file, missing values being aligned on the last sample
+    addSample(statistics, 3.0, cpu_percent=30.0, status="running", num_threads=4)
+    statistics.save(filepath)
+
+    loaded = Statistics()
+    loaded.load(filepath)
+    assert loaded.times == [1.0, 2.0, 3.0]
+    assert loaded.computer.ramTotal == 16.0
+    assert loaded.process.curves["cpu_percent"] == [10.0, 20.0, 30.0]
+    assert loaded.process.curves["status"] == ["running", "sleeping", "running"]
+    assert loaded.process.curves["num_threads"] == [None, None, 4]
+
+    # Static information is updated in the header
+    statistics.process.duration = 12.0
+    statistics.save(filepath)
+    loaded.load(filepath)
+    assert loaded.process.duration == 12.0
+    assert loaded.times == [1.0, 2.0, 3.0]
+
+
+def test_statisticsFileIncompleteRecord(tmp_path):
+    filepath = str(tmp_path / "statistics")
+    statistics = Statistics()
+    addSample(statistics, 1.0, cpu_percent=10.0)
+    statistics.save(filepath)
+    # Record being written by another process
+    with open(filepath, "ab") as f:
+        f.write(b"\0" * 12)
+    loaded = Statistics()
+    loaded.load(filepath)
+    assert loaded.times == [1.0]
+    assert loaded.process.curves["cpu_percent"] == [10.0]
+
+
+def test_statisticsFileBeingRewritten(graphSavedOnDisk):
+    node = graphSavedOnDisk.addNewNode("Ls", input="/tmp")
+    chunk = node.chunks[0]
+    os.makedirs(os.path.dirname(chunk.statisticsFile), exist_ok=True)
+    addSample(chunk.statistics, 1.0, cpu_percent=10.0)
+    chunk.saveStatistics()
+    # Header being rewritten in place by the computing process
+    with open(chunk.statisticsFile, "r+b") as f:
+        f.seek(len(StatisticsFile.MAGIC) + 4)
+        f.write(b'{"columns": ')
+    chunk.updateStatisticsFromCache()
+    assert chunk.statistics.times == [1.0]
+
+
+def test_loadJsonStatistics(tmp_path):
+    filepath = str(tmp_path / "statistics")
+    statistics = Statistics()
+    addSample(statistics, 1.0, cpu_percent=10.0)
+    data = statistics.toDict()
+    data["fileVersion"] = 2.0
+    with open(filepath, "w") as f:
+        json.dump(data, f)
+    assert not StatisticsFile.isStatisticsFile(filepath)
+
+    loaded = Statistics()
+    loaded.load(filepath)
+    assert loaded.times == [1.0]
+    assert loaded.process.curves["cpu_percent"] == [10.0]
+
+
+def test_processTreeSampler():
+    proc = psutil.Process()
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(10)"])
+    try:
+        sampler = ProcessTreeSampler(proc)
+        data = sampler.sample()
+        assert data["num_processes"] == 2
+        assert data["memory_info"].rss > proc.memory_info().rss
+        assert data["num_threads"] >= proc.num_threads() + 1
+    finally:
+        child.kill()
+        child.wait()
+    assert sampler.sample()["num_processes"] == 1
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake nvidia-smi is a shell script")
+def test_nvidiaSmiGpuSampler(tmp_path):
+    # Fake nvidia-smi, reporting the GPU statistics once and waiting like a looping query
+    executable = tmp_path / "nvidia-smi"
+    executable.write_text("#!/bin/sh\necho 'Fake GPU, 8192, 1024, 42, 60'\nexec sleep 10\n")
+    executable.chmod(0o755)
+    sampler = NvidiaSmiGpuSampler(str(executable))
+    try:
+        for _ in range(100):
+            if sampler.sample():
+                break
+            time.sleep(0.05)
+        assert sampler.sample() == {"gpuName": "Fake GPU", "gpuMemoryTotal": "8192", "gpuMemoryUsed": "1024",
+                                    "gpuUsed": "42", "gpuTemperature": "60"}
+    finally:
+        sampler.close()
+
+
+def test_nullGpuSampler():
+    statistics = Statistics()
+    statistics.computer.setGpuSampler(GpuSampler())
+    assert statistics.update(psutil.Process())
+    assert "gpuUsed" not in statistics.computer.curves
+    assert statistics.process.curves["num_processes"] == [1]
+
+
+def test_adaptiveInterval():
+    statistics = Statistics()
+    assert statistics.interval == Statistics.minInterval
+    statistics.adaptInterval(10)
+    assert statistics.interval == Statistics.minInterval
+    statistics.adaptInterval(Statistics.samplesPerInterval * Statistics.minInterval)
+    assert statistics.interval == 2 * Statistics.minInterval
+    statistics.adaptInterval(24 * 3600)
+    assert statistics.interval == Statistics.maxInterval
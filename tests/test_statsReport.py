@@ -0,0 +1,97 @@
+import json
+
+from meshroom.core.graph import Graph
+from meshroom.core.node import Status
+from meshroom.core.statsReport import buildReport, chunkMetrics, reportToHtml, reportToText
+
+
+def setChunkComputed(chunk, start, duration, cpuPercent, rss, hostname="host"):
+    """ Set the status and statistics of a chunk computed from `start` during `duration` seconds. """
+    status = chunk.status
+    status.status = Status.SUCCESS
+    status.hostname = hostname
+    status.elapsedTime = duration
+    statistics = chunk.statistics
+    statistics.times = [start + t for t in range(0, duration + 1, 10)]
+    statistics.computer.curves.update({f"cpuUsage.{i}": [0.0] * len(statistics.times) for i in range(4)})
+    statistics.process.curves["cpu_percent"] = [cpuPercent] * len(statistics.times)
+    statistics.process.curves["memory_info.rss"] = [rss] * len(statistics.times)
+
+
+def computedGraph():
+    #      / B \
+    #  A -      - D
+    #      \ C /
+    graph = Graph("")
+    tA = graph.addNewNode("Ls", input="/tmp")
+    tB = graph.addNewNode("AppendText", inputText="echo B")
+    tC = graph.addNewNode("AppendText", inputText="echo C")
+    tD = graph.addNewNode("AppendFiles")
+    graph.addEdges(
+        (tA.output, tB.input),
+        (tA.output, tC.input),
+        (tB.output, tD.input),
+        (tC.output, tD.input2),
+    )
+    start = 1000000.0
+    setChunkComputed(tA.chunks[0], start, 100, cpuPercent=100.0, rss=1000)
+    setChunkComputed(tB.chunks[0], start + 100, 200, cpuPercent=200.0, rss=3000)
+    setChunkComputed(tC.chunks[0], start + 100, 100, cpuPercent=200.0, rss=2000)
+    setChunkComputed(tD.chunks[0], start + 300, 50, cpuPercent=400.0, rss=500)
+    return graph, [tA, tB, tC, tD]
+
+
+def test_chunkMetrics():
+    graph, (tA, tB, tC, tD) = computedGraph()
+    metrics = chunkMetrics(tB.chunks[0])
+    assert metrics.wallTime == 200
+    assert metrics.cpuSeconds == 400
+    assert metrics.peakRss == 3000
+    assert metrics.nbCores == 4
+
+
+def test_performanceReport():
+    graph, (tA, tB, tC, tD) = computedGraph()
+    report = buildReport(graph)
+
+    summary = report["summary"]
+    assert summary["nodes"] == 4
+    assert summary["wallTime"] == 350
+    assert summary["computeTime"] == 450
+    assert summary["peakRss"] == 3000
+    assert abs(summary["cpuHours"] - (100 + 400 + 200 + 200) / 3600) < 1e-9
+
+    appendText = report["nodeTypes"]["AppendText"]
+    assert appendText["nodes"] == 2
+    assert appendText["wallTime"] == 300
+    assert appendText["peakRss"] == 3000
+    assert abs(appendText["efficiency"] - 0.5) < 1e-9
+    # Node types are sorted by decreasing wall time
+    assert list(report["nodeTypes"])[0] == "AppendText"
+
+    assert [n["name"] for n in report["criticalPath"]["nodes"]] == [tA.name, tB.name, tD.name]
+    assert report["criticalPath"]["duration"] == 350
+
+    # 900 busy core-seconds over 350 seconds on a single 4-core host
+    assert abs(summary["efficiency"] - 900 / (350 * 4)) < 0.01
+    timeline = report["timeline"]
+    resolution = timeline[1]["time"]
+    # B and C are running at the same time
+    bucket = timeline[int(150 / resolution)]
+    assert bucket["runningChunks"] == 2
+    assert abs(bucket["busyCores"] - 4) < 1e-6
+    assert bucket["availableCores"] == 4
+
+    json.dumps(report)
+    assert tB.name in reportToText(report)
+    assert "<table>" in reportToHtml(report)
+
+
+def test_performanceReportWithoutStatistics():
+    graph = Graph("")
+    graph.addNewNode("Ls", input="/tmp")
+    report = buildReport(graph)
+    assert report["summary"]["wallTime"] == 0
+    assert report["summary"]["efficiency"] == 0
+    assert report["timeline"] == []
+    reportToHtml(report)
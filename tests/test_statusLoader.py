@@ -0,0 +1,103 @@
+import json
+import os
+from unittest.mock import patch
+
+from meshroom.core.node import Status
+from meshroom.core import statusLoader
+from meshroom.core.statusIndex import StatusIndex
+from meshroom.core.statusLoader import updateChunksStatusFromCache
+
+
+def test_statusLoadedFromCache(graphSavedOnDisk):
+    graph = graphSavedOnDisk
+    nodeA = graph.addNewNode("Ls", input="/tmp")
+    nodeB = graph.addNewNode("AppendText", inputText="echo B")
+    chunkA = nodeA.chunks[0]
+    chunkB = nodeB.chunks[0]
+
+    chunkA.upgradeStatusTo(Status.SUCCESS)
+    chunkB.upgradeStatusTo(Status.ERROR)
+    chunkA._status.reset()
+    chunkB._status.reset()
+
+    updateChunksStatusFromCache([chunkA, chunkB])
+    assert chunkA.status.status == Status.SUCCESS
+    assert chunkB.status.status == Status.ERROR
+    assert chunkA.statusFileLastModTime == os.path.getmtime(chunkA.statusFile)
+
+    # Status files that have not been modified are not parsed again
+    with patch.object(statusLoader.json, "load", wraps=json.load) as jsonLoad:
+        chunkB.upgradeStatusTo(Status.SUCCESS)
+        chunkB._status.reset()
+        updateChunksStatusFromCache([chunkA, chunkB])
+        assert jsonLoad.call_count == 1
+    assert chunkA.status.status == Status.SUCCESS
+    assert chunkB.status.status == Status.SUCCESS
+
+    # Removed or invalid status files reset the status
+    os.remove(chunkA.statusFile)
+    with open(chunkB.statusFile, "w") as f:
+        f.write("{")
+    updateChunksStatusFromCache([chunkA, chunkB])
+    assert chunkA.status.status == Status.NONE
+    assert chunkA.statusFileLastModTime == -1
+    assert chunkB.status.status == Status.NONE
+    assert chunkB.statusFileContent is None
+
+
+def test_chunkStatusFromCache(graphSavedOnDisk):
+    graph = graphSavedOnDisk
+    node = graph.addNewNode("Ls", input="/tmp")
+    chunk = node.chunks[0]
+
+    chunk.updateStatusFromCache()
+    assert chunk.status.status == Status.NONE
+
+    chunk.upgradeStatusTo(Status.RUNNING)
+    chunk._status.reset()
+    chunk.updateStatusFromCache()
+    assert chunk.status.status == Status.RUNNING
+    assert chunk.statusFileContent.data["status"] == "RUNNING"
+
+
+def test_statusIndex(graphSavedOnDisk, monkeypatch):
+    monkeypatch.setenv("MESHROOM_STATUS_INDEX", "1")
+    graph = graphSavedOnDisk
+    nodeA = graph.addNewNode("Ls", input="/tmp")
+    nodeB = graph.addNewNode("AppendText", inputText="echo B")
+    chunkA = nodeA.chunks[0]
+    chunkB = nodeB.chunks[0]
+
+    chunkA.upgradeStatusTo(Status.SUCCESS)
+    chunkB.upgradeStatusTo(Status.ERROR)
+    statusIndex = StatusIndex(graph.cacheDir)
+    assert os.path.exists(statusIndex.filepath)
+    indexed = statusIndex.read([chunkA.statusFile, chunkB.statusFile])
+    assert indexed[chunkA.statusFile][2]["status"] == "SUCCESS"
+    assert indexed[chunkB.statusFile][2]["status"] == "ERROR"
+
+    # Up-to-date status files are read from the index
+    chunkA._status.reset()
+    chunkA._statusFileContent = None
+    with patch.object(statusLoader.json, "load", wraps=json.load) as jsonLoad:
+        updateChunksStatusFromCache([chunkA, chunkB])
+        assert jsonLoad.call_count == 0
+    assert chunkA.status.status == Status.SUCCESS
+
+    # Status files written without the index are read, and their records updated
+    monkeypatch.setenv("MESHROOM_STATUS_INDEX", "0")
+    chunkB.upgradeStatusTo(Status.SUCCESS)
+    os.remove(chunkA.statusFile)
+    monkeypatch.setenv("MESHROOM_STATUS_INDEX", "1")
+    updateChunksStatusFromCache([chunkA, chunkB])
+    assert chunkA.status.status == Status.NONE
+    assert chunkB.status.status == Status.SUCCESS
+    indexed = statusIndex.read([chunkA.statusFile, chunkB.statusFile])
+    assert chunkA.statusFile not in indexed
+    assert indexed[chunkB.statusFile][2]["status"] == "SUCCESS"
+
+    # Only the requested records are read, in batches
+    monkeypatch.setattr(StatusIndex, "QUERY_BATCH_SIZE", 1)
+    indexed = statusIndex.read([chunkB.statusFile, chunkA.statusFile])
+    assert list(indexed) == [chunkB.statusFile]
+    assert statusIndex.read([chunkA.statusFile]) == {}